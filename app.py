@@ -1,61 +1,114 @@
 # Import necessary libraries
-from templates import modern_template, classic_template, ats_template
-import pdfkit  
-from flask import Flask, render_template, request, jsonify, session, send_file
-import groq
-import json
-from fpdf import FPDF
+from rendering import pick_template, pick_backend, render_pdf
+from subskills import fetch_subskills, fetch_subskill_batch, stream_subskills, sse_event
+from subskill_lookup import SubskillBatch, SubskillLookup, subskill_events
+from downloads import cached_download, html_download, pdf_download, resume_filename
+from preview import preview_diff, preview_document
+from resume_schema import validate_resume
+from conversation import FIRST_STEP, advance, empty_resume, pending_skills
+from services import Services, services
+from pdf_pool import PdfPoolBusy
+from jobs import JobQueueFull, render_resume_job
+from latex_resume import build_latex_from_data
+import metrics
+from flask import (Blueprint, Flask, render_template, request, jsonify, session, send_file, Response,
+                   stream_with_context, url_for)
 from dotenv import load_dotenv
 import os
-import re
-import datetime
-import subprocess, shlex, traceback
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, ListFlowable, ListItem
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-import html
-import datetime
+from io import BytesIO
+from functools import wraps
 
 
 # Load .env file
 load_dotenv()
 
-app = Flask(__name__)
-app.secret_key = os.getenv("SECRET_KEY", "fallback_secret")
-
-# Use Groq API key from .env
-client = groq.Client(api_key=os.getenv("GROQ_API_KEY"))
-
-
-def rr_escape(text: str) -> str:
-    if text is None:
-        return ""
-    s = str(text)
-    return html.escape(s).replace('\n', '<br/>')
-
-questions = [
-    "Hi there! I'm ResumeBot. Let's build your resume! What is your name?",
-    "Great! What is your email?",
-    "Now, tell me about your education. What is your course?",
-    "Which college did you study at for this course?",
-    "What year did you complete it?",
-    "Would you like to add another education detail? (yes/no)",
-    "Now, let's talk about your skills. Enter a main skill:",
-    "Here are 10 related sub-skills. Select the ones you have (comma-separated):",
-    "Would you like to add another main skill? (yes/no)",
-    "Do you have any certifications? (yes/no)",
-    "Enter the certificate name:",
-    "Enter the certificate ID:",
-    "Where did you get this certification from?",
-    "Would you like to add another certification? (yes/no)",
-    "Tell me about your projects. What is the project name?",
-    "Provide a brief description of the project:",
-    "Enter the project repository link:",
-    "Would you like to add another project? (yes/no)",
-    "All done! Generating your resume now..."
-]
+# Routes live on a blueprint; create_app() builds the Flask app around it.
+# Renderers, the LLM client and worker pools are created lazily (services.py).
+bp = Blueprint("resume", __name__)
+
+# Set in the WSGI environ by asgi.py: sub-skill LLM calls and /generate PDF
+# renders are awaited there instead
+ASYNC_ENVIRON_KEY = "resumebot.async"
+
+
+def create_app():
+    app = Flask(__name__)
+    app.secret_key = os.getenv("SECRET_KEY", "fallback_secret")
+
+    # Session storage: "cookie" (Flask default), or server-side "memory" / "sqlite"
+    session_backend = os.getenv("SESSION_BACKEND", "cookie").lower()
+    if session_backend in ("memory", "sqlite"):
+        from server_session import ServerSideSessionInterface, MemorySessionBackend, SqliteSessionBackend
+        idle_timeout = int(os.getenv("SESSION_IDLE_TIMEOUT", 2 * 3600))
+        if session_backend == "sqlite":
+            backend = SqliteSessionBackend(
+                os.getenv("SESSION_DB", os.path.join(app.root_path, "sessions.db")), idle_timeout=idle_timeout)
+        else:
+            backend = MemorySessionBackend(idle_timeout=idle_timeout)
+        app.session_interface = ServerSideSessionInterface(backend)
+
+    app.extensions["resumebot"] = Services(app.root_path)
+    app.register_blueprint(bp)
+    return app
+
+
+def send_artifact(content, filename, mimetype):
+    """Send generated bytes, keeping a copy in static/ unless running in memory mode."""
+    artifact_store = services().artifact_store
+    if artifact_store is None:
+        return send_file(BytesIO(content), as_attachment=True, download_name=filename, mimetype=mimetype)
+    with metrics.ARTIFACT_WRITE.time():
+        path = artifact_store.save(filename, content)
+    return send_file(path, as_attachment=True, download_name=filename, mimetype=mimetype)
+
+
+def suggest_subskills(skill):
+    """Sub-skills for a main skill, from the taxonomy, the cache or a fresh LLM call."""
+    svc = services()
+    lookup = SubskillLookup(svc, skill)
+    lookup.begin()
+    if lookup.leader:
+        with lookup.leading("blocking"):
+            lookup.result = fetch_subskills(svc.llm, lookup.skill)
+    elif lookup.call is not None:
+        with lookup.following():
+            lookup.result = lookup.call.wait()
+    return lookup.answer()
+
+
+def suggest_subskill_groups(skills):
+    """[{"skill", "subskills"}] for several main skills; the unknown ones share one LLM call."""
+    svc = services()
+    batch = SubskillBatch(svc, skills)
+    batch.begin()
+    if batch.to_fetch:
+        with batch.leading():
+            batch.fetched = fetch_subskill_batch(svc.llm, batch.to_fetch)
+    for key, call in batch.waiting.items():
+        with batch.following():
+            batch.found[key] = list(call.wait())
+    return batch.answer()
+
+
+def sse_subskills(skill):
+    """Generator of SSE events: one `subskill` per chip, then `done` (or `error`)."""
+    svc = services()
+    lookup = SubskillLookup(svc, skill)
+    lookup.begin()
+    if lookup.leader:
+        with lookup.leading("stream"):
+            for item in stream_subskills(svc.llm, lookup.skill):
+                lookup.streamed.append(item)
+                yield sse_event("subskill", item)
+            lookup.result = lookup.streamed
+        yield from lookup.closing_events()
+        return
+    if lookup.call is not None:
+        # someone is already asking the LLM for this skill: share their answer
+        with lookup.following():
+            lookup.result = lookup.call.wait()
+    yield from subskill_events(lookup.answer())
+
 resume_examples = """
     Example Resume 1:
     
@@ -119,542 +172,285 @@ resume_examples = """
 
     ------------------------------
     """
-@app.route('/')
+def with_preview(view):
+    """Attach changed preview fragments (section -> HTML) to a JSON chat reply."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = view(*args, **kwargs)
+        if isinstance(response, Response) and response.is_json:
+            changed, hashes = preview_diff(session.get('data', {}), session.get('preview'))
+            if changed:
+                session['preview'] = hashes
+                payload = response.get_json()
+                payload['preview'] = changed
+                response = jsonify(payload)
+        return response
+    return wrapper
+
+
+@bp.route('/')
 def index():
     session.clear()  
-    session['step'] = 0
-    session['data'] = {
-        "name": "",
-        "email": "",
-        "education": [],
-        "skills": [],
-        "certifications": [],
-        "projects": []
-    }
+    session['step'] = FIRST_STEP
+    session['data'] = empty_resume()
     return render_template('chatbot.html')
 
-@app.route('/chat', methods=['POST'])
+
+def attach_subskills(reply, data, wants_stream):
+    """After a main skill: suggest sub-skills (inline, or as an SSE stream URL)."""
+    skills = [entry['mainskill'] for entry in pending_skills(data)] or [data['skills'][-1]['mainskill']]
+    svc = services()
+    for skill in skills:
+        key = svc.skill_normalizer.canonical(skill)
+        if svc.skill_autocomplete.record(key):
+            # picked often enough to be offered to everyone, and as a typo target
+            svc.skill_normalizer.add(key)
+    if len(skills) > 1:
+        reply["question"] = ("Here are related sub-skills for each skill. Select the ones you have "
+                             f"as '{skills[0]}: a, b; {skills[1]}: c':")
+        if request.environ.get(ASYNC_ENVIRON_KEY):
+            reply["subskill_groups_pending"] = skills
+        else:
+            reply["subskill_groups"] = suggest_subskill_groups(skills)
+        return
+    skill = skills[0]
+    if wants_stream:
+        # client renders chips from the SSE endpoint as they arrive
+        reply["subskills_stream"] = url_for('.chat_subskills_stream', skill=skill)
+    elif request.environ.get(ASYNC_ENVIRON_KEY):
+        # served by asgi.py, which awaits the LLM call and fills in "subskills"
+        reply["subskills_pending"] = skill
+    else:
+        reply["subskills"] = suggest_subskills(skill)
+
+
+# extra work to do once a step has been answered, keyed by step name
+STEP_HOOKS = {
+    "mainskill": attach_subskills,
+}
+
+
+@bp.route('/chat', methods=['POST'])
+@with_preview
 def chat():
     raw_input = request.json.get('message', '')
+    wants_stream = bool(request.json.get('stream'))
     if raw_input is None:
         raw_input = ""
-    raw_input = raw_input.strip()
-    user_input = raw_input.lower()   # use only for yes/no decisions
-
-    step = session.get('step', 0)
-    data = session.get('data', {})
+    user_input = raw_input.strip().lower()
 
     if not user_input:
         return jsonify({"question": "Please enter a valid response."})
 
-    if step == 0:
-        data['name'] = user_input
-    elif step == 1:
-        data['email'] = user_input
-    elif step == 2:
-        data['education'].append({"course": user_input})
-    elif step == 3:
-        data['education'][-1]['college'] = user_input
-    elif step == 4:
-        data['education'][-1]['year'] = user_input
-    elif step == 5:  
-        if user_input == 'no':
-            session['step'] = 6
-            return jsonify({"question": questions[6]})  
-        else:
-            session['step'] = 2  
-            return jsonify({"question": questions[2]})
-
-    elif step == 6:  
-        data['skills'].append({"mainskill": user_input})
-
-        
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {"role": "system", "content": f"Generate a list of 10 related sub-skills for {user_input}. Return only a comma-separated list."},
-                {"role": "user", "content": user_input}
-            ]
-        )
-        
-        subskills_raw = response.choices[0].message.content.strip()
-        subskills = subskills_raw.split(", ")
-
-        session['step'] = 7  
-        return jsonify({"question": "Here are 10 related sub-skills. Select the ones you have (comma-separated):", "subskills": subskills})
-
-    elif step == 7:  
-        data['skills'][-1]['subskills'] = user_input.split(',')
-        session['step'] = 8
-        return jsonify({"question": "Would you like to add another main skill? (yes/no)"})
-
-    elif step == 8:  
-        if user_input == 'yes':
-            session['step'] = 6  
-            return jsonify({"question": "Enter another main skill:"})
-        else:
-            session['step'] = 9  
-            return jsonify({"question": questions[9]})
+    data = session.get('data') or empty_resume()
+    answered, question = advance(session, data, user_input)
+    session['data'] = data
 
-    elif step == 9:  
-        if user_input == 'yes':
-            session['step'] = 10
-            return jsonify({"question": questions[10]})  
-        else:
-            session['step'] = 14  
-            return jsonify({"question": questions[14]})
-
-    elif step == 10:  
-        data['certifications'].append({"name": user_input})  
-        session['step'] = 11
-        return jsonify({"question": questions[11]})
-
-    elif step == 11:  
-        if not data['certifications']:  
-            return jsonify({"question": "Error: Please enter the certificate name first."})
-        data['certifications'][-1]['id'] = user_input
-        session['step'] = 12
-        return jsonify({"question": questions[12]})
-
-    elif step == 12:  
-        if not data['certifications']: 
-            return jsonify({"question": "Error: Please enter the certificate name first."})
-        data['certifications'][-1]['source'] = user_input
-        session['step'] = 13
-        return jsonify({"question": questions[13]})
-
-    elif step == 13:  
-        if user_input == 'no':
-            session['step'] = 14
-            return jsonify({"question": questions[14]})  
-        else:
-            session['step'] = 10  
-            return jsonify({"question": questions[10]})
-    elif step == 14:  
-        data['projects'].append({"name": user_input})  
-        session['step'] = 15
-        return jsonify({"question": questions[15]})
-
-    elif step == 15:  
-        if not data['projects']:  
-            return jsonify({"question": "Error: Please enter the project name first."})
-        data['projects'][-1]['description'] = user_input
-        session['step'] = 16
-        return jsonify({"question": questions[16]})
-
-    elif step == 16:  
-        if not data['projects']:  
-            return jsonify({"question": "Error: Please enter the project name first."})
-        data['projects'][-1]['technologies'] = user_input.split(", ")
-        session['step'] = 17
-        return jsonify({"question": questions[17]})
-
-    elif step == 17: 
-        if user_input == 'no':
-            session['step'] = 18  
-            return jsonify({"question": questions[18]})  
-        else:
-            session['step'] = 14  
-            return jsonify({"question": questions[14]})
+    reply = {"question": question}
+    for step in answered:
+        hook = STEP_HOOKS.get(step)
+        if hook:
+            hook(reply, data, wants_stream)
+    if session['step'] == "mainskill":
+        reply["autocomplete"] = url_for('.complete_skills')
+    return jsonify(reply)
+
+
+
+@bp.route('/preview')
+def preview():
+    """Live HTML preview of the resume built so far."""
+    return preview_document(session.get('data', {}))
+
+
+@bp.route('/preview/sections')
+def preview_sections():
+    """All preview fragments; resets the baseline used for incremental updates."""
+    changed, hashes = preview_diff(session.get('data', {}), None)
+    session['preview'] = hashes
+    return jsonify({"preview": changed})
+
+@bp.route('/skills/complete')
+def complete_skills():
+    """Main-skill completions for the text typed so far (?q=...&k=...)."""
+    prefix = request.args.get('q', '')
+    k = request.args.get('k', 8, type=int)
+    return jsonify({"q": prefix, "completions": services().skill_autocomplete.complete(prefix, k)})
+
+
+@bp.route('/chat/subskills')
+def chat_subskills_stream():
+    """Streaming variant of step 6: sub-skill chips as Server-Sent Events."""
+    skill = (request.args.get('skill') or '').strip().lower()
+    if not skill:
+        return jsonify({"error": "Missing skill."}), 400
+    return Response(
+        stream_with_context(sse_subskills(skill)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
-    session['step'] += 1
-    session['data'] = data
-    return jsonify({"question": questions[session['step']]})
-
-
-
-def latex_escape(text: str) -> str:
-    if text is None: return ""
-    s = str(text)
-    s = s.replace("\\", r"\textbackslash{}")
-    # escape common latex specials
-    for a,b in [('&', r'\&'),('%', r'\%'),('$', r'\$'),('#', r'\#'),('_', r'\_'),
-                ('{', r'\{'),('}', r'\}'),('~', r'\textasciitilde{}'),('^', r'\^{}'),
-                ('<', r'\textless{}'),('>', r'\textgreater{}')]:
-        s = s.replace(a,b)
-    return s
-
-def build_latex_from_data(data: dict) -> str:
-    # Gather fields (use original casing when available)
-    name = latex_escape(data.get('name','')).upper()
-    email = latex_escape(data.get('email',''))
-    phone = latex_escape(data.get('phone',''))
-    linkedin = latex_escape(data.get('linkedin',''))
-    github = latex_escape(data.get('github',''))
-    location = latex_escape(data.get('location',''))
-
-    # professional summary: build a short automated summary or allow model-generated summary stored in data
-    prof_summary = latex_escape(data.get('professional_summary', ''))
-    if not prof_summary:
-        parts = []
-        if data.get('education'):
-            e = data['education'][0]
-            if e.get('course'): parts.append(f"{e.get('course')} graduate")
-            if e.get('college'): parts.append(f"from {e.get('college')}")
-        if data.get('skills'):
-            tops = [s.get('mainskill','') for s in data.get('skills',[])][:3]
-            tops = [t for t in tops if t]
-            if tops: parts.append("Skills: " + ", ".join(tops))
-        if data.get('projects'):
-            pnames = [p.get('name','') for p in data.get('projects',[])][:2]
-            if pnames: parts.append("Projects: " + ", ".join(pnames))
-        prof_summary = latex_escape(" . ".join(parts) or "Computer Science graduate with practical experience in software and AI projects.")
-
-    # Build skills table rows
-    skills_rows = []
-    for s in data.get('skills', []):
-        ms = latex_escape(s.get('mainskill',''))
-        subs = s.get('subskills') or []
-        subs_str = ", ".join([latex_escape(x) for x in subs])
-        if ms:
-            skills_rows.append((ms, subs_str))
-
-    # Education
-    edu_lines = []
-    for e in data.get('education', []):
-        ct = latex_escape(e.get('course',''))
-        clg = latex_escape(e.get('college',''))
-        yr = latex_escape(e.get('year',''))
-        edu_lines.append((ct, clg, yr))
-
-    # Projects
-    project_blocks = []
-    for p in data.get('projects', []):
-        pname = latex_escape(p.get('name',''))
-        pdesc = latex_escape(p.get('description','') or "")
-        repo = latex_escape(p.get('repository','') or "")
-        techs = p.get('technologies') or []
-        techs_str = ", ".join([latex_escape(t) for t in techs]) if techs else ""
-        project_blocks.append({'name':pname,'desc':pdesc,'repo':repo,'techs':techs_str})
-
-    # Certifications
-    certs = []
-    for c in data.get('certifications', []):
-        cname = latex_escape(c.get('name',''))
-        cid = latex_escape(c.get('id',''))
-        src = latex_escape(c.get('source',''))
-        certs.append((cname,cid,src))
-
-    # Build contact lines (use tel/mail/link if present)
-    contact_parts = []
-    if location: contact_parts.append(location)
-    if phone: contact_parts.append(r"\href{tel:+%s}{%s}" % (re.sub(r'\D','', phone), phone))
-    if email: contact_parts.append(r"\href{mailto:%s}{%s}" % (email, email))
-    contact_line = " \\quad | \\quad ".join(contact_parts)
-
-    links = []
-    if linkedin: links.append(r"\href{%s}{LinkedIn}" % linkedin)
-    if github: links.append(r"\href{%s}{GitHub}" % github)
-    links_line = " \\quad | \\quad ".join(links)
-
-    # LaTeX template (clean, professional)
-    # NOTE: percent signs in template are left as-is because we're building with concatenation (no % formatting)
-    latex = r"""\documentclass[letterpaper,10pt]{article}
-\usepackage[dvipsnames]{xcolor}
-\usepackage[hidelinks]{hyperref}
-\usepackage{tabularx}
-\usepackage{geometry}
-\usepackage{titlesec}
-\usepackage{enumitem}
-\usepackage{fancyhdr}
-\usepackage[default]{lato}
-\usepackage{parskip}
-\usepackage{multicol}
-\hypersetup{colorlinks=true,urlcolor=blue}
-\geometry{left=0.6in, top=0.5in, right=0.6in, bottom=0.5in}
-\pagestyle{fancy}
-\fancyhf{}
-\renewcommand{\headrulewidth}{0pt}
-\titleformat{\section}{\large\bfseries\color{MidnightBlue}\uppercase}{}{0em}{}[\titlerule]
-\titlespacing{\section}{0pt}{6pt}{3pt}
-\setlength{\parskip}{0pt}
-\setlength{\itemsep}{2pt}
-\newcommand{\resumeItem}[1]{\item #1}
-\newcommand{\resumeListStart}{\begin{itemize}[leftmargin=*,noitemsep,topsep=0pt]}
-\newcommand{\resumeListEnd}{\end{itemize}}
-\begin{document}
-"""
-    # Header
-    latex += "\\begin{center}\n"
-    latex += "  {\\LARGE \\textbf{" + name + "}} \\\\\n"
-    if contact_line:
-        latex += "  " + contact_line + " \\\\\n"
-    if links_line:
-        latex += "  " + links_line + " \n"
-    latex += "\\end{center}\n\n"
-
-    # Summary
-    latex += "\\section*{PROFESSIONAL SUMMARY}\n" + prof_summary + "\n\n"
-
-    # Core skills with tabularx
-    latex += "\\section*{CORE SKILLS}\n\\begin{tabularx}{\\textwidth}{@{} l X @{} }\n"
-    # default content (you can replace with dynamic categories if preferred)
-    latex += "  \\textbf{Languages:} & Python, C++, Java, JavaScript, HTML/CSS \\\\\n"
-    latex += "  \\textbf{Frameworks:} & Hugging Face, TensorFlow, PyTorch, React Native, OpenCV \\\\\n"
-    latex += "  \\textbf{Tools:} & Git, Docker, VS Code, Firebase, Streamlit, Gradio, Postman \\\\\n"
-    latex += "\\end{tabularx}\n\n"
-
-    # Projects
-    if project_blocks:
-        latex += "\\section*{KEY PROJECTS}\n"
-        for p in project_blocks:
-            repo_text = f" \\href{{{p['repo']}}}{{[Repo]}}" if p['repo'] else ""
-            latex += "\\textbf{" + p['name'] + "}" + repo_text + " \\\\\n"
-            if p['techs']: latex += "\\textit{" + p['techs'] + "}\\\\\n"
-            if p['desc']:
-                latex += "\\resumeListStart\n"
-                latex += f"  \\resumeItem{{{p['desc']}}}\n"
-                latex += "\\resumeListEnd\n\n"
-
-    # Education
-    if edu_lines:
-        latex += "\\section*{EDUCATION}\n"
-        for ct, clg, yr in edu_lines:
-            latex += "\\textbf{" + ct + "} \\hfill " + yr + " \\\\\n"
-            if clg:
-                latex += clg + " \\\\\n"
-        latex += "\n"
-
-    # Certifications
-    if certs:
-        latex += "\\section*{CERTIFICATIONS}\n\\resumeListStart\n"
-        for cname, cid, src in certs:
-            line = cname
-            if cid: line += " (ID: " + cid + ")"
-            if src and src.startswith("http"):
-                line += f" \\href{{{src}}}{{[Cert]}}"
-            latex += f"  \\resumeItem{{{line}}}\n"
-        latex += "\\resumeListEnd\n\n"
-
-    latex += "\\end{document}\n"
-    return latex
 
 # GENERATE route replacement
-@app.route('/generate')
+@bp.route('/generate')
 def generate_resume():
     data = session.get('data', {})
     if not data:
         return "No resume data found in session. Start the chat to build your resume.", 400
 
     # template from query param (or session fallback)
-    template = request.args.get('template', data.get('template', 'modern')).lower()
-    if template not in ('modern','classic','ats'):
-        template = 'modern'
+    template = pick_template(request.args.get('template', data.get('template', 'modern')))
+    # PDF backend from query param (or PDF_BACKEND config)
+    backend = pick_backend(request.args.get('backend'))
     # store choice (optional)
     data['template'] = template
     session['data'] = data
+    if request.environ.get(ASYNC_ENVIRON_KEY):
+        # served by asgi.py, which awaits the PDF worker instead of holding this thread
+        return jsonify({"render_pending": {"data": data, "template": template, "backend": backend}})
+    return render_download(data, template, backend)
+
+
+def render_download(data, template, backend):
+    """Render the resume and return it as a download (shared by /generate and /api/resume)."""
+    svc = services()
+    # identical data + template was rendered recently: return the stored bytes
+    cache_key, cached = cached_download(svc, data, template, backend)
+    if cached is not None:
+        content, filename, mimetype = cached
+        response = send_file(BytesIO(content), as_attachment=True, download_name=filename, mimetype=mimetype)
+        response.headers['X-Render-Cache'] = 'HIT'
+        return response
 
-    # pick html content
-    if template == 'modern':
-        html_content = modern_template(data)
-    elif template == 'classic':
-        html_content = classic_template(data)
-    else:
-        html_content = ats_template(data)
-
-    static_dir = os.path.join(app.root_path, 'static')
-    os.makedirs(static_dir, exist_ok=True)
-    user_name = data.get('name', 'resume').strip().replace(' ', '_') or 'resume'
-    ts = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-    pdf_name = f"{user_name}_{template}_Resume_{ts}.pdf"
-    pdf_path = os.path.join(static_dir, pdf_name)
-
-    # Document setup
-    doc = SimpleDocTemplate(
-        pdf_path,
-        pagesize=letter,
-        leftMargin=0.6*inch,
-        rightMargin=0.6*inch,
-        topMargin=0.5*inch,
-        bottomMargin=0.5*inch
-    )
+    try:
+        pdf_bytes = render_pdf(data, template, backend, pool=svc.pdf_pool)
+        content, filename, mimetype = pdf_download(svc, cache_key, data, template, pdf_bytes)
+    except PdfPoolBusy:
+        return "Too many resumes are being generated right now. Please try again in a moment.", 503, {'Retry-After': '5'}
+    except Exception as e:
+        # fallback: return the HTML file for manual save/open
+        content, filename, mimetype = html_download(data, template, e)
+    response = send_artifact(content, filename, mimetype)
+    response.headers['X-Render-Cache'] = 'MISS'
+    return response
 
-    styles = getSampleStyleSheet()
-    # Custom styles
-    header_style = ParagraphStyle(
-        "Header",
-        parent=styles["Heading1"],
-        fontName="Helvetica-Bold",
-        fontSize=18,
-        alignment=1,  # center
-        spaceAfter=6,
-    )
-    contact_style = ParagraphStyle(
-        "Contact",
-        parent=styles["Normal"],
-        fontSize=9,
-        alignment=1,  # center
-        textColor=colors.grey,
-        spaceAfter=10
-    )
-    section_heading = ParagraphStyle(
-        "SectionHeading",
-        parent=styles["Heading2"],
-        fontSize=12,
-        textColor=colors.HexColor('#0b5394'),  # navy-ish
-        spaceBefore=10,
-        spaceAfter=6,
-        leading=14,
-        leftIndent=0
-    )
-    normal = ParagraphStyle(
-        "NormalText",
-        parent=styles["Normal"],
-        fontSize=10,
-        leading=12,
-    )
-    bullet_style = ParagraphStyle(
-        "Bullet",
-        parent=styles["Normal"],
-        fontSize=10,
-        leftIndent=12,
-        bulletIndent=6,
-        leading=12,
-    )
+@bp.route('/export/latex')
+def export_latex():
+    """The session's resume as a standalone LaTeX document (.tex download).
+
+    For a compiled PDF from the same source use /generate?backend=latex.
+    """
+    data = session.get('data', {})
+    if not data:
+        return "No resume data found in session. Start the chat to build your resume.", 400
+    tex_bytes = build_latex_from_data(data).encode('utf-8')
+    metrics.OUTPUT_BYTES.observe(len(tex_bytes), kind="tex")
+    return send_artifact(tex_bytes, resume_filename(data, 'latex', 'tex'), 'application/x-tex')
+
+
+def _job_payload(job_id):
+    render_jobs = services().render_jobs
+    status = render_jobs.status(job_id)
+    payload = {"job_id": job_id, "status": status,
+               "status_url": url_for('.job_status', job_id=job_id)}
+    if status == 'done':
+        payload["download_url"] = url_for('.job_download', job_id=job_id)
+    elif status == 'failed':
+        payload["error"] = render_jobs.error(job_id)
+    return payload
+
+
+@bp.route('/jobs', methods=['POST'])
+def start_job():
+    """Start rendering the session's resume in the background; returns a job id."""
+    data = session.get('data', {})
+    if not data:
+        return jsonify({"error": "No resume data found in session. Start the chat to build your resume."}), 400
+
+    body = request.get_json(silent=True) or {}
+    template = pick_template(body.get('template', request.args.get('template', data.get('template', 'modern'))))
+    backend = pick_backend(body.get('backend', request.args.get('backend')))
+    data['template'] = template
+    session['data'] = data
+    return start_render_job(data, template, backend)
+
+
+def start_render_job(data, template, backend):
+    """Queue a background render and return the 202 job payload (shared by /jobs and /api/resume)."""
+    render_jobs = services().render_jobs
+    cache_key, cached = cached_download(services(), data, template, backend)
+    if cached is not None:
+        job_id = render_jobs.add_result(cached, meta={"template": template})
+        return jsonify(_job_payload(job_id)), 202
 
-    story = []
-
-    # Header: Name
-    name = rr_escape(data.get('name', '')).upper()
-    story.append(Paragraph(name, header_style))
-
-    # Contact line
-    contact_items = []
-    if data.get('location'):
-        contact_items.append(rr_escape(data.get('location')))
-    if data.get('phone'):
-        contact_items.append(rr_escape(data.get('phone')))
-    if data.get('email'):
-        contact_items.append(rr_escape(data.get('email')))
-    contact_line = " \u2022 ".join(contact_items)  # bullet as separator
-    if contact_line:
-        story.append(Paragraph(contact_line, contact_style))
-
-    # Links line (LinkedIn / GitHub) - displayed as plain text for compatibility
-    links = []
-    if data.get('linkedin'):
-        links.append("LinkedIn: " + rr_escape(data.get('linkedin')))
-    if data.get('github'):
-        links.append("GitHub: " + rr_escape(data.get('github')))
-    if links:
-        story.append(Paragraph(" \u2022 ".join(links), contact_style))
-
-    story.append(Spacer(1, 8))
-
-    # Professional summary
-    prof = data.get('professional_summary') or ""
-    if not prof:
-        # Auto-generate short summary from fields if not present
-        parts = []
-        if data.get('education'):
-            e = data['education'][0]
-            if e.get('course'):
-                parts.append(f"{e.get('course')} graduate")
-            if e.get('college'):
-                parts.append(f"from {e.get('college')}")
-        if data.get('skills'):
-            tops = [s.get('mainskill','') for s in data.get('skills', [])][:3]
-            tops = [t for t in tops if t]
-            if tops:
-                parts.append("Skills: " + ", ".join(tops))
-        if data.get('projects'):
-            pnames = [p.get('name','') for p in data.get('projects', [])][:2]
-            pnames = [p for p in pnames if p]
-            if pnames:
-                parts.append("Projects: " + ", ".join(pnames))
-        prof = ". ".join(parts) if parts else "Computer Science graduate with practical experience in software development and AI projects."
-    story.append(Paragraph("<b>PROFESSIONAL SUMMARY</b>", section_heading))
-    story.append(Paragraph(rr_escape(prof), normal))
-
-    # Core skills (table style) - display mainskill: subskills
-    story.append(Spacer(1, 6))
-    story.append(Paragraph("<b>CORE SKILLS</b>", section_heading))
-    skills = data.get('skills', [])
-    if skills:
-        table_data = []
-        for sk in skills:
-            ms = rr_escape(sk.get('mainskill',''))
-            subs = sk.get('subskills') or []
-            subs_str = rr_escape(", ".join(subs))
-            table_data.append([Paragraph(f"<b>{ms}</b>", normal), Paragraph(subs_str, normal)])
-        table = Table(table_data, colWidths=[1.6*inch, None], hAlign='LEFT')
-        table.setStyle(TableStyle([
-            ('VALIGN', (0,0), (-1,-1), 'TOP'),
-            ('LEFTPADDING', (0,0), (-1,-1), 0),
-            ('RIGHTPADDING', (0,0), (-1,-1), 6),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 4),
-        ]))
-        story.append(table)
-    else:
-        story.append(Paragraph("No skills provided.", normal))
-
-    # Projects
-    projects = data.get('projects', [])
-    if projects:
-        story.append(Spacer(1, 6))
-        story.append(Paragraph("<b>KEY PROJECTS</b>", section_heading))
-        for p in projects:
-            pname = rr_escape(p.get('name',''))
-            ptech = ", ".join(p.get('technologies') or [])
-            pdesc = rr_escape(p.get('description',''))
-            hdr = pname + (f" — {rr_escape(ptech)}" if ptech else "")
-            story.append(Paragraph(f"<b>{hdr}</b>", normal))
-            if pdesc:
-                # bullet-ish paragraph
-                story.append(Paragraph(pdesc, bullet_style))
-            # small spacer between projects
-            story.append(Spacer(1,4))
-
-    # Education
-    edu = data.get('education', [])
-    if edu:
-        story.append(Spacer(1, 6))
-        story.append(Paragraph("<b>EDUCATION</b>", section_heading))
-        for e in edu:
-            ct = rr_escape(e.get('course',''))
-            clg = rr_escape(e.get('college',''))
-            yr = rr_escape(e.get('year',''))
-            left = f"<b>{ct}</b>"
-            right = yr
-            # render course + year then college beneath
-            story.append(Paragraph(left + (f" \u2014 {right}" if right else ""), normal))
-            if clg:
-                story.append(Paragraph(clg, normal))
-            story.append(Spacer(1,4))
-
-    # Certifications
-    certs = data.get('certifications', [])
-    if certs:
-        story.append(Spacer(1,6))
-        story.append(Paragraph("<b>CERTIFICATIONS</b>", section_heading))
-        for c in certs:
-            cname = rr_escape(c.get('name',''))
-            cid = rr_escape(c.get('id',''))
-            src = rr_escape(c.get('source',''))
-            line = cname
-            if cid:
-                line += f" (ID: {cid})"
-            if src:
-                line += f" — {src}"
-            story.append(Paragraph(line, normal))
-            story.append(Spacer(1,2))
-
-    # finalize PDF
     try:
-        #Using pdfkit
-        pdfkit.from_string(html_content, pdf_path)
+        job_id = render_jobs.submit(render_resume_job, services(), cache_key, data, template, backend,
+                                    meta={"template": template})
+    except JobQueueFull:
+        return jsonify({"error": "Too many resumes are being generated right now. Please try again in a moment."}), 503
+    return jsonify(_job_payload(job_id)), 202
+
+
+@bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    render_jobs = services().render_jobs
+    if render_jobs.status(job_id) is None:
+        return jsonify({"error": "Unknown job."}), 404
+    return jsonify(_job_payload(job_id))
+
+
+@bp.route('/jobs/<job_id>/download')
+def job_download(job_id):
+    render_jobs = services().render_jobs
+    # one read: the row may be pruned between separate status and result lookups
+    result = render_jobs.result(job_id)
+    if result is None:
+        if render_jobs.status(job_id) is None:
+            return jsonify({"error": "Unknown job."}), 404
+        return jsonify(_job_payload(job_id)), 409
+    return send_artifact(*result)
+
+
+@bp.route('/api/resume', methods=['POST'])
+def api_resume():
+    """One-shot rendering for integrations that already hold the resume data.
+
+    Accepts the whole document as JSON (see resume_schema.py). Returns the PDF,
+    or with "async": true (or ?async=1) a job id to poll on /jobs/<job_id>.
+    """
+    doc = request.get_json(silent=True)
+    if doc is None:
+        return jsonify({"error": "Expected a JSON resume document."}), 400
+    data, errors = validate_resume(doc)
+    if errors:
+        return jsonify({"error": "Invalid resume.", "details": errors}), 422
+
+    template = pick_template(doc.get('template'))
+    backend = pick_backend(doc.get('backend'))
+    data['template'] = template
+    if doc.get('async') or request.args.get('async') in ('1', 'true', 'yes'):
+        return start_render_job(data, template, backend)
+    return render_download(data, template, backend)
 
-        return send_file(pdf_path, as_attachment=True, download_name=pdf_name)
-    
-    except Exception as e:
-        print("PDF generation failed:", e)
-        # fallback: write HTML file and return it for manual save/open
-        html_file = os.path.join(static_dir, f"{user_name}_{template}_{ts}.html")
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        return send_file(html_file, as_attachment=True, download_name=os.path.basename(html_file))
+
+@bp.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text exposition of the per-stage metrics (METRICS_ENABLED=1)."""
+    if not metrics.ENABLED:
+        return "Metrics are disabled. Set METRICS_ENABLED=1 to enable them.", 404
+    return Response(metrics.render_text(), mimetype='text/plain; version=0.0.4')
+
+
+def __getattr__(name):
+    # "gunicorn app:app" still finds an app, but importing this module (asgi.py,
+    # tests) no longer builds one as a side effect
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
+    app = create_app()
     port = int(os.environ.get("PORT", 5000))  # Render provides PORT
-    app.run(host="0.0.0.0", port=port, debug=True)
\ No newline at end of file
+    app.run(host="0.0.0.0", port=port, debug=True)
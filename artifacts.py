@@ -0,0 +1,80 @@
+# artifacts.py
+# Bounded storage for generated resumes in static/.
+# Files are evicted once older than `ttl` seconds, and the oldest files go
+# first whenever the directory exceeds `max_bytes`. Eviction runs on every
+# write and periodically from a background sweeper thread.
+
+import os
+import threading
+import time
+
+ARTIFACT_EXTENSIONS = (".pdf", ".html", ".tex")
+
+
+class ArtifactStore:
+    """Writes artifacts into `directory` and keeps it within size and age bounds."""
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, ttl=24 * 3600, sweep_interval=300):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self.evicted = 0
+
+    def save(self, filename, content):
+        """Write bytes to the store and return the file path."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, os.path.basename(filename))
+        with open(path, "wb") as f:
+            f.write(content)
+        self.sweep()
+        return path
+
+    def _artifacts(self):
+        # only generated files; static assets such as styles.css are never touched
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(ARTIFACT_EXTENSIONS):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def sweep(self):
+        """Delete expired files, then the oldest ones until under max_bytes."""
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        with self._lock:
+            now = time.time()
+            entries = sorted(self._artifacts())
+            total = sum(size for _, size, _ in entries)
+            for mtime, size, path in entries:
+                if now - mtime <= self.ttl and total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+            self.evicted += removed
+        return removed
+
+    def start_sweeper(self):
+        """Start the background sweeper thread (idempotent)."""
+        if self._sweeper is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(self.sweep_interval)
+                try:
+                    self.sweep()
+                except Exception as e:
+                    print("Artifact sweep failed:", e)
+
+        self._sweeper = threading.Thread(target=run, name="artifact-sweeper", daemon=True)
+        self._sweeper.start()
@@ -0,0 +1,382 @@
+# asgi.py
+# ASGI entry point: async serving mode, so LLM and PDF waits don't pin threads.
+#
+#   uvicorn asgi:app --host 0.0.0.0 --port 5000
+#
+# Requests that wait on the LLM or on PDF conversion are handled on the event
+# loop, where a waiting conversation costs a coroutine instead of a thread:
+#
+#   GET  /chat/subskills  sub-skill chips streamed from AsyncGroq
+#   POST /chat            the Flask view runs as usual, but a step-6 lookup is
+#                         deferred ("subskills_pending" / "subskill_groups_pending")
+#                         and awaited here
+#   GET  /generate        the Flask view reads the session and defers the render
+#                         ("render_pending"); the PDF worker is awaited here
+#   POST /api/resume      stateless render; the PDF worker is awaited
+#   GET  /skills/complete main-skill autocomplete, answered inline (per keystroke)
+#
+# LLM calls share one pooled httpx connection pool (LLM_MAX_CONNECTIONS) and
+# the same cache, single-flight and circuit breaker as the sync paths. All
+# other routes are the unchanged Flask app, run on a thread pool (WSGI_THREADS)
+# with buffered responses. None of them call the LLM or wait for a PDF
+# conversion: background jobs (/jobs) render on the job queue's own threads,
+# and their download only reads the stored result.
+
+import asyncio
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, quote
+
+import metrics
+from app import create_app, ASYNC_ENVIRON_KEY
+from downloads import cached_download, html_download, pdf_download
+from pdf_pool import PdfPoolBusy
+from rendering import pick_template, pick_backend, render_html, render_pdf
+from resume_schema import validate_resume
+from subskill_lookup import SubskillBatch, SubskillLookup, subskill_events
+from subskills import afetch_subskills, afetch_subskill_batch, astream_subskills, sse_event
+
+
+# ---- small ASGI helpers ----
+async def _read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+def _replay(body):
+    """A receive() that hands an already-read body to the Flask app."""
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+    return receive
+
+
+async def _respond(send, status, body, content_type, headers=()):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type.encode()),
+                    (b"content-length", str(len(body)).encode())]
+                   + [(k.encode(), v.encode()) for k, v in headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _attachment(filename):
+    # plain ASCII name plus the RFC 5987 form for names with other characters
+    ascii_name = filename.encode("ascii", "replace").decode("ascii").replace("?", "_").replace('"', "")
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename)}"
+
+
+async def _respond_json(send, status, payload, headers=()):
+    await _respond(send, status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+
+# ---- Flask app ----
+flask_app = create_app()
+svc = flask_app.extensions["resumebot"]
+
+
+def _mark_async(wsgi_app):
+    def wrapped(environ, start_response):
+        environ[ASYNC_ENVIRON_KEY] = True
+        return wsgi_app(environ, start_response)
+    return wrapped
+
+
+class WsgiBridge:
+    """Serves a WSGI app from ASGI on a thread pool, buffering each response.
+
+    (asgiref's WsgiToAsgi runs every request on one shared thread.)
+    """
+
+    def __init__(self, wsgi_app, threads):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="wsgi")
+
+    def _environ(self, scope, body):
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+            "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "SERVER_NAME": (scope.get("server") or ("localhost", 80))[0],
+            "SERVER_PORT": str((scope.get("server") or ("localhost", 80))[1]),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        if scope.get("client"):
+            environ["REMOTE_ADDR"] = scope["client"][0]
+        for name, value in scope.get("headers", []):
+            name = name.decode("latin-1").upper().replace("-", "_")
+            if name not in ("CONTENT_LENGTH", "CONTENT_TYPE"):
+                name = "HTTP_" + name
+            value = value.decode("latin-1")
+            environ[name] = f"{environ[name]},{value}" if name in environ else value
+        return environ
+
+    def _run(self, scope, body):
+        response = {}
+        chunks = []
+
+        def start_response(status, headers, exc_info=None):
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+            return chunks.append
+
+        result = self.wsgi_app(self._environ(scope, body), start_response)
+        try:
+            for data in result:
+                chunks.append(data)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return response["status"], response["headers"], b"".join(chunks)
+
+    async def __call__(self, scope, receive, send):
+        body = await _read_body(receive)
+        loop = asyncio.get_running_loop()
+        status, headers, content = await loop.run_in_executor(self.executor, self._run, scope, body)
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": content})
+
+
+flask_app.wsgi_app = _mark_async(flask_app.wsgi_app)
+wsgi = WsgiBridge(flask_app, threads=int(os.getenv("WSGI_THREADS", 32)))
+
+
+# ---- sub-skills ----
+# The lookup logic is shared with app.py (subskill_lookup.py); only the LLM
+# calls are awaited here, and cache/SQLite work runs on the default executor.
+async def _blocking(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+async def suggest_subskills(skill):
+    """Async app.suggest_subskills()."""
+    lookup = await _blocking(SubskillLookup, svc, skill)
+    lookup.begin()
+    if lookup.leader:
+        with lookup.leading("blocking"):
+            lookup.result = await afetch_subskills(svc.async_llm, lookup.skill)
+    elif lookup.call is not None:
+        with lookup.following():
+            lookup.result = await lookup.call.wait_async()
+    return await _blocking(lookup.answer)
+
+
+async def suggest_subskill_groups(skills):
+    """Async app.suggest_subskill_groups(): unknown skills share one awaited LLM call."""
+    batch = await _blocking(SubskillBatch, svc, skills)
+    batch.begin()
+    if batch.to_fetch:
+        with batch.leading():
+            batch.fetched = await afetch_subskill_batch(svc.async_llm, batch.to_fetch)
+    for key, call in batch.waiting.items():
+        with batch.following():
+            batch.found[key] = list(await call.wait_async())
+    return await _blocking(batch.answer)
+
+
+async def sse_subskills(skill):
+    """Async app.sse_subskills()."""
+    lookup = await _blocking(SubskillLookup, svc, skill)
+    lookup.begin()
+    if lookup.leader:
+        with lookup.leading("stream"):
+            async for item in astream_subskills(svc.async_llm, lookup.skill):
+                lookup.streamed.append(item)
+                yield sse_event("subskill", item)
+            lookup.result = lookup.streamed
+        events = await _blocking(lookup.closing_events)
+    else:
+        if lookup.call is not None:
+            with lookup.following():
+                lookup.result = await lookup.call.wait_async()
+        events = subskill_events(await _blocking(lookup.answer))
+    for event in events:
+        yield event
+
+
+async def chat_subskills_stream(scope, receive, send):
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    skill = (query.get("skill", [""])[0]).strip().lower()
+    if not skill:
+        return await _respond_json(send, 400, {"error": "Missing skill."})
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"text/event-stream; charset=utf-8"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no")],
+    })
+    events = sse_subskills(skill)
+    try:
+        async for event in events:
+            await send({"type": "http.response.body", "body": event.encode("utf-8"), "more_body": True})
+    finally:
+        await events.aclose()
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def complete_skills(scope, receive, send):
+    """Per-keystroke main-skill completions, answered without a thread hop."""
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    prefix = query.get("q", [""])[0]
+    try:
+        k = int(query.get("k", ["8"])[0])
+    except ValueError:
+        k = 8
+    await _respond_json(send, 200, {"q": prefix, "completions": svc.skill_autocomplete.complete(prefix, k)})
+
+
+async def _flask_response(scope, receive):
+    """Run the Flask app for this request; returns (response start message, body)."""
+    start = None
+    chunks = []
+
+    async def capture(message):
+        nonlocal start
+        if message["type"] == "http.response.start":
+            start = message
+        else:
+            chunks.append(message.get("body", b""))
+
+    await wsgi(scope, receive, capture)
+    return start, b"".join(chunks)
+
+
+async def chat(scope, receive, send):
+    """Run the Flask /chat view, then await any sub-skill lookup it deferred."""
+    start, body = await _flask_response(scope, receive)
+    headers = start["headers"]
+    if b'"subskills_pending"' in body or b'"subskill_groups_pending"' in body:
+        payload = json.loads(body)
+        if "subskills_pending" in payload:
+            payload["subskills"] = await suggest_subskills(payload.pop("subskills_pending"))
+        else:
+            payload["subskill_groups"] = await suggest_subskill_groups(payload.pop("subskill_groups_pending"))
+        body = json.dumps(payload).encode("utf-8")
+        headers = [(k, v) for k, v in headers if k.lower() != b"content-length"]
+        headers.append((b"content-length", str(len(body)).encode()))
+    await send(dict(start, headers=headers))
+    await send({"type": "http.response.body", "body": body})
+
+
+# ---- downloads ----
+async def _render(data, template, backend):
+    """The render half of app.render_download(). Returns (content, filename, mimetype, cache)."""
+    cache_key, cached = cached_download(svc, data, template, backend)
+    if cached is not None:
+        return (*cached, "HIT")
+    try:
+        if backend == "wkhtmltopdf":
+            html_content = render_html(data, template)
+            with metrics.PDF_CONVERSION.time(backend=backend, template=template):
+                pdf_bytes = await svc.pdf_pool.render_async(html_content)
+        else:
+            # in-process backends: keep their CPU work off the event loop
+            pdf_bytes = await _blocking(render_pdf, data, template, backend)
+        download = pdf_download(svc, cache_key, data, template, pdf_bytes)
+    except PdfPoolBusy:
+        raise
+    except Exception as e:
+        download = await _blocking(html_download, data, template, e)
+    return (*download, "MISS")
+
+
+async def _send_download(send, data, template, backend, headers=()):
+    """Async app.render_download(): render (or reuse) the resume and send it as a file."""
+    try:
+        content, filename, mimetype, cache = await _render(data, template, backend)
+    except PdfPoolBusy:
+        return await _respond(send, 503, b"Too many resumes are being generated right now. "
+                                         b"Please try again in a moment.", "text/plain",
+                              [("retry-after", "5"), *headers])
+    if svc.artifact_store is not None:
+        with metrics.ARTIFACT_WRITE.time():
+            await _blocking(svc.artifact_store.save, filename, content)
+    await _respond(send, 200, content, mimetype, [
+        ("content-disposition", _attachment(filename)),
+        ("x-render-cache", cache),
+        *headers,
+    ])
+
+
+async def api_resume(scope, receive, send):
+    """Native /api/resume for synchronous renders; anything else goes to Flask."""
+    body = await _read_body(receive)
+    try:
+        doc = json.loads(body)
+        data, errors = validate_resume(doc)
+    except ValueError:
+        doc, errors = None, ["not JSON"]
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    async_job = (isinstance(doc, dict) and doc.get("async")) or query.get("async", [""])[0] in ("1", "true", "yes")
+    if errors or async_job:
+        # error replies and background jobs are cheap: let the Flask view answer
+        return await wsgi(scope, _replay(body), send)
+
+    template = pick_template(doc.get("template"))
+    backend = pick_backend(doc.get("backend"))
+    data["template"] = template
+    await _send_download(send, data, template, backend)
+
+
+async def generate(scope, receive, send):
+    """Run the Flask /generate view for the session, then await the render it deferred."""
+    start, body = await _flask_response(scope, receive)
+    if start["status"] != 200 or b'"render_pending"' not in body:
+        await send(start)
+        return await send({"type": "http.response.body", "body": body})
+    pending = json.loads(body)["render_pending"]
+    # keep the session cookie the view set along with the template choice
+    cookies = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in start["headers"] if k.lower() == b"set-cookie"]
+    await _send_download(send, pending["data"], pending["template"], pending["backend"], cookies)
+
+
+ROUTES = {
+    ("GET", "/chat/subskills"): chat_subskills_stream,
+    ("GET", "/skills/complete"): complete_skills,
+    ("POST", "/chat"): chat,
+    ("GET", "/generate"): generate,
+    ("POST", "/api/resume"): api_resume,
+}
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # load the taxonomy and skill indexes before the first request
+                svc.skill_normalizer
+                svc.skill_autocomplete
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if "async_llm" in svc.__dict__:
+                    await svc.async_llm.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    handler = ROUTES.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+    if handler is None:
+        return await wsgi(scope, receive, send)
+    await handler(scope, receive, send)
@@ -0,0 +1,139 @@
+# batch_generate.py
+# Bulk resume generation without the chat flow.
+#
+# Usage:
+#   python batch_generate.py students.jsonl --out resumes/
+#   python batch_generate.py students.csv --out resumes/ --template ats --workers 8
+#
+# Input records have the same shape as session['data'] (name, email,
+# education, skills, certifications, projects, optional template). In CSV
+# files the list fields hold JSON strings. Records are streamed through a
+# process pool with a bounded number in flight, and each worker writes its PDF
+# straight to disk, so memory stays flat for any input size. Failures are
+# written to errors.jsonl in the output directory.
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from rendering import render_pdf, pick_template, pick_backend
+
+LIST_FIELDS = ("education", "skills", "certifications", "projects")
+
+
+def read_records(path, fmt=None):
+    """Yield (line_no, record) pairs from a JSONL or CSV file, one at a time.
+
+    Unparseable lines are yielded as (line_no, exception).
+    """
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                try:
+                    record = dict(row)
+                    for key in LIST_FIELDS:
+                        record[key] = json.loads(record[key]) if record.get(key) else []
+                    yield line_no, record
+                except ValueError as e:
+                    yield line_no, e
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError as e:
+                    yield line_no, e
+
+
+def _output_name(line_no, record, template):
+    name = re.sub(r"[^A-Za-z0-9_-]+", "_", str(record.get("name") or "resume")).strip("_") or "resume"
+    return f"{line_no:06d}_{name}_{template}_Resume.pdf"
+
+
+def render_record(line_no, record, out_dir, template, backend):
+    """Runs in a pool worker: render one record and write it to out_dir."""
+    template = pick_template(record.get("template") or template)
+    pdf_bytes = render_pdf(record, template, backend)
+    filename = _output_name(line_no, record, template)
+    with open(os.path.join(out_dir, filename), "wb") as f:
+        f.write(pdf_bytes)
+    return filename, len(pdf_bytes)
+
+
+def run_batch(records, out_dir, template="modern", backend=None, workers=4, progress_every=2.0, log=None):
+    """Render every record across a process pool; returns a summary dict."""
+    log = log or (lambda msg: print(msg, file=sys.stderr))
+    backend = pick_backend(backend)
+    os.makedirs(out_dir, exist_ok=True)
+    summary = {"ok": 0, "failed": 0, "bytes": 0}
+    start = last_report = time.perf_counter()
+    pending = {}
+
+    with open(os.path.join(out_dir, "errors.jsonl"), "w", encoding="utf-8") as errors, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+
+        def record_error(line_no, error):
+            summary["failed"] += 1
+            errors.write(json.dumps({"line": line_no, "error": str(error)}) + "\n")
+
+        def drain(limit):
+            nonlocal last_report
+            while len(pending) >= limit:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    line_no = pending.pop(fut)
+                    try:
+                        _, size = fut.result()
+                        summary["ok"] += 1
+                        summary["bytes"] += size
+                    except Exception as e:
+                        record_error(line_no, e)
+                now = time.perf_counter()
+                if now - last_report >= progress_every:
+                    last_report = now
+                    processed = summary["ok"] + summary["failed"]
+                    log(f"{processed} processed ({summary['failed']} failed), "
+                        f"{processed / (now - start):.1f} resumes/s")
+
+        for line_no, record in records:
+            if isinstance(record, Exception):
+                record_error(line_no, record)
+                continue
+            drain(workers * 2)
+            pending[pool.submit(render_record, line_no, record, out_dir, template, backend)] = line_no
+        drain(1)
+
+    summary["seconds"] = time.perf_counter() - start
+    total = summary["ok"] + summary["failed"]
+    summary["rate"] = total / summary["seconds"] if summary["seconds"] else 0.0
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate resumes in bulk from JSONL or CSV records.")
+    parser.add_argument("input", help="JSONL or CSV file of resume records")
+    parser.add_argument("--out", default="batch_output", help="output directory")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="input format (default: from extension)")
+    parser.add_argument("--template", default="modern", help="modern, classic or ats (records may override)")
+    parser.add_argument("--backend", help="wkhtmltopdf or reportlab (default: PDF_BACKEND)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="worker processes")
+    args = parser.parse_args(argv)
+
+    summary = run_batch(read_records(args.input, args.format), args.out, template=args.template,
+                        backend=args.backend, workers=max(1, args.workers))
+    print(f"{summary['ok']} resumes written, {summary['failed']} failed in {summary['seconds']:.1f}s "
+          f"({summary['rate']:.1f} resumes/s, {summary['bytes'] / 1024:.0f} KiB)")
+    if summary["failed"]:
+        print(f"See {os.path.join(args.out, 'errors.jsonl')} for failures")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
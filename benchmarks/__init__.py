@@ -0,0 +1 @@
+# Micro-benchmarks for the rendering hot paths (see benchmarks/run.py).
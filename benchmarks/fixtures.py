@@ -0,0 +1,46 @@
+# benchmarks/fixtures.py
+# Synthetic resumes in the shape of session['data'], from small to huge.
+
+LOREM = (
+    "Built and maintained services in Python & Flask, cut p95 latency by 40% "
+    "and wrote {tests} for the <core> modules_with_underscores #ops ~team. "
+)
+
+
+def make_resume(n_edu, n_skills, n_subskills, n_projects, desc_repeat, n_certs):
+    return {
+        "name": "Sam Sulekh",
+        "email": "sam.sulekh@example.com",
+        "phone": "+91 9876543210",
+        "linkedin": "https://linkedin.com/in/samsulekh",
+        "github": "https://github.com/samsulekh",
+        "location": "Pune, India",
+        "education": [
+            {"course": f"B.Tech Computer Science {i}", "college": "XYZ Institute of Technology", "year": str(2015 + i)}
+            for i in range(n_edu)
+        ],
+        "skills": [
+            {"mainskill": f"skill {i}", "subskills": [f"sub-skill {i}.{j}" for j in range(n_subskills)]}
+            for i in range(n_skills)
+        ],
+        "certifications": [
+            {"name": f"Certificate {i}", "id": f"CERT-{i:05d}", "source": "https://example.com/cert/%d" % i}
+            for i in range(n_certs)
+        ],
+        "projects": [
+            {
+                "name": f"Project {i}",
+                "description": LOREM * desc_repeat,
+                "repository": f"https://github.com/samsulekh/project-{i}",
+                "technologies": ["Python", "Flask", "Docker", "PostgreSQL"],
+            }
+            for i in range(n_projects)
+        ],
+    }
+
+
+FIXTURES = {
+    "small": make_resume(n_edu=1, n_skills=1, n_subskills=3, n_projects=1, desc_repeat=1, n_certs=0),
+    "typical": make_resume(n_edu=2, n_skills=5, n_subskills=6, n_projects=3, desc_repeat=2, n_certs=2),
+    "huge": make_resume(n_edu=6, n_skills=60, n_subskills=10, n_projects=40, desc_repeat=20, n_certs=25),
+}
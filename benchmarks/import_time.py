@@ -0,0 +1,78 @@
+# benchmarks/import_time.py
+# Import-time report for worker cold starts: runs `python -X importtime` on a
+# module (app by default) in a fresh interpreter and lists the most expensive
+# imports, grouped by top-level package.
+#
+# Usage (from the repo root):
+#   python -m benchmarks.import_time                  # report for `import app`
+#   python -m benchmarks.import_time --budget-ms 250  # also fail above 250 ms
+#   python -m benchmarks.import_time --module asgi --top 30
+#
+# Exits with status 1 when the total import time exceeds --budget-ms. Timings
+# are the best of --runs interpreter starts, to keep noise out of the budget.
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(module):
+    """One cold import of `module`. Returns [(name, self_us, cumulative_us, depth)]."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), (len(m.group(3)) - 1) // 2))
+    return rows
+
+
+def by_package(rows):
+    """Self time summed per top-level package (flask, groq, templates, ...)."""
+    totals = {}
+    for name, self_us, _, _ in rows:
+        top = name.split(".")[0]
+        totals[top] = totals.get(top, 0) + self_us
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-module import cost of the app.")
+    parser.add_argument("--module", default="app", help="module to import (default: app)")
+    parser.add_argument("--top", type=int, default=20, help="how many packages to list")
+    parser.add_argument("--runs", type=int, default=3, help="cold imports to run; the fastest is reported")
+    parser.add_argument("--budget-ms", type=float, default=0, help="fail when the total exceeds this")
+    args = parser.parse_args(argv)
+
+    best = None
+    for _ in range(max(1, args.runs)):
+        rows = measure(args.module)
+        total = next((cum for name, _, cum, depth in rows if name == args.module and depth == 0), 0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+
+    print(f"{'package':32} {'self':>10} {'share':>7}")
+    packages = sorted(by_package(rows).items(), key=lambda kv: kv[1], reverse=True)
+    for name, us in packages[:args.top]:
+        print(f"{name:32} {us / 1000:8.1f}ms {us / max(total, 1):7.1%}")
+    print(f"{'total (import ' + args.module + ')':32} {total / 1000:8.1f}ms")
+
+    if args.budget_ms and total / 1000 > args.budget_ms:
+        print(f"Import time {total / 1000:.1f}ms exceeds the {args.budget_ms:.0f}ms budget.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# benchmarks/run.py
+# Times the rendering hot paths on small/typical/huge fixtures, records peak
+# memory allocated per call, and compares against a saved baseline.
+#
+# Usage (from the repo root):
+#   python -m benchmarks.run                    # run and compare to baseline
+#   python -m benchmarks.run --save-baseline    # record a new baseline
+#   python -m benchmarks.run --filter templates --tolerance 0.3
+#
+# Exits with status 1 when any benchmark is slower than baseline * (1 + tolerance)
+# or allocates more than baseline * (1 + alloc-tolerance) at peak.
+#
+# Timings only compare on the machine that recorded them, so no baseline is
+# shipped: record one once per machine (or CI runner image) with
+# --save-baseline. Without one the comparison is skipped (status 0), unless
+# --require-baseline is given, which makes a missing baseline status 2.
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import templates
+from latex_resume import latex_escape, build_latex_from_data
+from benchmarks.fixtures import FIXTURES, LOREM
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _cold(fn):
+    # template sections are memoized; a cold run clears the fragment cache first
+    def run(data):
+        templates._fragments.clear()
+        return fn(data)
+    return run
+
+
+def benchmarks():
+    """name -> zero-argument callable."""
+    from reportlab_renderer import build_story, render_reportlab, rr_escape
+
+    cases = {}
+    for size, data in FIXTURES.items():
+        for tpl in ("modern", "classic", "ats"):
+            fn = getattr(templates, f"{tpl}_template")
+            cases[f"templates.{tpl}.cold.{size}"] = (lambda fn=fn, data=data: _cold(fn)(data))
+            cases[f"templates.{tpl}.warm.{size}"] = (lambda fn=fn, data=data: fn(data))
+            cases[f"reportlab.story.{tpl}.{size}"] = (lambda tpl=tpl, data=data: build_story(data, tpl))
+        cases[f"reportlab.pdf.modern.{size}"] = (lambda data=data: render_reportlab(data, "modern"))
+        cases[f"latex.build.{size}"] = (lambda data=data: build_latex_from_data(data))
+    text = LOREM * 20
+    cases["escape.rr_escape"] = lambda: rr_escape(text)
+    cases["escape.latex_escape"] = lambda: latex_escape(text)
+    cases["escape.html_esc"] = lambda: templates._esc(text)
+    return cases
+
+
+def time_call(fn, min_time=0.2, repeat=5):
+    """Best seconds-per-call over `repeat` rounds of at least `min_time` each."""
+    fn()  # warm-up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def peak_alloc(fn):
+    """Peak bytes allocated during one call."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rendering micro-benchmarks.")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.10,
+                        help="allowed growth of peak allocation vs baseline (0.10 = 10%%)")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="exit with status 2 instead of skipping when there is no baseline (CI)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent timing each benchmark")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':40} {'time/call':>12} {'vs base':>9} {'peak alloc':>12} {'vs base':>9}")
+    for name, fn in benchmarks().items():
+        if args.filter not in name:
+            continue
+        seconds = time_call(fn, min_time=args.min_time)
+        peak = peak_alloc(fn)
+        results[name] = {"seconds": seconds, "peak_bytes": peak}
+        ratio = alloc_ratio = ""
+        base = baseline.get(name)
+        if base and not args.save_baseline:
+            change = seconds / base["seconds"] - 1
+            ratio = f"{change:+.0%}"
+            if change > args.tolerance:
+                regressions.append(f"{name} (time)")
+                ratio += " !"
+            if base.get("peak_bytes"):
+                alloc_change = peak / base["peak_bytes"] - 1
+                alloc_ratio = f"{alloc_change:+.0%}"
+                if alloc_change > args.alloc_tolerance:
+                    regressions.append(f"{name} (alloc)")
+                    alloc_ratio += " !"
+        print(f"{name:40} {seconds * 1e6:10.1f}us {ratio:>9} {peak / 1024:10.1f}KiB {alloc_ratio:>9}")
+
+    if args.save_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not any(name in baseline for name in results):
+        print(f"Comparison skipped: no baseline for these benchmarks in {args.baseline}. "
+              "Record one with --save-baseline.")
+        return 2 if args.require_baseline else 0
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%} time / "
+              f"{args.alloc_tolerance:.0%} peak allocation: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+# conversation.py
+# Declarative step table for the /chat flow.
+#
+# Each step says where its answer is stored and which step comes next, so
+# chat() is a single dict lookup instead of an if/elif ladder:
+#
+#   field steps   store the (lowercased) answer at data[key] or, for list
+#                 sections, in a new or the latest entry of data[section]
+#   choice steps  only branch: `on` maps an answer ("yes"/"no") to a step,
+#                 anything else goes to `next`
+#
+# Steps that share a `group` are consecutive fields of one entry; at the
+# group's first step a comma-separated message ("b.tech, xyz college, 2024")
+# fills them all, but only with exactly one part per field and each part
+# matching its field's `pattern` (the year must look like a year). Anything
+# else is stored as typed, so "University of California, Berkeley" stays a
+# college. A `many` step starts one entry per comma-separated item instead
+# ("python, sql, docker" adds three main skills); the sub-skills for several
+# new skills come back grouped as "python: django, flask; sql: joins".
+#
+# Commands start with a slash so they never collide with answers (a project
+# may well be called "edit tool"); where no free-text answer is expected (yes/no
+# questions, the final step) the slash is optional:
+#   /edit <section>           change name/email, or pick an entry of a list section
+#   /edit <section> <n>       re-enter entry n; the others are left alone
+#   /edit <section> add       add one more entry
+#   /remove <section> <n>     delete entry n
+# After an edit the user returns to the step they were on.
+
+import re
+
+
+class Step:
+    def __init__(self, question, section=None, key=None, new_entry=False, parse=None,
+                 next=None, on=None, group=None, many=False, store=None, pattern=None):
+        self.question = question
+        self.section = section      # data list this step writes to (None: top-level field)
+        self.key = key              # field name; None for choice steps
+        self.new_entry = new_entry  # True: start a new entry in data[section]
+        self.parse = parse          # optional str -> stored value
+        self.next = next
+        self.on = on or {}          # answer -> step name, or (step name, question)
+        self.group = group
+        self.many = many            # True: each comma-separated item is a new entry
+        self.store = store          # optional (data, value) -> error, replacing the default write
+        self.pattern = re.compile(pattern) if pattern else None   # a grouped part must match to fill this field
+
+
+MAX_ENTRIES_PER_ANSWER = 8   # cap for `many` steps ("python, sql, ..." adds at most this many)
+
+YEAR = r"(19|20)\d\d(\s*[-–]\s*((19|20)\d\d|present))?"   # "2024", "2020 - 2024", "2022-present"
+
+
+def split_entries(message):
+    """Distinct non-empty comma-separated items, at most MAX_ENTRIES_PER_ANSWER."""
+    items = dict.fromkeys(p.strip() for p in message.split(","))
+    items.pop("", None)
+    return list(items)[:MAX_ENTRIES_PER_ANSWER]
+
+
+def pending_skills(data):
+    """The trailing skill entries still waiting for their sub-skills."""
+    skills = data.get("skills") or []
+    pending = []
+    for entry in reversed(skills):
+        if "subskills" in entry:
+            break
+        pending.append(entry)
+    return pending[::-1]
+
+
+def store_subskills(data, value):
+    """Sub-skills for the newest main skill, or "skill: a, b; skill: c" for several."""
+    skills = data.get("skills")
+    if not skills:
+        return f"Error: Please enter the {ENTRY_LABELS['skills']} first."
+    pending = pending_skills(data) or skills[-1:]
+    if len(pending) == 1:
+        name, sep, items = value.partition(":")
+        if sep and name.strip() == pending[0]["mainskill"].strip():
+            value = items
+        pending[0]["subskills"] = value.split(',')
+        return None
+
+    names = [entry["mainskill"].strip() for entry in pending]
+    chosen = {}
+    for part in value.split(";"):
+        if not part.strip():
+            continue
+        name, sep, items = part.partition(":")
+        if not sep or name.strip() not in names:
+            example = "; ".join(f"{n}: ..." for n in names)
+            return f"Please pick sub-skills per skill, like '{example}'."
+        chosen[name.strip()] = [item.strip() for item in items.split(",") if item.strip()]
+    for entry, name in zip(pending, names):
+        entry["subskills"] = chosen.get(name, [])
+    return None
+
+
+STEPS = {
+    "name": Step("Hi there! I'm ResumeBot. Let's build your resume! What is your name?",
+                 key="name", next="email"),
+    "email": Step("Great! What is your email?", key="email", next="course"),
+
+    "course": Step("Now, tell me about your education. What is your course?",
+                   section="education", key="course", new_entry=True, next="college", group="education"),
+    "college": Step("Which college did you study at for this course?",
+                    section="education", key="college", next="year", group="education"),
+    "year": Step("What year did you complete it?",
+                 section="education", key="year", next="more_education", group="education", pattern=YEAR),
+    "more_education": Step("Would you like to add another education detail? (yes/no)",
+                           section="education", on={"no": "mainskill"}, next="course"),
+
+    "mainskill": Step("Now, let's talk about your skills. Enter a main skill (or several, comma-separated):",
+                      section="skills", key="mainskill", new_entry=True, many=True, next="subskills"),
+    "subskills": Step("Here are 10 related sub-skills. Select the ones you have (comma-separated):",
+                      section="skills", key="subskills", store=store_subskills, next="more_skills"),
+    "more_skills": Step("Would you like to add another main skill? (yes/no)",
+                        section="skills", on={"yes": ("mainskill", "Enter another main skill:")},
+                        next="has_certifications"),
+
+    "has_certifications": Step("Do you have any certifications? (yes/no)",
+                               section="certifications", on={"yes": "cert_name"}, next="project_name"),
+    "cert_name": Step("Enter the certificate name:",
+                      section="certifications", key="name", new_entry=True, next="cert_id", group="certifications"),
+    "cert_id": Step("Enter the certificate ID:",
+                    section="certifications", key="id", next="cert_source", group="certifications"),
+    "cert_source": Step("Where did you get this certification from?",
+                        section="certifications", key="source", next="more_certifications", group="certifications"),
+    "more_certifications": Step("Would you like to add another certification? (yes/no)",
+                                section="certifications", on={"no": "project_name"}, next="cert_name"),
+
+    "project_name": Step("Tell me about your projects. What is the project name?",
+                         section="projects", key="name", new_entry=True, next="project_description"),
+    "project_description": Step("Provide a brief description of the project:",
+                                section="projects", key="description", next="project_technologies"),
+    "project_technologies": Step("Enter the project repository link:",
+                                 section="projects", key="technologies", parse=lambda v: v.split(", "),
+                                 next="more_projects"),
+    "more_projects": Step("Would you like to add another project? (yes/no)",
+                          section="projects", on={"no": "done"}, next="project_name"),
+
+    "done": Step("All done! Generating your resume now... (type '/edit' and a section, e.g. '/edit skills' "
+                 "or '/edit projects 2', to change it)", next="done"),
+}
+FIRST_STEP = "name"
+# old sessions stored the position in this list as an int
+STEP_ORDER = list(STEPS)
+
+# where "/edit <section>" starts; top-level fields are sections of their own,
+# for list sections this is the step that starts an entry
+SECTION_START = {
+    "name": "name",
+    "email": "email",
+    "education": "course",
+    "skills": "mainskill",
+    "certifications": "cert_name",
+    "projects": "project_name",
+}
+SECTION_ALIASES = {"skill": "skills", "certification": "certifications", "certificates": "certifications",
+                   "certs": "certifications", "project": "projects", "educations": "education"}
+ENTRY_LABELS = {"education": "course", "skills": "main skill",
+                "certifications": "certificate name", "projects": "project name"}
+
+_COMMAND = re.compile(r"^(/?)(edit|remove)\s+(\w+)(?:\s+(\d+|add))?$")
+
+
+# group name -> its steps in order, for multi-field answers
+_GROUPS = {}
+for _name, _step in STEPS.items():
+    if _step.group:
+        _GROUPS.setdefault(_step.group, []).append(_name)
+
+
+def empty_resume():
+    return {"name": "", "email": "", "education": [], "skills": [], "certifications": [], "projects": []}
+
+
+def current_step(state):
+    """Step name stored in the session state (accepts legacy integer steps)."""
+    step = state.get("step", FIRST_STEP)
+    if isinstance(step, int):
+        step = STEP_ORDER[step] if 0 <= step < len(STEP_ORDER) else "done"
+    return step if step in STEPS else FIRST_STEP
+
+
+def _section_of(step):
+    return step.section or step.key
+
+
+def _entry_list(section, entries):
+    key = STEPS[SECTION_START[section]].key
+    return ", ".join(f"{i}. {entry.get(key) or '?'}" for i, entry in enumerate(entries, 1))
+
+
+def _edit(state, data, section, which):
+    start = SECTION_START[section]
+    label = ENTRY_LABELS.get(section, section)
+    here = current_step(state)
+    if section not in ENTRY_LABELS:
+        state["edit"] = {"section": section, "return_to": here}
+        state["step"] = start
+        return f"Let's change your {section}. {STEPS[start].question}"
+
+    entries = data.setdefault(section, [])
+    if which is None:
+        if len(entries) > 1:
+            return (f"Which {label} do you want to change? {_entry_list(section, entries)}. "
+                    f"Type '/edit {section} <number>', or '/edit {section} add' for a new one.")
+        which = "1" if entries else "add"
+    if which == "add":
+        index = len(entries)
+        intro = f"Let's add another {label}."
+    else:
+        index = int(which) - 1
+        if not 0 <= index < len(entries):
+            return f"There is no {label} {which}. Your {section}: {_entry_list(section, entries) or 'none yet'}."
+        entries.pop(index)
+        intro = f"Let's redo {label} {which}."
+    # the re-entered entry is appended as usual and moved back to `index` once complete
+    state["edit"] = {"section": section, "return_to": here, "index": index, "start": len(entries)}
+    state["step"] = start
+    return f"{intro} {STEPS[start].question}"
+
+
+def _remove(state, data, section, which):
+    entries = data.get(section) or []
+    label = ENTRY_LABELS.get(section, section)
+    if section not in ENTRY_LABELS or which in (None, "add"):
+        return "Use '/remove <section> <number>', e.g. '/remove projects 2'."
+    index = int(which) - 1
+    if not 0 <= index < len(entries):
+        return f"There is no {label} {which}. Your {section}: {_entry_list(section, entries) or 'none yet'}."
+    entries.pop(index)
+    return f"Removed {label} {which}. {STEPS[current_step(state)].question}"
+
+
+def _command(state, data, command, section, which):
+    """Run "/edit" or "/remove"; returns the reply."""
+    section = SECTION_ALIASES.get(section, section)
+    if section not in SECTION_START:
+        return f"I can {command}: {', '.join(SECTION_START)}."
+    step = STEPS[current_step(state)]
+    if state.get("edit"):
+        return f"Let's finish your {state['edit']['section']} first. {step.question}"
+    if step.section == section and step.key and not step.new_entry:
+        # the newest entry is half filled in; indices would shift under it
+        return f"Let's finish this {ENTRY_LABELS[section]} first. {step.question}"
+    if command == "remove":
+        return _remove(state, data, section, which)
+    return _edit(state, data, section, which)
+
+
+def _finish_edit(data, edit):
+    """Move the entries added during an entry edit back to the edited position."""
+    if "index" not in edit:
+        return
+    entries = data.get(edit["section"]) or []
+    added = entries[edit["start"]:]
+    del entries[edit["start"]:]
+    entries[edit["index"]:edit["index"]] = added
+
+
+def _store(step, data, value):
+    """Write one answer; returns an error message or None."""
+    if step.store:
+        return step.store(data, value)
+    if step.parse:
+        value = step.parse(value)
+    if step.section is None:
+        data[step.key] = value
+    elif step.new_entry and step.many:
+        items = split_entries(value) or [value]
+        data.setdefault(step.section, []).extend({step.key: item} for item in items)
+    elif step.new_entry:
+        data.setdefault(step.section, []).append({step.key: value})
+    elif not data.get(step.section):
+        return f"Error: Please enter the {ENTRY_LABELS[step.section]} first."
+    else:
+        data[step.section][-1][step.key] = value
+    return None
+
+
+def _answers(name, step, message):
+    """(step name, value) pairs for one message.
+
+    Only at the first step of a group is a message split on commas, and only
+    when every field gets exactly one part that fits it.
+    """
+    if step.group and name == _GROUPS[step.group][0]:
+        names = _GROUPS[step.group]
+        parts = [p.strip() for p in message.split(",")]
+        if len(parts) == len(names) and all(
+                part and (STEPS[n].pattern is None or STEPS[n].pattern.fullmatch(part))
+                for n, part in zip(names, parts)):
+            return list(zip(names, parts))
+    return [(name, message)]
+
+
+def advance(state, data, message):
+    """Apply one user message.
+
+    state is the session (holds "step" and, while editing, "edit"); data is
+    the resume dict and is updated in place. Returns (answered, question):
+    the step names that stored an answer and the next question to show.
+    """
+    name = current_step(state)
+    step = STEPS[name]
+    match = _COMMAND.match(message)
+    if match and (match.group(1) or not step.key):
+        return [], _command(state, data, *match.group(2, 3, 4))
+
+    answered = []
+    if step.key:
+        for name, value in _answers(name, step, message):
+            step = STEPS[name]
+            error = _store(step, data, value)
+            if error:
+                return answered, error
+            answered.append(name)
+
+    target = step.on.get(message, step.next)
+    question = None
+    if isinstance(target, tuple):
+        target, question = target
+
+    edit = state.get("edit")
+    if edit and (_section_of(STEPS[target]) != edit["section"] or ("index" in edit and not STEPS[target].key)):
+        # finished the field or entry being edited: go back to where the user was
+        _finish_edit(data, edit)
+        target, question = edit["return_to"], None
+        state["edit"] = None
+
+    state["step"] = target
+    return answered, question or STEPS[target].question
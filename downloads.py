@@ -0,0 +1,42 @@
+# downloads.py
+# The parts of a resume download shared by /generate and /api/resume (app.py)
+# and the async /api/resume (asgi.py): the render cache lookup, file names,
+# caching a fresh PDF and the HTML fallback when PDF conversion fails. Only
+# the conversion itself differs (blocking in Flask, awaited in asgi).
+
+import datetime
+
+import metrics
+from render_cache import resume_cache_key
+from rendering import renderer_version, render_html
+
+
+def resume_filename(data, template, ext):
+    user_name = data.get('name', 'resume').strip().replace(' ', '_') or 'resume'
+    ts = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    return f"{user_name}_{template}_Resume_{ts}.{ext}"
+
+
+def cached_download(svc, data, template, backend):
+    """(cache_key, (content, filename, mimetype) or None) for an identical recent render."""
+    cache_key = resume_cache_key(data, template, renderer_version(backend))
+    cached = svc.render_cache.get(cache_key)
+    metrics.RENDER_CACHE.inc(result="miss" if cached is None else "hit")
+    return cache_key, cached
+
+
+def pdf_download(svc, cache_key, data, template, pdf_bytes):
+    """(content, filename, mimetype) for freshly rendered PDF bytes, which are cached."""
+    filename = resume_filename(data, template, 'pdf')
+    metrics.OUTPUT_BYTES.observe(len(pdf_bytes), kind="pdf")
+    svc.render_cache.put(cache_key, pdf_bytes, filename, 'application/pdf')
+    return pdf_bytes, filename, 'application/pdf'
+
+
+def html_download(data, template, error):
+    """(content, filename, mimetype) of the HTML resume, for when PDF conversion failed."""
+    print("PDF generation failed:", error)
+    metrics.PDF_FALLBACKS.inc()
+    html_bytes = render_html(data, template).encode('utf-8')
+    metrics.OUTPUT_BYTES.observe(len(html_bytes), kind="html")
+    return html_bytes, resume_filename(data, template, 'html'), 'text/html'
@@ -0,0 +1,187 @@
+# jobs.py
+# Asynchronous resume rendering: the request thread only submits a job and
+# later polls for the result.
+#
+# Job records (status, result, error) live in a SQLite table (RENDER_JOB_DB),
+# so with several gunicorn workers /jobs/<id> can be polled from any of them.
+# With ARTIFACT_MODE=memory (or RENDER_JOB_DB=:memory:) nothing is written to
+# disk; the records are per-process and a single worker (or sticky routing)
+# is required.
+#
+# The job itself runs on a thread of the worker that accepted it rather than
+# in a process pool: it shares that worker's render cache and PdfWorkerPool,
+# so background jobs and /generate share the same renderer limits, and the
+# PDF conversion already runs outside the Python process.
+#
+# Finished jobs are kept for `ttl` seconds after they finish. Queued and
+# running jobs are kept while the worker that owns them is alive: it touches
+# their rows every HEARTBEAT seconds, and rows whose heartbeat stopped (the
+# worker died) are dropped `ttl` seconds later.
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from downloads import html_download, pdf_download
+from rendering import render_pdf
+
+HEARTBEAT = 30   # seconds between touches of this worker's unfinished jobs
+COLUMNS = ["job_id", "status", "created", "updated", "meta", "content", "filename", "mimetype", "error"]
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are queued or running."""
+
+
+def render_resume_job(svc, cache_key, data, template, backend):
+    """Runs on a job thread. Returns (content, filename, mimetype), like /generate.
+
+    wkhtmltopdf conversions wait for room in svc.pdf_pool rather than failing
+    when it is busy. A fresh PDF is cached under `cache_key`; if conversion
+    fails the job falls back to the HTML resume.
+    """
+    try:
+        pdf_bytes = render_pdf(data, template, backend, pool=svc.pdf_pool, wait=True)
+    except Exception as e:
+        return html_download(data, template, e)
+    return pdf_download(svc, cache_key, data, template, pdf_bytes)
+
+
+class JobQueue:
+    """Render jobs run on a thread pool, recorded in SQLite."""
+
+    def __init__(self, workers=2, max_jobs=256, ttl=900, db_path=":memory:"):
+        self.workers = workers
+        self.max_jobs = max_jobs   # queued and running jobs; finished ones only expire
+        self.ttl = ttl
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(render_jobs)")]
+        if columns and columns != COLUMNS:
+            # records in an older layout; jobs are short-lived, so start over
+            self._db.execute("DROP TABLE render_jobs")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS render_jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " updated REAL NOT NULL,"
+            " meta TEXT NOT NULL,"
+            " content BLOB,"
+            " filename TEXT,"
+            " mimetype TEXT,"
+            " error TEXT)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = set()   # ids of this worker's queued and running jobs
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="render-job")
+            threading.Thread(target=self._heartbeat, name="render-job-heartbeat", daemon=True).start()
+        return self._executor
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(HEARTBEAT)
+            with self._lock:
+                if self._pending:
+                    now = time.time()
+                    self._db.executemany("UPDATE render_jobs SET updated = ? WHERE job_id = ?",
+                                         [(now, job_id) for job_id in self._pending])
+                    self._db.commit()
+
+    def _prune(self, now):
+        # finished rows ttl after they finished, unfinished ones ttl after their last heartbeat
+        self._db.execute("DELETE FROM render_jobs WHERE updated < ?", (now - self.ttl,))
+
+    def _insert(self, status, meta, result=None):
+        job_id = uuid.uuid4().hex
+        content, filename, mimetype = result or (None, None, None)
+        now = time.time()
+        self._db.execute(
+            "INSERT INTO render_jobs (job_id, status, created, updated, meta, content, filename, mimetype)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, status, now, now, json.dumps(meta or {}),
+             None if content is None else sqlite3.Binary(content), filename, mimetype),
+        )
+        self._db.commit()
+        return job_id
+
+    def _update(self, job_id, sql, params, finished=False):
+        with self._lock:
+            self._db.execute(f"UPDATE render_jobs SET {sql}, updated = ? WHERE job_id = ?",
+                             (*params, time.time(), job_id))
+            self._db.commit()
+            if finished:
+                self._pending.discard(job_id)
+
+    def _run(self, job_id, fn, args):
+        self._update(job_id, "status = 'running'", ())
+        try:
+            content, filename, mimetype = fn(*args)
+        except Exception as e:
+            self._update(job_id, "status = 'failed', error = ?", (str(e),), finished=True)
+        else:
+            self._update(job_id, "status = 'done', content = ?, filename = ?, mimetype = ?",
+                         (sqlite3.Binary(content), filename, mimetype), finished=True)
+
+    def submit(self, fn, *args, meta=None):
+        """Start fn(*args) on a job thread and return the new job id.
+
+        fn must return (content, filename, mimetype).
+        """
+        executor = self._get_executor()
+        with self._lock:
+            self._prune(time.time())
+            count = self._db.execute(
+                "SELECT COUNT(*) FROM render_jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+            if count >= self.max_jobs:
+                self._db.commit()
+                raise JobQueueFull("Too many render jobs in progress")
+            job_id = self._insert("queued", meta)
+            self._pending.add(job_id)
+        executor.submit(self._run, job_id, fn, args)
+        return job_id
+
+    def add_result(self, result, meta=None):
+        """Register an already finished job (content, filename, mimetype), e.g. from the render cache."""
+        with self._lock:
+            return self._insert("done", meta, result)
+
+    def get(self, job_id):
+        """The job record as a dict ({"status", "created", "meta", "error"}), or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, created, meta, error FROM render_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, created, meta, error = row
+        return {"status": status, "created": created, "meta": json.loads(meta), "error": error}
+
+    def status(self, job_id):
+        """'queued', 'running', 'done' or 'failed' (None for unknown ids)."""
+        job = self.get(job_id)
+        return job["status"] if job else None
+
+    def result(self, job_id):
+        """(content, filename, mimetype) of a finished job; None if it is unknown or not done."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content, filename, mimetype FROM render_jobs WHERE job_id = ? AND status = 'done'",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        content, filename, mimetype = row
+        return bytes(content), filename, mimetype
+
+    def error(self, job_id):
+        job = self.get(job_id)
+        return job["error"] if job else None
@@ -0,0 +1,154 @@
+# latex_compile.py
+# Local pdflatex compile path for the LaTeX resume (the "latex" PDF backend).
+#
+# Most of a pdflatex run on a resume is spent loading the preamble packages
+# (xcolor, hyperref, tabularx, titlesec, enumitem, lato, ...). The preamble is
+# fixed (LATEX_PREAMBLE), so it is dumped once into a format file with
+# `pdflatex -ini ... \dump`, and every resume is compiled with `-fmt` against
+# it: the document only contains \begin{document}...\end{document}.
+#
+# Compiled PDFs are cached on disk by the hash of (preamble, body), so an
+# unchanged resume is never compiled twice, across restarts and workers.
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from latex_resume import LATEX_PREAMBLE, build_latex_body
+
+
+class LatexError(RuntimeError):
+    """pdflatex failed, timed out or is not installed."""
+
+
+def find_pdflatex():
+    """Path to the pdflatex binary (PDFLATEX_PATH overrides PATH lookup)."""
+    binary = os.getenv("PDFLATEX_PATH") or shutil.which("pdflatex")
+    if not binary:
+        raise LatexError("pdflatex executable not found; install TeX Live or set PDFLATEX_PATH")
+    return binary
+
+
+def content_hash(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class LatexCompiler:
+    """Compiles resume bodies against a precompiled preamble, with a PDF cache."""
+
+    def __init__(self, cache_dir, preamble=LATEX_PREAMBLE, timeout=30, max_cached=500,
+                 precompile=True, binary=None):
+        self.cache_dir = cache_dir
+        self.preamble = preamble
+        self.timeout = timeout
+        self.max_cached = max_cached
+        self.precompile = precompile
+        self.binary = binary
+        self.preamble_hash = content_hash(preamble)[:16]
+        self._format_lock = threading.Lock()
+        self.hits = 0
+        self.compiles = 0
+
+    def _run(self, args, cwd):
+        cmd = [self.binary or find_pdflatex(), "-interaction=nonstopmode", "-halt-on-error"] + args
+        try:
+            # formats are looked up on TEXFORMATS; the trailing separator keeps the default path
+            env = dict(os.environ, TEXFORMATS=os.path.abspath(self.cache_dir) + os.pathsep)
+            result = subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            raise LatexError(f"pdflatex took longer than {self.timeout}s")
+        if result.returncode != 0:
+            log = result.stdout.decode("utf-8", "replace")
+            # the first "! ..." line is the actual TeX error
+            error = next((line for line in log.splitlines() if line.startswith("!")), log[-300:])
+            raise LatexError(f"pdflatex exited with code {result.returncode}: {error.strip()}")
+
+    def format_name(self):
+        """Name of the dumped preamble format, building it on first use."""
+        name = f"resume-preamble-{self.preamble_hash}"
+        path = os.path.join(self.cache_dir, name)
+        with self._format_lock:
+            if not os.path.exists(path + ".fmt"):
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with tempfile.TemporaryDirectory() as tmp:
+                    with open(os.path.join(tmp, "preamble.tex"), "w", encoding="utf-8") as f:
+                        f.write(self.preamble + "\\dump\n")
+                    self._run(["-ini", f"-jobname={name}", "&pdflatex", "preamble.tex"], cwd=tmp)
+                    # publish atomically so concurrent workers never load a half-written format
+                    os.replace(os.path.join(tmp, name + ".fmt"), path + ".fmt")
+        return name
+
+    def _cache_path(self, body):
+        return os.path.join(self.cache_dir, content_hash(self.preamble, body) + ".pdf")
+
+    def _trim(self):
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".pdf"):
+                    entries.append((entry.stat().st_mtime, entry.path))
+        for _, path in sorted(entries)[:max(0, len(entries) - self.max_cached)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def compile(self, body):
+        """PDF bytes for a document body (\\begin{document} ... \\end{document})."""
+        cached = self._cache_path(body)
+        try:
+            with open(cached, "rb") as f:
+                pdf = f.read()
+            self.hits += 1
+            os.utime(cached)   # keep recently used entries when trimming
+            return pdf
+        except FileNotFoundError:
+            pass
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "resume.tex"), "w", encoding="utf-8") as f:
+                if self.precompile:
+                    f.write(body)
+                else:
+                    f.write(self.preamble + body)
+            args = ["resume.tex"]
+            if self.precompile:
+                args = [f"-fmt={self.format_name()}"] + args
+            self._run(args, cwd=tmp)
+            with open(os.path.join(tmp, "resume.pdf"), "rb") as f:
+                pdf = f.read()
+        self.compiles += 1
+
+        tmp_path = f"{cached}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp_path, cached)
+        self._trim()
+        return pdf
+
+    def render(self, data):
+        return self.compile(build_latex_body(data))
+
+
+_default = None
+
+
+def render_latex(data):
+    """PDF bytes via the process-wide compiler (configured from LATEX_* env vars)."""
+    global _default
+    if _default is None:
+        _default = LatexCompiler(
+            cache_dir=os.getenv("LATEX_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "resumebot-latex"),
+            timeout=int(os.getenv("LATEX_TIMEOUT", "30")),
+            max_cached=int(os.getenv("LATEX_CACHE_ENTRIES", "500")),
+            precompile=os.getenv("LATEX_PRECOMPILE", "1").lower() not in ("0", "false", "no"),
+        )
+    return _default.render(data)
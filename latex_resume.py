@@ -0,0 +1,181 @@
+# latex_resume.py
+# LaTeX version of the resume: escaping helper, fixed preamble and document builder.
+
+import re
+
+# Bump whenever the LaTeX produced below changes, so cached renders are not reused.
+LATEX_RENDERER_VERSION = "1"
+
+# Fixed preamble shared by every resume. It never depends on the data, which
+# is what lets latex_compile.py dump it once into a precompiled format file.
+LATEX_PREAMBLE = r"""\documentclass[letterpaper,10pt]{article}
+\usepackage[dvipsnames]{xcolor}
+\usepackage[hidelinks]{hyperref}
+\usepackage{tabularx}
+\usepackage{geometry}
+\usepackage{titlesec}
+\usepackage{enumitem}
+\usepackage{fancyhdr}
+\usepackage[default]{lato}
+\usepackage{parskip}
+\usepackage{multicol}
+\hypersetup{colorlinks=true,urlcolor=blue}
+\geometry{left=0.6in, top=0.5in, right=0.6in, bottom=0.5in}
+\pagestyle{fancy}
+\fancyhf{}
+\renewcommand{\headrulewidth}{0pt}
+\titleformat{\section}{\large\bfseries\color{MidnightBlue}\uppercase}{}{0em}{}[\titlerule]
+\titlespacing{\section}{0pt}{6pt}{3pt}
+\setlength{\parskip}{0pt}
+\setlength{\itemsep}{2pt}
+\newcommand{\resumeItem}[1]{\item #1}
+\newcommand{\resumeListStart}{\begin{itemize}[leftmargin=*,noitemsep,topsep=0pt]}
+\newcommand{\resumeListEnd}{\end{itemize}}
+"""
+
+
+def latex_escape(text: str) -> str:
+    if text is None: return ""
+    s = str(text)
+    s = s.replace("\\", r"\textbackslash{}")
+    # escape common latex specials
+    for a,b in [('&', r'\&'),('%', r'\%'),('$', r'\$'),('#', r'\#'),('_', r'\_'),
+                ('{', r'\{'),('}', r'\}'),('~', r'\textasciitilde{}'),('^', r'\^{}'),
+                ('<', r'\textless{}'),('>', r'\textgreater{}')]:
+        s = s.replace(a,b)
+    return s
+
+def build_latex_body(data: dict) -> str:
+    """Everything from \\begin{document} on; pair it with LATEX_PREAMBLE."""
+    # Gather fields (use original casing when available)
+    name = latex_escape(data.get('name','')).upper()
+    email = latex_escape(data.get('email',''))
+    phone = latex_escape(data.get('phone',''))
+    linkedin = latex_escape(data.get('linkedin',''))
+    github = latex_escape(data.get('github',''))
+    location = latex_escape(data.get('location',''))
+
+    # professional summary: build a short automated summary or allow model-generated summary stored in data
+    prof_summary = latex_escape(data.get('professional_summary', ''))
+    if not prof_summary:
+        parts = []
+        if data.get('education'):
+            e = data['education'][0]
+            if e.get('course'): parts.append(f"{e.get('course')} graduate")
+            if e.get('college'): parts.append(f"from {e.get('college')}")
+        if data.get('skills'):
+            tops = [s.get('mainskill','') for s in data.get('skills',[])][:3]
+            tops = [t for t in tops if t]
+            if tops: parts.append("Skills: " + ", ".join(tops))
+        if data.get('projects'):
+            pnames = [p.get('name','') for p in data.get('projects',[])][:2]
+            if pnames: parts.append("Projects: " + ", ".join(pnames))
+        prof_summary = latex_escape(" . ".join(parts) or "Computer Science graduate with practical experience in software and AI projects.")
+
+    # Build skills table rows
+    skills_rows = []
+    for s in data.get('skills', []):
+        ms = latex_escape(s.get('mainskill',''))
+        subs = s.get('subskills') or []
+        subs_str = ", ".join([latex_escape(x) for x in subs])
+        if ms:
+            skills_rows.append((ms, subs_str))
+
+    # Education
+    edu_lines = []
+    for e in data.get('education', []):
+        ct = latex_escape(e.get('course',''))
+        clg = latex_escape(e.get('college',''))
+        yr = latex_escape(e.get('year',''))
+        edu_lines.append((ct, clg, yr))
+
+    # Projects
+    project_blocks = []
+    for p in data.get('projects', []):
+        pname = latex_escape(p.get('name',''))
+        pdesc = latex_escape(p.get('description','') or "")
+        repo = latex_escape(p.get('repository','') or "")
+        techs = p.get('technologies') or []
+        techs_str = ", ".join([latex_escape(t) for t in techs]) if techs else ""
+        project_blocks.append({'name':pname,'desc':pdesc,'repo':repo,'techs':techs_str})
+
+    # Certifications
+    certs = []
+    for c in data.get('certifications', []):
+        cname = latex_escape(c.get('name',''))
+        cid = latex_escape(c.get('id',''))
+        src = latex_escape(c.get('source',''))
+        certs.append((cname,cid,src))
+
+    # Build contact lines (use tel/mail/link if present)
+    contact_parts = []
+    if location: contact_parts.append(location)
+    if phone: contact_parts.append(r"\href{tel:+%s}{%s}" % (re.sub(r'\D','', phone), phone))
+    if email: contact_parts.append(r"\href{mailto:%s}{%s}" % (email, email))
+    contact_line = " \\quad | \\quad ".join(contact_parts)
+
+    links = []
+    if linkedin: links.append(r"\href{%s}{LinkedIn}" % linkedin)
+    if github: links.append(r"\href{%s}{GitHub}" % github)
+    links_line = " \\quad | \\quad ".join(links)
+
+    latex = "\\begin{document}\n"
+    # Header
+    latex += "\\begin{center}\n"
+    latex += "  {\\LARGE \\textbf{" + name + "}} \\\\\n"
+    if contact_line:
+        latex += "  " + contact_line + " \\\\\n"
+    if links_line:
+        latex += "  " + links_line + " \n"
+    latex += "\\end{center}\n\n"
+
+    # Summary
+    latex += "\\section*{PROFESSIONAL SUMMARY}\n" + prof_summary + "\n\n"
+
+    # Core skills with tabularx
+    latex += "\\section*{CORE SKILLS}\n\\begin{tabularx}{\\textwidth}{@{} l X @{} }\n"
+    # default content (you can replace with dynamic categories if preferred)
+    latex += "  \\textbf{Languages:} & Python, C++, Java, JavaScript, HTML/CSS \\\\\n"
+    latex += "  \\textbf{Frameworks:} & Hugging Face, TensorFlow, PyTorch, React Native, OpenCV \\\\\n"
+    latex += "  \\textbf{Tools:} & Git, Docker, VS Code, Firebase, Streamlit, Gradio, Postman \\\\\n"
+    latex += "\\end{tabularx}\n\n"
+
+    # Projects
+    if project_blocks:
+        latex += "\\section*{KEY PROJECTS}\n"
+        for p in project_blocks:
+            repo_text = f" \\href{{{p['repo']}}}{{[Repo]}}" if p['repo'] else ""
+            latex += "\\textbf{" + p['name'] + "}" + repo_text + " \\\\\n"
+            if p['techs']: latex += "\\textit{" + p['techs'] + "}\\\\\n"
+            if p['desc']:
+                latex += "\\resumeListStart\n"
+                latex += f"  \\resumeItem{{{p['desc']}}}\n"
+                latex += "\\resumeListEnd\n\n"
+
+    # Education
+    if edu_lines:
+        latex += "\\section*{EDUCATION}\n"
+        for ct, clg, yr in edu_lines:
+            latex += "\\textbf{" + ct + "} \\hfill " + yr + " \\\\\n"
+            if clg:
+                latex += clg + " \\\\\n"
+        latex += "\n"
+
+    # Certifications
+    if certs:
+        latex += "\\section*{CERTIFICATIONS}\n\\resumeListStart\n"
+        for cname, cid, src in certs:
+            line = cname
+            if cid: line += " (ID: " + cid + ")"
+            if src and src.startswith("http"):
+                line += f" \\href{{{src}}}{{[Cert]}}"
+            latex += f"  \\resumeItem{{{line}}}\n"
+        latex += "\\resumeListEnd\n\n"
+
+    latex += "\\end{document}\n"
+    return latex
+
+
+def build_latex_from_data(data: dict) -> str:
+    """Complete standalone LaTeX document for the resume."""
+    return LATEX_PREAMBLE + build_latex_body(data)
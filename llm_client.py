@@ -0,0 +1,180 @@
+# llm_client.py
+# Resilient wrapper around the Groq client used for sub-skill suggestions.
+#
+# - connect/read timeouts on every request
+# - bounded retries with full-jitter exponential backoff (transient errors only)
+# - a circuit breaker: after `failure_threshold` consecutive failures, calls
+#   fail fast with CircuitOpen for `reset_timeout` seconds, then one trial call
+#   is let through (half-open) to decide whether to close it again
+#
+# LLMClient exposes `chat.completions.create(...)` like groq.Client, so it is a
+# drop-in replacement. AsyncLLMClient is the same for groq.AsyncGroq, on one
+# shared, bounded httpx connection pool (used by the ASGI entry point). Point GROQ_BASE_URL at stub_llm_server.py to test it
+# against injected latency and failures.
+#
+# The Groq SDK is imported when the first client is built, not with this module,
+# so importing CircuitOpen stays cheap.
+
+import asyncio
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+
+class CircuitOpen(Exception):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self):
+        """True if a call may go upstream now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._trial_running:
+                return False
+            self._trial_running = True   # half-open: let exactly one call through
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def release_trial(self):
+        """Give back a half-open trial whose call ended without an answer (e.g. cancelled)."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def _retryable(exc):
+    import groq
+    if isinstance(exc, (groq.APITimeoutError, groq.APIConnectionError, groq.RateLimitError)):
+        return True
+    return isinstance(exc, groq.APIStatusError) and exc.status_code >= 500
+
+
+class LLMClient:
+    """groq.Client look-alike with timeouts, retries and a circuit breaker."""
+
+    def __init__(self, api_key=None, base_url=None, connect_timeout=3.0, read_timeout=15.0,
+                 max_retries=2, backoff=0.25, breaker=None, client=None):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        if client is None:
+            import groq
+            import httpx
+            client = groq.Client(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                max_retries=0,   # retries are handled here, with jitter and the breaker
+            )
+        self._client = client
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        """Same arguments as client.chat.completions.create()."""
+        if not self.breaker.allow():
+            raise CircuitOpen("LLM circuit breaker is open")
+        attempt = 0
+        while True:
+            try:
+                result = self._client.chat.completions.create(**kwargs)
+            except Exception as e:
+                if _retryable(e) and attempt < self.max_retries:
+                    # full jitter: sleep somewhere in [0, backoff * 2^attempt]
+                    time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+                    attempt += 1
+                    continue
+                self.breaker.record_failure()
+                raise
+            except BaseException:
+                # cancelled or interrupted: says nothing about upstream, but a
+                # half-open trial must not stay claimed or allow() never passes again
+                self.breaker.release_trial()
+                raise
+            self.breaker.record_success()
+            return result
+
+
+class AsyncLLMClient:
+    """groq.AsyncGroq look-alike with the same timeouts, retries and breaker.
+
+    All requests share one httpx.AsyncClient, so keep-alive connections to
+    the LLM endpoint are reused across conversations; max_connections bounds
+    how many requests are in flight at once (the rest wait for a connection).
+    """
+
+    def __init__(self, api_key=None, base_url=None, connect_timeout=3.0, read_timeout=15.0,
+                 max_retries=2, backoff=0.25, breaker=None, max_connections=100,
+                 max_keepalive=20, client=None):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self._http = None
+        if client is None:
+            import groq
+            import httpx
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=max_connections,
+                                    max_keepalive_connections=max_keepalive),
+            )
+            client = groq.AsyncGroq(api_key=api_key, base_url=base_url, http_client=self._http, max_retries=0)
+        self._client = client
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, **kwargs):
+        """Same arguments as client.chat.completions.create(); must be awaited."""
+        if not self.breaker.allow():
+            raise CircuitOpen("LLM circuit breaker is open")
+        attempt = 0
+        while True:
+            try:
+                result = await self._client.chat.completions.create(**kwargs)
+            except Exception as e:
+                if _retryable(e) and attempt < self.max_retries:
+                    await asyncio.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+                    attempt += 1
+                    continue
+                self.breaker.record_failure()
+                raise
+            except BaseException:
+                # cancelled or interrupted: says nothing about upstream, but a
+                # half-open trial must not stay claimed or allow() never passes again
+                self.breaker.release_trial()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
@@ -0,0 +1,143 @@
+# metrics.py
+# Minimal Prometheus-style counters and histograms for per-stage latency.
+#
+# Collection is off unless METRICS_ENABLED=1; when off, every inc()/observe()/
+# time() call returns immediately, so instrumented code pays almost nothing.
+# render_text() produces the Prometheus text exposition format for /metrics.
+
+import os
+import threading
+import time
+
+ENABLED = os.getenv("METRICS_ENABLED", "0").lower() in ("1", "true", "yes")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_registry = []
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def _label_str(names, values, extra=""):
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        if not ENABLED:
+            return
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        return self._values.get(key, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}   # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        if not ENABLED:
+            return
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def time(self, **labels):
+        """Context manager observing the elapsed seconds of its block."""
+        if not ENABLED:
+            return _NOOP_TIMER
+        return _Timer(self, labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, state):
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, le)} {count}")
+                inf = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, inf)} {state[-1]}")
+                lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {state[-2]}")
+                lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {state[-1]}")
+        return lines
+
+
+def render_text():
+    """All registered metrics in Prometheus text format."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---- metrics for /chat and /generate ----
+LLM_LATENCY = Histogram("resumebot_llm_request_seconds", "Latency of sub-skill LLM calls.", ("mode",))
+LLM_DEDUPLICATED = Counter("resumebot_llm_deduplicated_total", "Sub-skill lookups that joined an in-flight LLM call.")
+SKILL_TAXONOMY = Counter("resumebot_skill_taxonomy_total", "Step-6 lookups checked against the bundled taxonomy.", ("result",))
+SKILL_MATCH = Counter("resumebot_skill_match_total", "Step-6 main skills by how they matched a known skill.", ("match",))
+LLM_ERRORS = Counter("resumebot_llm_errors_total", "Failed sub-skill LLM calls.", ("mode",))
+TEMPLATE_RENDER = Histogram("resumebot_template_render_seconds", "HTML template build time.", ("template",))
+PDF_CONVERSION = Histogram("resumebot_pdf_conversion_seconds", "PDF conversion time.", ("backend", "template"))
+PDF_FALLBACKS = Counter("resumebot_pdf_fallback_total", "Downloads that fell back to HTML after PDF failure.")
+OUTPUT_BYTES = Histogram("resumebot_output_bytes", "Size of generated files.", ("kind",), buckets=BYTES_BUCKETS)
+ARTIFACT_WRITE = Histogram("resumebot_artifact_write_seconds", "Time writing generated files to static/.")
+RENDER_CACHE = Counter("resumebot_render_cache_total", "Render cache lookups.", ("result",))
@@ -0,0 +1,175 @@
+# pdf_pool.py
+# Bounded pool of long-lived PDF renderer processes (/generate, render jobs,
+# /api/resume).
+#
+# Each of the PDF_WORKERS slots owns one pdf_worker.py process, fed HTML over
+# its stdin and answering with the PDF on its stdout. With libwkhtmltox
+# installed the worker starts Qt/WebKit once and reuses it for every
+# document; otherwise it runs the wkhtmltopdf binary per document (see
+# pdf_worker.py). Workers are started on first use and replaced after
+# PDF_RECYCLE_AFTER conversions (renderer memory only grows), after a crash,
+# or when a conversion runs past PDF_JOB_TIMEOUT seconds (the worker is
+# killed). At most PDF_MAX_QUEUE conversions wait for a free worker; beyond
+# that PdfPoolBusy is raised instead of queueing.
+
+import asyncio
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pdf_worker import read_message, write_message
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdf_worker.py")
+KILL_GRACE = 5   # seconds past job_timeout before a silent worker is killed
+
+
+class PdfPoolBusy(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+def find_wkhtmltopdf():
+    """Path to the wkhtmltopdf binary (WKHTMLTOPDF_PATH overrides PATH lookup)."""
+    binary = os.getenv("WKHTMLTOPDF_PATH") or shutil.which("wkhtmltopdf")
+    if not binary:
+        raise OSError("wkhtmltopdf executable not found; install it or set WKHTMLTOPDF_PATH")
+    return binary
+
+
+def html_to_pdf(html_content, timeout=30, binary=None):
+    """Convert an HTML string to PDF bytes (stdin -> stdout, no temp files)."""
+    binary = binary or find_wkhtmltopdf()
+    try:
+        result = subprocess.run(
+            [binary, "--quiet", "--encoding", "utf-8", "-", "-"],
+            input=html_content.encode("utf-8"),
+            capture_output=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        raise TimeoutError(f"wkhtmltopdf took longer than {timeout}s")
+    # wkhtmltopdf exits with 1 on non-fatal resource warnings; trust the output
+    if not result.stdout.startswith(b"%PDF"):
+        err = result.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(f"wkhtmltopdf exited with code {result.returncode}: {err}")
+    return result.stdout
+
+
+class RendererProcess:
+    """One pdf_worker.py process; converts one document at a time."""
+
+    def __init__(self, job_timeout):
+        self.jobs = 0
+        self.job_timeout = job_timeout
+        self._killed = False
+        self._proc = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env={**os.environ, "PDF_JOB_TIMEOUT": str(job_timeout)},
+        )
+
+    def alive(self):
+        return self._proc.poll() is None
+
+    def _kill(self):
+        self._killed = True
+        self._proc.kill()
+
+    def convert(self, html_content):
+        self.jobs += 1
+        # the worker times out its own wkhtmltopdf runs; this catches a hung library call
+        timer = threading.Timer(self.job_timeout + KILL_GRACE, self._kill)
+        timer.start()
+        try:
+            write_message(self._proc.stdin, html_content.encode("utf-8"))
+            reply = read_message(self._proc.stdout)
+        except OSError:
+            reply = None
+        finally:
+            timer.cancel()
+        if reply is None:
+            self.close()
+            if self._killed:
+                raise TimeoutError(f"PDF worker took longer than {self.job_timeout}s")
+            raise RuntimeError(f"PDF worker exited with code {self._proc.returncode}")
+        kind, body = reply[:1], reply[1:]
+        if kind == b"T":
+            raise TimeoutError(body.decode("utf-8", "replace"))
+        if kind != b"K":
+            raise RuntimeError(body.decode("utf-8", "replace"))
+        return body
+
+    def close(self):
+        """Let the worker exit (end of its input), killing it if it does not."""
+        try:
+            self._proc.stdin.close()
+            self._proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._proc.kill()
+            self._proc.wait()
+        self._proc.stdout.close()
+
+
+class PdfWorkerPool:
+    """`workers` renderer processes, each recycled after `recycle_after` conversions."""
+
+    def __init__(self, workers=2, max_queue=16, job_timeout=30, recycle_after=200):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.job_timeout = job_timeout
+        self.recycle_after = recycle_after
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-worker")
+        # one entry per worker slot: an idle RendererProcess, or None until one is started
+        self._idle = queue.SimpleQueue()
+        for _ in range(workers):
+            self._idle.put(None)
+
+    def _convert(self, html_content):
+        process = self._idle.get()
+        try:
+            if process is None or not process.alive():
+                process = None
+                process = RendererProcess(self.job_timeout)
+            return process.convert(html_content)
+        finally:
+            if process is not None and (process.jobs >= self.recycle_after or not process.alive()):
+                process.close()
+                process = None
+            self._idle.put(process)
+
+    def _submit(self, html_content, wait=False):
+        acquired = self._slots.acquire(timeout=self.job_timeout) if wait else self._slots.acquire(blocking=False)
+        if not acquired:
+            raise PdfPoolBusy("PDF queue is full")
+        try:
+            future = self._executor.submit(self._convert, html_content)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def render(self, html_content, wait=False):
+        """Convert HTML to PDF bytes on one of the pool's workers.
+
+        Raises PdfPoolBusy when the queue is full (with wait=True, only after
+        waiting job_timeout seconds for room) and TimeoutError when the
+        conversion runs past job_timeout.
+        """
+        return self._submit(html_content, wait).result()
+
+    async def render_async(self, html_content):
+        """render() for event-loop callers: awaits the conversion without holding a thread."""
+        return await asyncio.wrap_future(self._submit(html_content))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for _ in range(self.workers):
+            process = self._idle.get()
+            if process is not None:
+                process.close()
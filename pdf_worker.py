@@ -0,0 +1,115 @@
+# pdf_worker.py
+# Long-lived PDF renderer process, started and fed by pdf_pool.PdfWorkerPool.
+#
+# The worker loads libwkhtmltox (the library behind the wkhtmltopdf binary)
+# once, so Qt/WebKit starts once per worker instead of once per conversion,
+# then converts documents until its stdin closes. Without the library
+# (WKHTMLTOX_PATH, or the system library search) it runs the wkhtmltopdf
+# binary for each document, which still pays the startup.
+#
+# Protocol over stdin/stdout: every message is an 8-byte big-endian length
+# followed by that many bytes. The pool sends UTF-8 HTML; the worker answers
+# with a message whose first byte is b"K" (the PDF follows), b"T" (timed out)
+# or b"E" (an error text follows).
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+
+HEADER = struct.Struct(">Q")
+
+
+def read_message(stream):
+    """The next message, or None at end of stream."""
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    size, = HEADER.unpack(header)
+    payload = stream.read(size)
+    if len(payload) < size:
+        return None
+    return payload
+
+
+def write_message(stream, payload):
+    stream.write(HEADER.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def load_wkhtmltox():
+    """libwkhtmltox with the converter API set up, or None if it is not installed."""
+    path = os.getenv("WKHTMLTOX_PATH") or ctypes.util.find_library("wkhtmltox")
+    if not path:
+        return None
+    try:
+        lib = ctypes.CDLL(path)
+    except OSError as e:
+        print("libwkhtmltox unavailable, using the wkhtmltopdf binary:", e, file=sys.stderr)
+        return None
+    lib.wkhtmltopdf_create_global_settings.restype = ctypes.c_void_p
+    lib.wkhtmltopdf_create_object_settings.restype = ctypes.c_void_p
+    lib.wkhtmltopdf_set_global_setting.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+    lib.wkhtmltopdf_set_object_setting.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+    lib.wkhtmltopdf_create_converter.restype = ctypes.c_void_p
+    lib.wkhtmltopdf_create_converter.argtypes = [ctypes.c_void_p]
+    lib.wkhtmltopdf_add_object.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_char_p]
+    lib.wkhtmltopdf_convert.argtypes = [ctypes.c_void_p]
+    lib.wkhtmltopdf_get_output.restype = ctypes.c_long
+    lib.wkhtmltopdf_get_output.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte))]
+    lib.wkhtmltopdf_destroy_converter.argtypes = [ctypes.c_void_p]
+    if not lib.wkhtmltopdf_init(0):
+        print("libwkhtmltox failed to initialize, using the wkhtmltopdf binary", file=sys.stderr)
+        return None
+    return lib
+
+
+def library_converter(lib):
+    def convert(html_bytes):
+        settings = lib.wkhtmltopdf_create_global_settings()
+        page = lib.wkhtmltopdf_create_object_settings()
+        lib.wkhtmltopdf_set_object_setting(page, b"web.defaultEncoding", b"utf-8")
+        converter = lib.wkhtmltopdf_create_converter(settings)
+        try:
+            lib.wkhtmltopdf_add_object(converter, page, html_bytes)
+            if not lib.wkhtmltopdf_convert(converter):
+                raise RuntimeError("libwkhtmltox conversion failed")
+            output = ctypes.POINTER(ctypes.c_ubyte)()
+            size = lib.wkhtmltopdf_get_output(converter, ctypes.byref(output))
+            return ctypes.string_at(output, size)
+        finally:
+            lib.wkhtmltopdf_destroy_converter(converter)
+    return convert
+
+
+def binary_converter(timeout):
+    from pdf_pool import html_to_pdf
+    return lambda html_bytes: html_to_pdf(html_bytes.decode("utf-8"), timeout)
+
+
+def main():
+    # keep the protocol stream private: anything the renderer prints goes to stderr
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    stdin = sys.stdin.buffer
+    lib = load_wkhtmltox()
+    convert = library_converter(lib) if lib else binary_converter(int(os.getenv("PDF_JOB_TIMEOUT", 30)))
+    while True:
+        html_bytes = read_message(stdin)
+        if html_bytes is None:
+            break
+        try:
+            pdf_bytes = convert(html_bytes)
+        except TimeoutError as e:
+            write_message(out, b"T" + str(e).encode("utf-8", "replace"))
+        except Exception as e:
+            write_message(out, b"E" + str(e).encode("utf-8", "replace"))
+        else:
+            write_message(out, b"K" + pdf_bytes)
+    if lib:
+        lib.wkhtmltopdf_deinit()
+
+
+if __name__ == "__main__":
+    main()
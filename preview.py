@@ -0,0 +1,63 @@
+# preview.py
+# Live resume preview for the chat UI.
+# The preview is split into sections; after each chat answer only sections
+# whose content hash changed are rebuilt and sent (as HTML fragments).
+# Section bodies come from the memoized fragments in templates.py, so no
+# full document is rendered.
+
+from templates import _esc, section_html, content_hash, MODERN_CSS
+
+PREVIEW_SECTIONS = ("header", "education", "skills", "projects", "certifications")
+PREVIEW_TITLES = {
+    "education": "Education",
+    "skills": "Core Skills",
+    "projects": "Key Projects",
+    "certifications": "Certifications",
+}
+
+
+def _header_html(data):
+    name = _esc(data.get("name", "")) or "Your Name"
+    email = _esc(data.get("email", ""))
+    out = f"<div class='header'><h1>{name}</h1>"
+    if email:
+        out += f"<div class='contact'>{email}</div>"
+    return out + "</div>"
+
+
+def _section_value(section, data):
+    if section == "header":
+        return [data.get("name", ""), data.get("email", "")]
+    return data.get(section, [])
+
+
+def _section_fragment(section, data):
+    if section == "header":
+        return _header_html(data)
+    return section_html(section, data)
+
+
+def preview_diff(data, sent_hashes):
+    """Fragments for sections that changed since `sent_hashes`.
+
+    Returns (changed, hashes): changed maps section -> HTML, hashes is the new
+    section -> content hash map to remember for the next call.
+    """
+    changed = {}
+    hashes = dict(sent_hashes or {})
+    for section in PREVIEW_SECTIONS:
+        h = content_hash(_section_value(section, data))
+        if hashes.get(section) != h:
+            hashes[section] = h
+            changed[section] = _section_fragment(section, data)
+    return changed, hashes
+
+
+def preview_document(data):
+    """Standalone HTML preview page assembled from the section fragments."""
+    body = ""
+    for s in PREVIEW_SECTIONS:
+        title = f"<h2>{PREVIEW_TITLES[s]}</h2>" if s in PREVIEW_TITLES else ""
+        body += f"<div class='section'>{title}<div id='preview-{s}'>{_section_fragment(s, data)}</div></div>"
+    return ("<!doctype html><html><head><meta charset='utf-8'/>" + MODERN_CSS
+            + "</head><body>" + body + "</body></html>")
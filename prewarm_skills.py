@@ -0,0 +1,124 @@
+# prewarm_skills.py
+# Offline job that fills the sub-skill suggestion store ahead of time.
+#
+# Usage:
+#   python prewarm_skills.py skills.txt                 # one main skill per line
+#   python prewarm_skills.py skills.txt --concurrency 8
+#   python prewarm_skills.py skills.txt --stub          # no network, canned answers
+#
+# Each answer is written to the store as soon as it arrives, so an interrupted
+# run can simply be restarted: skills already stored are skipped, as are
+# skills the bundled taxonomy (data/skill_taxonomy.json) already answers.
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from types import SimpleNamespace
+
+from skill_cache import SubskillCache, normalize_skill
+from skill_taxonomy import SkillTaxonomy
+from subskills import fetch_subskills
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "subskill_cache.db")
+
+
+class StubClient:
+    """Local stand-in for groq.Client: answers `chat.completions.create` offline."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, model, messages, **kwargs):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        skill = messages[-1]["content"]
+        if (kwargs.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps({s: [f"{s} topic {i}" for i in range(1, 11)] for s in json.loads(skill)})
+        else:
+            content = ", ".join(f"{skill} topic {i}" for i in range(1, 11))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def read_skills(lines):
+    """Unique normalized skills from an iterable of lines (blank lines and # comments skipped)."""
+    seen = set()
+    for line in lines:
+        line = line.split("#", 1)[0]
+        skill = normalize_skill(line)
+        if skill and skill not in seen:
+            seen.add(skill)
+            yield skill
+
+
+def prewarm(skills, client, cache, concurrency=4, log=print, taxonomy=None):
+    """Fetch and store sub-skills for every skill not yet in `cache` (or `taxonomy`).
+
+    At most `concurrency` requests are in flight. Returns a summary dict.
+    """
+    summary = {"stored": 0, "skipped": 0, "failed": 0}
+    pending = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+
+        def drain(block_until_below):
+            while len(pending) >= block_until_below:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    skill = pending.pop(fut)
+                    try:
+                        cache.set(skill, fut.result())
+                        summary["stored"] += 1
+                        log(f"stored   {skill}")
+                    except Exception as e:
+                        summary["failed"] += 1
+                        log(f"failed   {skill}: {e}")
+
+        for skill in skills:
+            if cache.contains(skill) or (taxonomy is not None and skill in taxonomy):
+                summary["skipped"] += 1
+                continue
+            drain(concurrency)
+            pending[pool.submit(fetch_subskills, client, skill)] = skill
+        drain(1)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-warm the sub-skill suggestion store.")
+    parser.add_argument("skills_file", help="file with one main skill per line ('-' for stdin)")
+    parser.add_argument("--db", default=os.getenv("SUBSKILL_CACHE_DB", DEFAULT_DB), help="SQLite store path")
+    parser.add_argument("--concurrency", type=int, default=4, help="max LLM requests in flight")
+    parser.add_argument("--stub", action="store_true", help="use the offline stub client instead of Groq")
+    args = parser.parse_args(argv)
+
+    if args.stub:
+        client = StubClient()
+    else:
+        from dotenv import load_dotenv
+        from llm_client import LLMClient
+        load_dotenv()
+        client = LLMClient(api_key=os.getenv("GROQ_API_KEY"), base_url=os.getenv("GROQ_BASE_URL") or None)
+
+    cache = SubskillCache(db_path=args.db)
+    taxonomy = SkillTaxonomy(pending_path=None)
+    if args.skills_file == "-":
+        skills = list(read_skills(sys.stdin))
+    else:
+        with open(args.skills_file, encoding="utf-8") as f:
+            skills = list(read_skills(f))
+
+    start = time.perf_counter()
+    summary = prewarm(skills, client, cache, concurrency=max(1, args.concurrency), taxonomy=taxonomy)
+    elapsed = time.perf_counter() - start
+    print(f"{summary['stored']} stored, {summary['skipped']} already present, "
+          f"{summary['failed']} failed in {elapsed:.1f}s")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
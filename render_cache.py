@@ -0,0 +1,68 @@
+# render_cache.py
+# Content-addressed cache of rendered resumes for /generate.
+# The key is a hash of the canonicalized resume data plus template name and
+# renderer version, so identical requests reuse the stored bytes.
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def resume_cache_key(data, template, renderer_version):
+    """Stable hash of the resume content, template and renderer version."""
+    content = {k: v for k, v in data.items() if k != "template"}
+    canonical = json.dumps(
+        [content, template, renderer_version],
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """In-memory LRU of rendered files, bounded by total bytes and entry age."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_age=600):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries = OrderedDict()   # key -> (created_at, content, filename, mimetype)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self._size -= len(entry[1])
+
+    def get(self, key):
+        """Return (content, filename, mimetype) or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.max_age:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2], entry[3]
+
+    def put(self, key, content, filename, mimetype):
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.time(), content, filename, mimetype)
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "entries": len(self._entries), "bytes": self._size}
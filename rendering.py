@@ -0,0 +1,72 @@
+# rendering.py
+# Shared resume render pipeline: template lookup and PDF backend selection.
+#
+# Backends:
+#   wkhtmltopdf - HTML templates from templates.py converted by wkhtmltopdf
+#   reportlab   - pure-Python story rendered in memory (reportlab_renderer.py)
+#   latex       - LaTeX resume compiled by a local pdflatex against a
+#                 precompiled preamble (latex_compile.py); ignores the template
+
+import os
+
+from templates import modern_template, classic_template, ats_template, RENDERER_VERSION
+from pdf_pool import html_to_pdf
+from metrics import TEMPLATE_RENDER, PDF_CONVERSION
+
+TEMPLATES = {
+    "modern": modern_template,
+    "classic": classic_template,
+    "ats": ats_template,
+}
+BACKENDS = ("wkhtmltopdf", "reportlab", "latex")
+DEFAULT_BACKEND = os.getenv("PDF_BACKEND", "wkhtmltopdf").lower()
+
+
+def pick_template(name):
+    name = (name or "modern").lower()
+    return name if name in TEMPLATES else "modern"
+
+
+def pick_backend(name):
+    name = (name or DEFAULT_BACKEND).lower()
+    return name if name in BACKENDS else "wkhtmltopdf"
+
+
+def renderer_version(backend):
+    """Version tag used in render cache keys."""
+    if backend == "reportlab":
+        from reportlab_renderer import REPORTLAB_RENDERER_VERSION
+        return f"reportlab-{REPORTLAB_RENDERER_VERSION}"
+    if backend == "latex":
+        from latex_resume import LATEX_RENDERER_VERSION
+        return f"latex-{LATEX_RENDERER_VERSION}"
+    return f"html-{RENDERER_VERSION}"
+
+
+def render_html(data, template):
+    template = pick_template(template)
+    with TEMPLATE_RENDER.time(template=template):
+        return TEMPLATES[template](data)
+
+
+def render_pdf(data, template, backend, pool=None, wait=False):
+    """PDF bytes for the resume. Only the selected backend does any work.
+
+    pool: optional PdfWorkerPool for the wkhtmltopdf backend; without it the
+    conversion runs inline in the calling process. wait: queue behind a full
+    pool instead of raising PdfPoolBusy (background jobs).
+    """
+    template = pick_template(template)
+    if backend == "reportlab":
+        from reportlab_renderer import render_reportlab
+        with PDF_CONVERSION.time(backend=backend, template=template):
+            return render_reportlab(data, template)
+    if backend == "latex":
+        from latex_compile import render_latex
+        with PDF_CONVERSION.time(backend=backend, template=template):
+            return render_latex(data)
+    html_content = render_html(data, template)
+    with PDF_CONVERSION.time(backend=backend, template=template):
+        if pool is not None:
+            return pool.render(html_content, wait=wait)
+        return html_to_pdf(html_content)
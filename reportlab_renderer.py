@@ -0,0 +1,263 @@
+# reportlab_renderer.py
+# Pure-Python PDF backend: builds the resume as a ReportLab story and renders
+# it into memory, no subprocess involved.
+# Styles are created once at import; each template picks a style set and a
+# section order, mirroring the HTML templates in templates.py.
+
+from io import BytesIO
+import html
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+# Bump whenever the PDF produced below changes, so cached renders are not reused.
+REPORTLAB_RENDERER_VERSION = "1"
+
+
+def rr_escape(text: str) -> str:
+    if text is None:
+        return ""
+    s = str(text)
+    return html.escape(s).replace('\n', '<br/>')
+
+
+_base = getSampleStyleSheet()
+
+
+def _make_styles(prefix, font, bold_font, heading_color, contact_color, header_align=1):
+    return {
+        "header": ParagraphStyle(
+            f"{prefix}Header",
+            parent=_base["Heading1"],
+            fontName=bold_font,
+            fontSize=18,
+            alignment=header_align,
+            spaceAfter=6,
+        ),
+        "contact": ParagraphStyle(
+            f"{prefix}Contact",
+            parent=_base["Normal"],
+            fontName=font,
+            fontSize=9,
+            alignment=header_align,
+            textColor=contact_color,
+            spaceAfter=10
+        ),
+        "section": ParagraphStyle(
+            f"{prefix}SectionHeading",
+            parent=_base["Heading2"],
+            fontName=bold_font,
+            fontSize=12,
+            textColor=heading_color,
+            spaceBefore=10,
+            spaceAfter=6,
+            leading=14,
+            leftIndent=0
+        ),
+        "normal": ParagraphStyle(
+            f"{prefix}NormalText",
+            parent=_base["Normal"],
+            fontName=font,
+            fontSize=10,
+            leading=12,
+        ),
+        "bullet": ParagraphStyle(
+            f"{prefix}Bullet",
+            parent=_base["Normal"],
+            fontName=font,
+            fontSize=10,
+            leftIndent=12,
+            bulletIndent=6,
+            leading=12,
+        ),
+    }
+
+
+STYLES = {
+    "modern": _make_styles("Modern", "Helvetica", "Helvetica-Bold", colors.HexColor('#0b5394'), colors.grey),
+    "classic": _make_styles("Classic", "Times-Roman", "Times-Bold", colors.black, colors.HexColor('#333333')),
+    "ats": _make_styles("Ats", "Helvetica", "Helvetica-Bold", colors.black, colors.black, header_align=0),
+}
+
+SKILLS_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('LEFTPADDING', (0,0), (-1,-1), 0),
+    ('RIGHTPADDING', (0,0), (-1,-1), 6),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+])
+
+
+def _header(data, st):
+    story = []
+    # Header: Name
+    name = rr_escape(data.get('name', '')).upper()
+    story.append(Paragraph(name, st["header"]))
+
+    # Contact line
+    contact_items = []
+    if data.get('location'):
+        contact_items.append(rr_escape(data.get('location')))
+    if data.get('phone'):
+        contact_items.append(rr_escape(data.get('phone')))
+    if data.get('email'):
+        contact_items.append(rr_escape(data.get('email')))
+    contact_line = " • ".join(contact_items)  # bullet as separator
+    if contact_line:
+        story.append(Paragraph(contact_line, st["contact"]))
+
+    # Links line (LinkedIn / GitHub) - displayed as plain text for compatibility
+    links = []
+    if data.get('linkedin'):
+        links.append("LinkedIn: " + rr_escape(data.get('linkedin')))
+    if data.get('github'):
+        links.append("GitHub: " + rr_escape(data.get('github')))
+    if links:
+        story.append(Paragraph(" • ".join(links), st["contact"]))
+
+    story.append(Spacer(1, 8))
+    return story
+
+
+def _summary(data, st, template):
+    prof = data.get('professional_summary') or ""
+    if not prof:
+        # Auto-generate short summary from fields if not present
+        parts = []
+        if data.get('education'):
+            e = data['education'][0]
+            if e.get('course'):
+                parts.append(f"{e.get('course')} graduate")
+            if e.get('college'):
+                parts.append(f"from {e.get('college')}")
+        if data.get('skills'):
+            tops = [s.get('mainskill','') for s in data.get('skills', [])][:3]
+            tops = [t for t in tops if t]
+            if tops:
+                parts.append("Skills: " + ", ".join(tops))
+        if data.get('projects'):
+            pnames = [p.get('name','') for p in data.get('projects', [])][:2]
+            pnames = [p for p in pnames if p]
+            if pnames:
+                parts.append("Projects: " + ", ".join(pnames))
+        prof = ". ".join(parts) if parts else "Computer Science graduate with practical experience in software development and AI projects."
+    return [
+        Paragraph("<b>PROFESSIONAL SUMMARY</b>", st["section"]),
+        Paragraph(rr_escape(prof), st["normal"]),
+    ]
+
+
+def _skills(data, st, template):
+    # Core skills - mainskill: subskills (table for visual templates, plain lines for ATS)
+    story = [Spacer(1, 6), Paragraph("<b>CORE SKILLS</b>", st["section"])]
+    skills = data.get('skills', [])
+    if not skills:
+        story.append(Paragraph("No skills provided.", st["normal"]))
+        return story
+    if template == 'ats':
+        for sk in skills:
+            ms = rr_escape(sk.get('mainskill',''))
+            subs_str = rr_escape(", ".join(sk.get('subskills') or []))
+            story.append(Paragraph(f"{ms}: {subs_str}", st["normal"]))
+        return story
+    table_data = []
+    for sk in skills:
+        ms = rr_escape(sk.get('mainskill',''))
+        subs = sk.get('subskills') or []
+        subs_str = rr_escape(", ".join(subs))
+        table_data.append([Paragraph(f"<b>{ms}</b>", st["normal"]), Paragraph(subs_str, st["normal"])])
+    table = Table(table_data, colWidths=[1.6*inch, None], hAlign='LEFT')
+    table.setStyle(SKILLS_TABLE_STYLE)
+    story.append(table)
+    return story
+
+
+def _projects(data, st, template):
+    projects = data.get('projects', [])
+    if not projects:
+        return []
+    story = [Spacer(1, 6), Paragraph("<b>KEY PROJECTS</b>", st["section"])]
+    for p in projects:
+        pname = rr_escape(p.get('name',''))
+        ptech = ", ".join(p.get('technologies') or [])
+        pdesc = rr_escape(p.get('description',''))
+        hdr = pname + (f" — {rr_escape(ptech)}" if ptech else "")
+        story.append(Paragraph(f"<b>{hdr}</b>", st["normal"]))
+        if pdesc:
+            # bullet-ish paragraph
+            story.append(Paragraph(pdesc, st["bullet"]))
+        # small spacer between projects
+        story.append(Spacer(1,4))
+    return story
+
+
+def _education(data, st, template):
+    edu = data.get('education', [])
+    if not edu:
+        return []
+    story = [Spacer(1, 6), Paragraph("<b>EDUCATION</b>", st["section"])]
+    for e in edu:
+        ct = rr_escape(e.get('course',''))
+        clg = rr_escape(e.get('college',''))
+        yr = rr_escape(e.get('year',''))
+        # render course + year then college beneath
+        story.append(Paragraph(f"<b>{ct}</b>" + (f" — {yr}" if yr else ""), st["normal"]))
+        if clg:
+            story.append(Paragraph(clg, st["normal"]))
+        story.append(Spacer(1,4))
+    return story
+
+
+def _certifications(data, st, template):
+    certs = data.get('certifications', [])
+    if not certs:
+        return []
+    story = [Spacer(1,6), Paragraph("<b>CERTIFICATIONS</b>", st["section"])]
+    for c in certs:
+        cname = rr_escape(c.get('name',''))
+        cid = rr_escape(c.get('id',''))
+        src = rr_escape(c.get('source',''))
+        line = cname
+        if cid:
+            line += f" (ID: {cid})"
+        if src:
+            line += f" — {src}"
+        story.append(Paragraph(line, st["normal"]))
+        story.append(Spacer(1,2))
+    return story
+
+
+# Section order per template (same order as the HTML templates)
+SECTION_ORDER = {
+    "modern": (_summary, _skills, _projects, _education, _certifications),
+    "classic": (_summary, _education, _projects, _skills, _certifications),
+    "ats": (_summary, _skills, _projects, _education, _certifications),
+}
+
+
+def build_story(data, template):
+    """List of flowables for the resume in the given template."""
+    st = STYLES[template]
+    story = _header(data, st)
+    for section in SECTION_ORDER[template]:
+        story.extend(section(data, st, template))
+    return story
+
+
+def render_reportlab(data, template='modern'):
+    """Render the resume to PDF bytes in memory."""
+    if template not in STYLES:
+        template = 'modern'
+    buf = BytesIO()
+    doc = SimpleDocTemplate(
+        buf,
+        pagesize=letter,
+        leftMargin=0.6*inch,
+        rightMargin=0.6*inch,
+        topMargin=0.5*inch,
+        bottomMargin=0.5*inch
+    )
+    doc.build(build_story(data, template))
+    return buf.getvalue()
@@ -0,0 +1,114 @@
+# resume_schema.py
+# Validation for complete resume documents submitted through /api/resume.
+#
+# The schema mirrors session['data'] as built by the /chat flow, so a valid
+# document goes through exactly the same render pipeline as a chat session.
+# It is hand-written (no jsonschema dependency) and returns every problem at
+# once with a dotted path, e.g. "education[1].year: is required".
+
+from rendering import TEMPLATES, BACKENDS
+
+MAX_TEXT = 2000        # longest accepted string value
+MAX_ITEMS = 50         # longest accepted list (education entries, skills, ...)
+
+# field -> (required, kind); kind is "text", "list" (of strings) or a nested schema
+EDUCATION = {"course": (True, "text"), "college": (True, "text"), "year": (True, "text")}
+SKILL = {"mainskill": (True, "text"), "subskills": (False, "list")}
+CERTIFICATION = {"name": (True, "text"), "id": (False, "text"), "source": (False, "text")}
+PROJECT = {"name": (True, "text"), "description": (False, "text"),
+           "technologies": (False, "list"), "repository": (False, "text")}
+
+RESUME = {
+    "name": (True, "text"),
+    "email": (True, "text"),
+    "phone": (False, "text"),
+    "location": (False, "text"),
+    "linkedin": (False, "text"),
+    "github": (False, "text"),
+    "professional_summary": (False, "text"),
+    "education": (False, [EDUCATION]),
+    "skills": (False, [SKILL]),
+    "certifications": (False, [CERTIFICATION]),
+    "projects": (False, [PROJECT]),
+}
+
+
+def _text(value, path, errors):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)   # e.g. "year": 2024
+    if not isinstance(value, str):
+        errors.append(f"{path}: must be a string")
+        return None
+    value = value.strip()
+    if len(value) > MAX_TEXT:
+        errors.append(f"{path}: longer than {MAX_TEXT} characters")
+        return None
+    return value
+
+
+def _string_list(value, path, errors):
+    if isinstance(value, str):
+        value = value.split(",")   # same comma-separated form the chat accepts
+    if not isinstance(value, list):
+        errors.append(f"{path}: must be a list of strings or a comma-separated string")
+        return None
+    if len(value) > MAX_ITEMS:
+        errors.append(f"{path}: more than {MAX_ITEMS} items")
+        return None
+    items = [_text(item, f"{path}[{i}]", errors) for i, item in enumerate(value)]
+    return [item for item in items if item]
+
+
+def _object(value, schema, path, errors):
+    if not isinstance(value, dict):
+        errors.append(f"{path or 'resume'}: must be an object")
+        return None
+    prefix = f"{path}." if path else ""
+    out = {}
+    for key, (required, kind) in schema.items():
+        field = prefix + key
+        if value.get(key) in (None, ""):
+            if required:
+                errors.append(f"{field}: is required")
+            elif isinstance(kind, list):
+                out[key] = []
+            continue
+        if kind == "text":
+            out[key] = _text(value[key], field, errors)
+        elif kind == "list":
+            out[key] = _string_list(value[key], field, errors)
+        else:
+            items = value[key]
+            if not isinstance(items, list):
+                errors.append(f"{field}: must be a list")
+            elif len(items) > MAX_ITEMS:
+                errors.append(f"{field}: more than {MAX_ITEMS} items")
+            else:
+                out[key] = [_object(item, kind[0], f"{field}[{i}]", errors) for i, item in enumerate(items)]
+    for key in value:
+        if key not in schema:
+            errors.append(f"{prefix}{key}: unknown field")
+    return out
+
+
+def validate_resume(doc):
+    """Check a submitted resume document.
+
+    Returns (data, errors): data has the shape of session['data'] (strings
+    trimmed, missing lists filled in) and is only usable when errors is empty.
+    "template" and "backend" are optional render options and are validated
+    but not copied into data.
+    """
+    errors = []
+    if isinstance(doc, dict):
+        options = {k: doc[k] for k in ("template", "backend", "async") if k in doc}
+        doc = {k: v for k, v in doc.items() if k not in options}
+        if options.get("template") not in (None, "") and str(options["template"]).lower() not in TEMPLATES:
+            errors.append(f"template: must be one of {', '.join(TEMPLATES)}")
+        if options.get("backend") not in (None, "") and str(options["backend"]).lower() not in BACKENDS:
+            errors.append(f"backend: must be one of {', '.join(BACKENDS)}")
+    data = _object(doc, RESUME, "", errors)
+    email = (data or {}).get("email")
+    if email and ("@" not in email or " " in email):
+        errors.append("email: is not a valid email address")
+    return data, errors
@@ -0,0 +1,189 @@
+# server_session.py
+# Server-side Flask sessions: the cookie only carries an opaque session id and
+# the resume dict lives in a backend (in-memory or SQLite).
+#
+# Enable in app.py with SESSION_BACKEND=memory or SESSION_BACKEND=sqlite.
+# The memory backend is per-process; use sqlite when running several workers.
+
+import json
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+# payloads above this size are zlib-compressed before storing
+COMPRESS_MIN_BYTES = 512
+
+
+def dumps(data):
+    """Compact serialization: minified JSON, zlib-compressed when large."""
+    raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        return b"z" + zlib.compress(raw)
+    return b"j" + raw
+
+
+def loads(blob):
+    blob = bytes(blob)
+    if blob[:1] == b"z":
+        return json.loads(zlib.decompress(blob[1:]))
+    return json.loads(blob[1:])
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.rotate = False
+
+    def clear(self):
+        """Empty the session; it is saved under a fresh id (the old one is dropped)."""
+        super().clear()
+        self.rotate = True
+
+
+class MemorySessionBackend:
+    """Process-local session store with idle eviction."""
+
+    def __init__(self, idle_timeout=2 * 3600):
+        self.idle_timeout = idle_timeout
+        self._store = {}   # sid -> (last_seen, blob)
+        self._lock = threading.Lock()
+        self._next_evict = 0
+
+    def _evict(self, now):
+        if now < self._next_evict:
+            return
+        self._next_evict = now + 60
+        idle = [sid for sid, (seen, _) in self._store.items() if now - seen > self.idle_timeout]
+        for sid in idle:
+            del self._store[sid]
+
+    def get(self, sid):
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            entry = self._store.get(sid)
+            if entry is None or now - entry[0] > self.idle_timeout:
+                return None
+            self._store[sid] = (now, entry[1])
+            return entry[1]
+
+    def set(self, sid, blob):
+        with self._lock:
+            self._store[sid] = (time.time(), blob)
+
+    def delete(self, sid):
+        with self._lock:
+            self._store.pop(sid, None)
+
+
+class SqliteSessionBackend:
+    """Session store in a SQLite table; idle rows are purged periodically."""
+
+    def __init__(self, db_path, idle_timeout=2 * 3600):
+        self.idle_timeout = idle_timeout
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " sid TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " last_seen REAL NOT NULL)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._next_evict = 0
+
+    def _evict(self, now):
+        if now < self._next_evict:
+            return
+        self._next_evict = now + 60
+        self._db.execute("DELETE FROM sessions WHERE last_seen < ?", (now - self.idle_timeout,))
+        self._db.commit()
+
+    def get(self, sid):
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            row = self._db.execute(
+                "SELECT payload, last_seen FROM sessions WHERE sid = ?", (sid,)
+            ).fetchone()
+            if row is None or now - row[1] > self.idle_timeout:
+                return None
+            self._db.execute("UPDATE sessions SET last_seen = ? WHERE sid = ?", (now, sid))
+            self._db.commit()
+            return row[0]
+
+    def set(self, sid, blob):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (sid, payload, last_seen) VALUES (?, ?, ?)",
+                (sid, sqlite3.Binary(blob), time.time()),
+            )
+            self._db.commit()
+
+    def delete(self, sid):
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+            self._db.commit()
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Flask session interface storing session data in `backend`."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            blob = self.backend.get(sid)
+            if blob is not None:
+                try:
+                    return ServerSession(loads(blob), sid=sid)
+                except (ValueError, zlib.error):
+                    pass   # corrupt or truncated row: start a fresh session
+        return ServerSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.rotate and not session.new:
+            # index() clears the session to start a new resume: never carry
+            # the old id over to it
+            self.backend.delete(session.sid)
+            session.sid = secrets.token_urlsafe(32)
+            session.new = True
+
+        if not session:
+            if session.modified and not session.new:
+                self.backend.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            elif session.rotate:
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified:
+            self.backend.set(session.sid, dumps(dict(session)))
+        if session.new or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
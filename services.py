@@ -0,0 +1,180 @@
+# services.py
+# Shared clients, caches and worker pools for the Flask app.
+#
+# Nothing here is imported or constructed until a request first needs it: a
+# worker that only serves / and /chat never loads the Groq SDK or starts the
+# wkhtmltopdf and render-job pools. create_app() keeps one Services instance
+# in app.extensions["resumebot"]; views reach it through services().
+# Configuration comes from the same environment variables as before.
+
+import os
+import threading
+
+from flask import current_app
+
+
+def _lazy(build):
+    """Like functools.cached_property, but builds at most once across threads."""
+    name = build.__name__
+
+    def get(self):
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = build(self)
+            return self.__dict__[name]
+
+    get.__doc__ = build.__doc__
+    return property(get)
+
+
+class Services:
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self._lock = threading.RLock()
+
+    @_lazy
+    def llm_breaker(self):
+        """Circuit breaker shared by the sync and async LLM clients."""
+        from llm_client import CircuitBreaker
+        return CircuitBreaker(
+            failure_threshold=int(os.getenv("LLM_BREAKER_THRESHOLD", 5)),
+            reset_timeout=float(os.getenv("LLM_BREAKER_RESET", 30)),
+        )
+
+    def _llm_options(self):
+        return dict(
+            api_key=os.getenv("GROQ_API_KEY"),
+            base_url=os.getenv("GROQ_BASE_URL") or None,
+            connect_timeout=float(os.getenv("LLM_CONNECT_TIMEOUT", 3)),
+            read_timeout=float(os.getenv("LLM_READ_TIMEOUT", 15)),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", 2)),
+            breaker=self.llm_breaker,
+        )
+
+    @_lazy
+    def llm(self):
+        """Groq client with timeouts, retries and a circuit breaker."""
+        from llm_client import LLMClient
+        return LLMClient(**self._llm_options())
+
+    @_lazy
+    def async_llm(self):
+        """AsyncGroq counterpart of llm over one pooled connection (ASGI mode)."""
+        from llm_client import AsyncLLMClient
+        return AsyncLLMClient(
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", 100)),
+            max_keepalive=int(os.getenv("LLM_MAX_KEEPALIVE", 20)),
+            **self._llm_options(),
+        )
+
+    def _subskill_db(self):
+        return os.getenv("SUBSKILL_CACHE_DB", os.path.join(self.root_path, "subskill_cache.db"))
+
+    @_lazy
+    def subskill_cache(self):
+        """Sub-skill suggestions per normalized main skill (memory LRU + SQLite)."""
+        from skill_cache import SubskillCache
+        return SubskillCache(
+            db_path=self._subskill_db(),
+            max_entries=int(os.getenv("SUBSKILL_CACHE_SIZE", 1024)),
+            memory_ttl=int(os.getenv("SUBSKILL_CACHE_TTL", 3600)),
+        )
+
+    @_lazy
+    def skill_taxonomy(self):
+        """Bundled main skill -> sub-skills index, consulted before the cache and the LLM."""
+        from skill_taxonomy import SkillTaxonomy, DEFAULT_PATH, DEFAULT_PENDING
+        path = os.getenv("SKILL_TAXONOMY_PATH", DEFAULT_PATH)
+        try:
+            return SkillTaxonomy(path, pending_path=os.getenv("SKILL_TAXONOMY_PENDING", DEFAULT_PENDING))
+        except (OSError, ValueError) as e:
+            print("Skill taxonomy unavailable:", e)
+            return None
+
+    @_lazy
+    def skill_normalizer(self):
+        """Resolves typed main skills ("Pyhton", "ML") to taxonomy skills and popular ones."""
+        from skill_normalizer import SkillNormalizer
+        taxonomy = self.skill_taxonomy
+        normalizer = SkillNormalizer(taxonomy.skills() if taxonomy else (),
+                                     aliases=taxonomy.aliases if taxonomy else None)
+        for skill in self.skill_autocomplete.skills():
+            normalizer.add(skill)
+        # skills the LLM has answered are known too: typing one again is not a typo
+        for skill in self.subskill_cache.skills():
+            normalizer.add(skill)
+        return normalizer
+
+    @_lazy
+    def skill_autocomplete(self):
+        """Prefix completions over taxonomy skills and ones SKILL_PROMOTE_MIN /chat answers picked."""
+        from skill_autocomplete import SkillAutocomplete
+        taxonomy = self.skill_taxonomy
+        return SkillAutocomplete(taxonomy.skills() if taxonomy else (),
+                                 db_path=os.getenv("SKILL_POPULARITY_DB", self._subskill_db()),
+                                 min_weight=int(os.getenv("SKILL_PROMOTE_MIN", 5)))
+
+    @_lazy
+    def subskill_flight(self):
+        """Concurrent step-6 requests for the same skill share one upstream LLM call."""
+        from singleflight import SingleFlight
+        return SingleFlight()
+
+    @_lazy
+    def render_cache(self):
+        """Rendered resumes keyed by content hash, so repeat downloads skip rendering."""
+        from render_cache import RenderCache
+        return RenderCache(
+            max_bytes=int(os.getenv("RENDER_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+            max_age=int(os.getenv("RENDER_CACHE_MAX_AGE", 600)),
+        )
+
+    @_lazy
+    def pdf_pool(self):
+        """Long-lived PDF renderer processes, so a burst of downloads queues instead of forking freely."""
+        from pdf_pool import PdfWorkerPool
+        return PdfWorkerPool(
+            workers=int(os.getenv("PDF_WORKERS", 2)),
+            max_queue=int(os.getenv("PDF_MAX_QUEUE", 16)),
+            job_timeout=int(os.getenv("PDF_JOB_TIMEOUT", 30)),
+            recycle_after=int(os.getenv("PDF_RECYCLE_AFTER", 200)),
+        )
+
+    @_lazy
+    def render_jobs(self):
+        """Background render jobs for the polling API (/jobs); in memory when ARTIFACT_MODE=memory."""
+        from jobs import JobQueue
+        if os.getenv("ARTIFACT_MODE", "disk").lower() == "memory":
+            default_db = ":memory:"
+        else:
+            default_db = os.path.join(self.root_path, "render_jobs.db")
+        return JobQueue(
+            workers=int(os.getenv("RENDER_JOB_WORKERS", 2)),
+            max_jobs=int(os.getenv("RENDER_JOB_MAX", 256)),
+            ttl=int(os.getenv("RENDER_JOB_TTL", 900)),
+            db_path=os.getenv("RENDER_JOB_DB", default_db),
+        )
+
+    @_lazy
+    def artifact_store(self):
+        """Bounded copies of generated files in static/; None when ARTIFACT_MODE=memory."""
+        if os.getenv("ARTIFACT_MODE", "disk").lower() == "memory":
+            return None
+        from artifacts import ArtifactStore
+        store = ArtifactStore(
+            os.path.join(self.root_path, 'static'),
+            max_bytes=int(os.getenv("ARTIFACT_MAX_BYTES", 256 * 1024 * 1024)),
+            ttl=int(os.getenv("ARTIFACT_TTL", 24 * 3600)),
+            sweep_interval=int(os.getenv("ARTIFACT_SWEEP_INTERVAL", 300)),
+        )
+        store.start_sweeper()
+        return store
+
+
+def services():
+    """Services of the current app."""
+    return current_app.extensions["resumebot"]
@@ -0,0 +1,100 @@
+# singleflight.py
+# Request coalescing: concurrent callers asking for the same key share one
+# in-flight upstream call instead of each starting their own.
+
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def _set(self, result, error):
+        self.result = result
+        self.error = error
+        with self._lock:
+            self.done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def _outcome(self):
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def wait(self, timeout=None):
+        """Block until the leader finishes; return its result or raise its error."""
+        if not self.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for in-flight call")
+        return self._outcome()
+
+    async def wait_async(self):
+        """Like wait(), but suspends the coroutine instead of blocking the thread."""
+        loop = asyncio.get_running_loop()
+        woken = loop.create_future()
+
+        def wake():
+            # the leader may finish on another thread
+            loop.call_soon_threadsafe(lambda: woken.done() or woken.set_result(None))
+
+        with self._lock:
+            pending = not self.done.is_set()
+            if pending:
+                self._callbacks.append(wake)
+        if pending:
+            await woken
+        return self._outcome()
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key.
+
+    do(key, fn) runs fn() once per key at a time; callers arriving while it
+    runs wait and receive the same result (or exception). For code that cannot
+    be wrapped in a single function (e.g. a streaming generator), use
+    begin()/finish() directly. Followers on an event loop use call.wait_async().
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.deduplicated = 0
+
+    def begin(self, key):
+        """Return (call, is_leader). The leader must call finish() exactly once."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.deduplicated += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            self.leaders += 1
+            return call, True
+
+    def finish(self, key, call, result=None, error=None):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call._set(result, error)
+
+    def do(self, key, fn):
+        call, leader = self.begin(key)
+        if not leader:
+            return call.wait()
+        result = error = None
+        try:
+            result = fn()
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            # always release the waiters, even if the leader is interrupted
+            self.finish(key, call, result=result, error=error)
+        return result
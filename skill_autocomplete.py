@@ -0,0 +1,130 @@
+# skill_autocomplete.py
+# Prefix completions for the main-skill prompt (chat step 6).
+#
+# Known skills live in a character trie. Every node keeps its own top-k
+# (weight, skill) list, so a completion is one walk down the prefix plus a
+# slice: the cost depends on the prefix length, never on how many skills
+# share the prefix. That keeps it well under a millisecond per keystroke.
+#
+# Weights are how often a skill was given as a main skill in /chat. They only
+# grow, so a node's top-k stays exact when weights are bumped along the
+# skill's path. Counts are kept per skill (also for skills not in the trie
+# yet) and optionally persisted in SQLite, so popularity survives restarts.
+#
+# Completions are shown to every user, so the trie is seeded with reviewed
+# skills only (the taxonomy). Anything else one user typed becomes completable
+# once it has been picked `min_weight` times (SKILL_PROMOTE_MIN); until then it
+# is only counted.
+
+import sqlite3
+import threading
+
+from skill_cache import normalize_skill
+
+TOP_K = 10   # completions kept per trie node (the most a request can ask for)
+
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.top = []   # [(-weight, skill)], sorted, at most TOP_K
+
+
+class SkillAutocomplete:
+    """Trie of known main skills ranked by popularity.
+
+    complete() takes no lock; add() and record() are serialized.
+    """
+
+    def __init__(self, skills=(), db_path=None, min_weight=None):
+        self.min_weight = min_weight   # None: only add()ed skills are ever completed
+        self._root = _Node()
+        self._lock = threading.Lock()
+        self._known = set()
+        self._weights = {}   # skill -> times chosen, including unknown skills
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS skill_popularity ("
+                " skill TEXT PRIMARY KEY,"
+                " count INTEGER NOT NULL)"
+            )
+            self._db.commit()
+            self._weights.update(self._db.execute("SELECT skill, count FROM skill_popularity"))
+        for skill in skills:
+            self.add(skill)
+        if min_weight:
+            for skill, weight in list(self._weights.items()):
+                if weight >= min_weight:
+                    self.add(skill)
+
+    def __len__(self):
+        return len(self._known)
+
+    def skills(self):
+        return list(self._known)
+
+    def _bump(self, node, skill, weight):
+        entries = [e for e in node.top if e[1] != skill]
+        entries.append((-weight, skill))
+        entries.sort()
+        node.top = entries[:TOP_K]   # swapped in whole: readers never see a partial list
+
+    def _insert(self, skill, weight):
+        node = self._root
+        self._bump(node, skill, weight)
+        for ch in skill:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = _Node()
+            node = child
+            self._bump(node, skill, weight)
+
+    def add(self, skill):
+        """Make `skill` completable (with whatever popularity it already has)."""
+        key = normalize_skill(skill)
+        if not key:
+            return
+        with self._lock:
+            if key not in self._known:
+                self._known.add(key)
+                self._insert(key, self._weights.get(key, 0))
+
+    def record(self, skill):
+        """Count one /chat answer of `skill` as a main skill.
+
+        Returns True when this made an unreviewed skill popular enough to be completed.
+        """
+        key = normalize_skill(skill)
+        if not key:
+            return False
+        with self._lock:
+            weight = self._weights[key] = self._weights.get(key, 0) + 1
+            promoted = key not in self._known and bool(self.min_weight) and weight >= self.min_weight
+            if promoted:
+                self._known.add(key)
+            if key in self._known:
+                self._insert(key, weight)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT INTO skill_popularity (skill, count) VALUES (?, 1)"
+                    " ON CONFLICT(skill) DO UPDATE SET count = count + 1",
+                    (key,),
+                )
+                self._db.commit()
+        return promoted
+
+    def complete(self, prefix, k=TOP_K):
+        """Up to k known skills starting with `prefix`, most popular first."""
+        node = self._root
+        for ch in normalize_skill(prefix):
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return [skill for _, skill in node.top[:max(0, min(k, TOP_K))]]
+
+    def weight(self, skill):
+        return self._weights.get(normalize_skill(skill), 0)
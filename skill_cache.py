@@ -0,0 +1,160 @@
+# skill_cache.py
+# Two-tier cache for step-6 sub-skill suggestions.
+# Tier 1 is an in-process LRU with a short TTL, tier 2 is a SQLite table that
+# survives restarts. Keys are normalized main skills (see normalize_skill).
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_skill(skill):
+    """Canonical cache key for a main skill: trimmed, lowercased, single-spaced."""
+    if skill is None:
+        return ""
+    return re.sub(r"\s+", " ", str(skill)).strip().lower()
+
+
+class SubskillCache:
+    """LRU + TTL memory cache in front of a persistent SQLite store.
+
+    get() returns the cached list or None; set() writes both tiers.
+    Use invalidate() to drop an entry and refresh() to reload it from a loader.
+    """
+
+    def __init__(self, db_path=None, max_entries=1024, memory_ttl=3600, disk_ttl=30 * 24 * 3600):
+        self.max_entries = max_entries
+        self.memory_ttl = memory_ttl
+        self.disk_ttl = disk_ttl
+        self._memory = OrderedDict()   # key -> (expires_at, subskills)
+        self._lock = threading.Lock()
+        self.hits = 0          # answered from memory
+        self.disk_hits = 0     # answered from SQLite (and promoted to memory)
+        self.misses = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS subskills ("
+                " skill TEXT PRIMARY KEY,"
+                " subskills TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    # ---- memory tier ----
+    def _memory_get(self, key, now):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, subskills = entry
+        if expires_at < now:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return subskills
+
+    def _memory_put(self, key, subskills, now):
+        self._memory[key] = (now + self.memory_ttl, subskills)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # ---- disk tier ----
+    def _disk_get(self, key, now):
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT subskills, updated_at FROM subskills WHERE skill = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if self.disk_ttl and row[1] + self.disk_ttl < now:
+            return None
+        return json.loads(row[0])
+
+    def _disk_put(self, key, subskills, now):
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO subskills (skill, subskills, updated_at) VALUES (?, ?, ?)",
+            (key, json.dumps(subskills), now),
+        )
+        self._db.commit()
+
+    # ---- public API ----
+    def get(self, skill):
+        key = normalize_skill(skill)
+        now = time.time()
+        with self._lock:
+            subskills = self._memory_get(key, now)
+            if subskills is not None:
+                self.hits += 1
+                return list(subskills)
+            subskills = self._disk_get(key, now)
+            if subskills is not None:
+                self.disk_hits += 1
+                self._memory_put(key, tuple(subskills), now)
+                return list(subskills)
+            self.misses += 1
+            return None
+
+    def get_stale(self, skill):
+        """Stored entry regardless of TTL (for degraded mode); None if never stored."""
+        key = normalize_skill(skill)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                return list(entry[1])
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT subskills FROM subskills WHERE skill = ?", (key,)).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def set(self, skill, subskills):
+        key = normalize_skill(skill)
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, tuple(subskills), now)
+            self._disk_put(key, list(subskills), now)
+
+    def contains(self, skill):
+        """True if the skill is stored in either tier (does not touch counters)."""
+        key = normalize_skill(skill)
+        now = time.time()
+        with self._lock:
+            return self._memory_get(key, now) is not None or self._disk_get(key, now) is not None
+
+    def skills(self):
+        """Every main skill in the persistent tier (memory-only entries are also in it)."""
+        with self._lock:
+            if self._db is None:
+                return list(self._memory)
+            return [row[0] for row in self._db.execute("SELECT skill FROM subskills")]
+
+    def invalidate(self, skill):
+        key = normalize_skill(skill)
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM subskills WHERE skill = ?", (key,))
+                self._db.commit()
+
+    def refresh(self, skill, loader):
+        """Reload an entry with loader(skill) and store the fresh result."""
+        subskills = loader(skill)
+        self.set(skill, subskills)
+        return subskills
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+            }
@@ -0,0 +1,212 @@
+# skill_normalizer.py
+# Maps what users type as a main skill onto a skill we already know, so
+# "Python3", "py", "Pyhton" and "PYTHON!" all hit the same taxonomy and cache
+# entry as "python".
+#
+# resolve() tries, in order:
+#   exact   the input as typed (after normalize_skill)
+#   folded  the folded text (case folded, punctuation stripped, - and _ as spaces)
+#   alias   the alias table (taxonomy "aliases"), also with a trailing version
+#           number dropped ("python 3.11", "html5")
+#   fuzzy   typo tolerance for inputs of MIN_FUZZY_LENGTH+ characters:
+#           candidates sharing enough character trigrams with the input,
+#           confirmed by a bounded edit distance (adjacent swaps count as one
+#           edit). Ties are not redirected, and neither is a single vowel or
+#           digit substitution: "rest" and "rust", "mssql" and "mysql",
+#           "c++11" and "c++17" are different skills, not typos.
+#
+# The trigram index keeps fuzzy lookups under a millisecond with tens of
+# thousands of known skills. Postings are split by skill length and read
+# rarest trigram first, up to MAX_POSTINGS entries; the MAX_SCORED skills
+# seen most often are scored exactly, and only the best few are checked with
+# the edit distance.
+
+import re
+import threading
+from collections import Counter
+
+from skill_cache import normalize_skill
+
+_PUNCT = re.compile(r"[^\w\s+#./&]")
+_SEPARATORS = re.compile(r"[-_\s]+")
+_VERSION = re.compile(r"\s*v?\d+(\.\d+)*$")
+
+MIN_FUZZY_LENGTH = 6   # shorter inputs ("js", "rest", "mssql") only match exactly or by alias
+MAX_POSTINGS = 2048    # trigram postings read per fuzzy lookup
+MAX_SCORED = 32        # candidates whose shared trigrams are counted exactly
+MAX_CANDIDATES = 8     # best-scored candidates verified with the edit distance
+_SOFT = set("aeiouy0123456789")
+
+
+def fold(text):
+    """Comparison form of a skill: "  Machine-Learning! " -> "machine learning"."""
+    text = _PUNCT.sub(" ", str(text or "").casefold())
+    return _SEPARATORS.sub(" ", text).strip(" ./&")
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it must exceed `limit`.
+
+    Only the diagonal band |i - j| <= limit is computed; cells outside it
+    cannot lead to a distance within the limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous2 = None
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        row_min = current[0]
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return over
+        previous2, previous = previous, current
+    return min(previous[-1], over)
+
+
+def max_edits(text):
+    return 1 if len(text) < 8 else 2
+
+
+def soft_substitution(a, b):
+    """True if a and b differ in exactly one position, by a vowel or digit on both sides."""
+    if len(a) != len(b):
+        return False
+    diff = [(x, y) for x, y in zip(a, b) if x != y]
+    return len(diff) == 1 and diff[0][0] in _SOFT and diff[0][1] in _SOFT
+
+
+class SkillNormalizer:
+    """Resolves free-text main skills to known skill keys.
+
+    Known skills are the taxonomy keys plus anything add()ed later (skills the
+    LLM has answered). Lookups take no lock; add() is serialized.
+    """
+
+    def __init__(self, skills=(), aliases=None):
+        self._lock = threading.Lock()
+        self._exact = {}      # folded text -> skill key
+        self._aliases = {}    # folded alias -> skill key
+        self._keys = []       # position -> folded text, for the trigram postings
+        self._postings = {}   # (trigram, length) -> positions in _keys
+        self.counts = Counter()   # exact / folded / alias / fuzzy / none
+        for skill in skills:
+            self.add(skill)
+        for alias, skill in (aliases or {}).items():
+            self._aliases[fold(alias)] = normalize_skill(skill)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, skill):
+        """Make `skill` a known target for exact and fuzzy matches."""
+        key = normalize_skill(skill)
+        folded = fold(key)
+        if not folded:
+            return
+        with self._lock:
+            if folded in self._exact:
+                return
+            self._exact[folded] = key
+            position = len(self._keys)
+            self._keys.append(folded)
+            for gram in trigrams(folded):
+                self._postings.setdefault((gram, len(folded)), []).append(position)
+
+    def _fuzzy(self, folded):
+        if len(folded) < MIN_FUZZY_LENGTH:
+            return None
+        limit = max_edits(folded)
+        grams = trigrams(folded)
+        lengths = range(len(folded) - limit, len(folded) + limit + 1)
+        # one edit changes at most 3 trigrams (4 for a swap); weaker candidates cannot pass
+        needed = max(1, len(grams) - 4 * limit)
+        lists = sorted(([self._postings.get((gram, n), ()) for n in lengths] for gram in grams),
+                       key=lambda postings: sum(map(len, postings)))
+        # count shared trigrams from the rarest postings up, within a fixed budget:
+        # common trigrams ("ing", "pyt" among thousands of python-* skills) say
+        # little and would dominate the cost
+        counts = Counter()
+        read = 0
+        for postings in lists:
+            size = sum(map(len, postings))
+            if read + size > MAX_POSTINGS:
+                if not read:
+                    return None   # even the rarest trigram is everywhere: too generic to guess
+                break
+            for positions in postings:
+                counts.update(positions)
+            read += size
+        scored = []
+        for position, _ in counts.most_common(MAX_SCORED):
+            shared = len(grams & trigrams(self._keys[position]))
+            if shared >= needed:
+                scored.append((shared, position))
+        scored.sort(reverse=True)
+        best, best_distance, tied = None, limit + 1, False
+        for _, position in scored[:MAX_CANDIDATES]:
+            candidate = self._keys[position]
+            # after a match, only an equal or closer candidate matters: narrow the band
+            distance = edit_distance(folded, candidate, min(limit, best_distance))
+            if distance < best_distance:
+                best, best_distance, tied = candidate, distance, False
+            elif distance == best_distance and distance <= limit:
+                if distance == 1:
+                    return None   # exact matches never get here, so nothing can beat the tie
+                tied = True
+        if best is None or tied:
+            return None
+        if best_distance == 1 and soft_substitution(folded, best):
+            return None
+        return self._exact[best]
+
+    def _match(self, skill):
+        folded = fold(skill)
+        key = self._exact.get(folded)
+        if key is not None:
+            return key, "exact" if key == normalize_skill(skill) else "folded"
+        key = self._aliases.get(folded)
+        if key is None:
+            unversioned = _VERSION.sub("", folded)
+            if unversioned and unversioned != folded:
+                key = self._exact.get(unversioned) or self._aliases.get(unversioned)
+        if key is not None:
+            return key, "alias"
+        key = self._fuzzy(folded)
+        if key is not None:
+            return key, "fuzzy"
+        return normalize_skill(skill), None
+
+    def resolve(self, skill):
+        """(key, match): the known skill `skill` refers to and how it was matched.
+
+        match is "exact", "folded", "alias", "fuzzy", or None when nothing matched, in
+        which case key is just normalize_skill(skill).
+        """
+        key, match = self._match(skill)
+        self.counts[match or "none"] += 1
+        return key, match
+
+    def canonical(self, skill):
+        """resolve()'s key, without counting the lookup."""
+        return self._match(skill)[0]
+
+    def stats(self):
+        counts = dict(self.counts)
+        redirected = sum(counts.get(match, 0) for match in ("folded", "alias", "fuzzy"))
+        return {"known": len(self._keys), "aliases": len(self._aliases), "redirected": redirected, **counts}
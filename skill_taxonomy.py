@@ -0,0 +1,161 @@
+# skill_taxonomy.py
+# Bundled main skill -> ranked sub-skills taxonomy for chat step 6.
+#
+# data/skill_taxonomy.json is versioned with the code and covers the common
+# technology families ("html", "sql", "python", ...), so those never cost an
+# LLM call. It is loaded once into a read-only dict keyed by normalize_skill()
+# with interned, tuple-valued sub-skills (families share many of them). Its
+# "aliases" table ("py" -> "python") feeds skill_normalizer.SkillNormalizer.
+#
+# Answers the LLM gives for skills outside the taxonomy are appended to a
+# JSON-lines review file next to it. Review and fold them in with:
+#   python skill_taxonomy.py            # list pending suggestions
+#   python skill_taxonomy.py --merge    # add them to the taxonomy, bump version
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from skill_cache import normalize_skill
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_PATH = os.path.join(DATA_DIR, "skill_taxonomy.json")
+DEFAULT_PENDING = os.path.join(DATA_DIR, "skill_taxonomy.pending.jsonl")
+
+
+def read_pending(path):
+    """Pending suggestions in file order, as (skill, subskills); later lines win."""
+    entries = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    entries[normalize_skill(record["skill"])] = list(record["subskills"])
+                except (ValueError, KeyError, TypeError):
+                    continue   # a torn or hand-edited line; skip it
+    except FileNotFoundError:
+        pass
+    return list(entries.items())
+
+
+class SkillTaxonomy:
+    """Read-only skill index plus an append-only file of LLM answers to review."""
+
+    def __init__(self, path=DEFAULT_PATH, pending_path=DEFAULT_PENDING):
+        self.path = path
+        self.pending_path = pending_path
+        with open(path, encoding="utf-8") as f:
+            doc = json.load(f)
+        self.version = doc.get("version", 0)
+        self.aliases = {normalize_skill(a): normalize_skill(s) for a, s in doc.get("aliases", {}).items()}
+        self._index = {
+            normalize_skill(skill): tuple(sys.intern(s) for s in subskills)
+            for skill, subskills in doc.get("skills", {}).items()
+        }
+        self._lock = threading.Lock()
+        self._proposed = {skill for skill, _ in read_pending(pending_path)} if pending_path else set()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, skill):
+        return normalize_skill(skill) in self._index
+
+    def skills(self):
+        return list(self._index)
+
+    def get(self, skill):
+        """Ranked sub-skills for a known main skill, or None."""
+        subskills = self._index.get(normalize_skill(skill))
+        if subskills is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(subskills)
+
+    def propose(self, skill, subskills):
+        """Queue an LLM answer for an unknown skill for review (once per skill)."""
+        key = normalize_skill(skill)
+        if not self.pending_path or not key or not subskills or key in self._index:
+            return False
+        with self._lock:
+            if key in self._proposed:
+                return False
+            self._proposed.add(key)
+            record = {"skill": key, "subskills": list(subskills), "seen_at": time.strftime("%Y-%m-%d")}
+            try:
+                with open(self.pending_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                print("Could not record sub-skills for review:", e)
+                return False
+        return True
+
+    def stats(self):
+        return {"version": self.version, "skills": len(self._index),
+                "hits": self.hits, "misses": self.misses, "proposed": len(self._proposed)}
+
+
+def dump_taxonomy(doc):
+    """JSON text with one skill or alias per line, so merges diff cleanly."""
+    lines = []
+    for name, value in doc.items():
+        if isinstance(value, dict):
+            items = [f"    {json.dumps(k, ensure_ascii=False)}: {json.dumps(v, ensure_ascii=False)}"
+                     for k, v in value.items()]
+            lines.append(f'  "{name}": {{\n' + ",\n".join(items) + "\n  }")
+        else:
+            lines.append(f"  {json.dumps(name)}: {json.dumps(value, ensure_ascii=False)}")
+    return "{\n" + ",\n".join(lines) + "\n}\n"
+
+
+def merge_pending(path=DEFAULT_PATH, pending_path=DEFAULT_PENDING):
+    """Add pending suggestions to the taxonomy file and clear them. Returns the count added."""
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    skills = doc.setdefault("skills", {})
+    known = {normalize_skill(s) for s in skills}
+    added = 0
+    for skill, subskills in read_pending(pending_path):
+        if skill not in known:
+            skills[skill] = subskills
+            known.add(skill)
+            added += 1
+    if added:
+        doc["version"] = doc.get("version", 0) + 1
+        doc["updated"] = time.strftime("%Y-%m-%d")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(dump_taxonomy(doc))
+        os.replace(tmp, path)
+    if os.path.exists(pending_path):
+        os.remove(pending_path)
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Review LLM sub-skills queued for the skill taxonomy.")
+    parser.add_argument("--taxonomy", default=DEFAULT_PATH, help="taxonomy JSON file")
+    parser.add_argument("--pending", default=DEFAULT_PENDING, help="pending suggestions (JSON lines)")
+    parser.add_argument("--merge", action="store_true", help="add all pending suggestions to the taxonomy")
+    args = parser.parse_args(argv)
+
+    if args.merge:
+        added = merge_pending(args.taxonomy, args.pending)
+        print(f"Added {added} skill(s) to {args.taxonomy}.")
+        return 0
+    pending = read_pending(args.pending)
+    for skill, subskills in pending:
+        print(f"{skill}: {', '.join(subskills)}")
+    print(f"{len(pending)} pending skill(s). Edit {args.pending} as needed, then rerun with --merge.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
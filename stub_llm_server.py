@@ -0,0 +1,88 @@
+# stub_llm_server.py
+# Local stand-in for the Groq chat completions API, for testing timeouts,
+# retries and the circuit breaker without network access.
+#
+# Usage:
+#   python stub_llm_server.py --port 8099 --latency 2.0 --fail-rate 0.3
+#   GROQ_BASE_URL=http://127.0.0.1:8099 GROQ_API_KEY=stub python app.py
+#
+# --latency delays every response, --fail-rate answers that share of requests
+# with HTTP 503. Streaming requests get the answer as SSE chunks, and
+# response_format={"type": "json_object"} requests a JSON object per skill.
+
+import argparse
+import json
+import random
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+
+def _answer(messages, json_mode=False):
+    skill = messages[-1]["content"] if messages else "skill"
+    if json_mode:
+        # batched lookup: the user message is a JSON list of skills
+        return json.dumps({s: [f"{s} topic {i}" for i in range(1, 11)] for s in json.loads(skill)})
+    return ", ".join(f"{skill} topic {i}" for i in range(1, 11))
+
+
+def make_handler(latency=0.0, fail_rate=0.0):
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if self.path != COMPLETIONS_PATH:
+                return self._send_json(404, {"error": {"message": "not found"}})
+            if latency:
+                time.sleep(latency)
+            if fail_rate and random.random() < fail_rate:
+                return self._send_json(503, {"error": {"message": "injected failure"}})
+
+            json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+            content = _answer(request.get("messages", []), json_mode)
+            base = {"id": "stub", "created": int(time.time()), "model": request.get("model", "stub")}
+            if not request.get("stream"):
+                return self._send_json(200, dict(base, object="chat.completion", choices=[
+                    {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                ], usage={"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}))
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for i in range(0, len(content), 8):
+                chunk = dict(base, object="chat.completion.chunk", choices=[
+                    {"index": 0, "delta": {"content": content[i:i + 8]}, "finish_reason": None}
+                ])
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def serve(port=8099, latency=0.0, fail_rate=0.0):
+    """Create the stub server (call serve_forever() on the result)."""
+    return ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency, fail_rate))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub Groq chat completions server.")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before answering")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered with 503")
+    args = parser.parse_args()
+    server = serve(args.port, args.latency, args.fail_rate)
+    print(f"Stub LLM listening on http://127.0.0.1:{args.port}")
+    server.serve_forever()
@@ -0,0 +1,194 @@
+# subskill_lookup.py
+# Step-6 sub-skill lookups, shared by the Flask views (app.py) and the async
+# handlers (asgi.py).
+#
+# Everything except the LLM call and the wait for another request's call lives
+# here: resolving the typed skill, answering from the taxonomy or cache, the
+# single-flight bookkeeping, metrics, caching fresh answers and the fallback
+# when the LLM is down. Callers only supply the blocking or awaited part:
+#
+#   lookup = SubskillLookup(svc, skill)   # taxonomy, cache (SQLite)
+#   lookup.begin()                        # join the single-flight if unknown
+#   if lookup.leader:
+#       with lookup.leading("blocking"):
+#           lookup.result = fetch_subskills(svc.llm, lookup.skill)
+#   elif lookup.call is not None:
+#       with lookup.following():
+#           lookup.result = lookup.call.wait()
+#   subskills = lookup.answer()           # caches a fresh answer, or falls back
+#
+# The constructor and answer() may touch SQLite and the taxonomy review file,
+# so async callers run them on an executor; begin() only touches memory and
+# runs on the event loop, so a cancelled request can never leave a flight
+# without its leader.
+
+from contextlib import contextmanager
+
+import metrics
+from llm_client import CircuitOpen
+from skill_cache import normalize_skill
+from subskills import sse_event, FALLBACK_SUBSKILLS
+
+
+def canonical_skill(svc, skill):
+    """The known skill a typed main skill refers to ("Pyhton" -> "python"), else the skill itself."""
+    key, match = svc.skill_normalizer.resolve(skill)
+    metrics.SKILL_MATCH.inc(match=match or "none")
+    return key if match else skill
+
+
+def known_subskills(svc, skill):
+    """Sub-skills without an LLM call: the bundled taxonomy, then the cache; None if unknown."""
+    if svc.skill_taxonomy is not None:
+        subskills = svc.skill_taxonomy.get(skill)
+        metrics.SKILL_TAXONOMY.inc(result="miss" if subskills is None else "hit")
+        if subskills is not None:
+            return subskills
+    return svc.subskill_cache.get(skill)
+
+
+def remember_subskills(svc, skill, subskills):
+    """Cache a fresh LLM answer, make the skill known, and queue it for the taxonomy review."""
+    svc.subskill_cache.set(skill, subskills)
+    svc.skill_normalizer.add(skill)
+    if svc.skill_taxonomy is not None:
+        svc.skill_taxonomy.propose(skill, subskills)
+
+
+def fallback_subskills(svc, skill):
+    """Degraded answer when the LLM is down: a stale cache entry or a static list."""
+    return svc.subskill_cache.get_stale(skill) or list(FALLBACK_SUBSKILLS)
+
+
+def subskill_events(subskills):
+    """SSE events for a complete answer: one `subskill` per chip, then `done`."""
+    return [sse_event("subskill", item) for item in subskills] + [sse_event("done", {"subskills": subskills})]
+
+
+@contextmanager
+def _following():
+    metrics.LLM_DEDUPLICATED.inc()
+    try:
+        yield
+    except Exception:
+        pass   # the leader failed; the caller falls back
+
+
+class SubskillLookup:
+    """Sub-skills for one main skill."""
+
+    def __init__(self, svc, skill):
+        self.svc = svc
+        self.skill = canonical_skill(svc, skill)
+        self.key = normalize_skill(self.skill)
+        self.result = known_subskills(svc, self.skill)
+        self.call = None
+        self.leader = False
+        self.error = None
+        self.fresh = False   # result is this request's own LLM answer
+        self.streamed = []   # chips a streaming leader has sent so far
+
+    def begin(self):
+        """Join the single-flight for an unknown skill, as its leader or a follower."""
+        if self.result is None:
+            self.call, self.leader = self.svc.subskill_flight.begin(self.key)
+
+    @contextmanager
+    def leading(self, mode):
+        """Wrap the leader's LLM call: timing, error logging, releasing the followers."""
+        try:
+            with metrics.LLM_LATENCY.time(mode=mode):
+                yield
+        except Exception as e:
+            self.error = e
+            if not isinstance(e, CircuitOpen):
+                metrics.LLM_ERRORS.inc(mode=mode)
+                print(f"Sub-skill lookup ({mode}) failed:", e)
+        finally:
+            # also runs when the client went away mid-call: never leave followers waiting
+            error = self.error or (None if self.result is not None else RuntimeError("lookup abandoned"))
+            self.svc.subskill_flight.finish(self.key, self.call, result=self.result, error=error)
+        self.fresh = self.error is None and self.result is not None
+
+    def following(self):
+        """Wrap a follower's wait; if the leader failed, result stays None."""
+        return _following()
+
+    def answer(self):
+        """The sub-skills to show. Caches a fresh LLM answer; falls back when there is none."""
+        if self.fresh and self.result:
+            remember_subskills(self.svc, self.skill, self.result)
+        if self.result is None:
+            return fallback_subskills(self.svc, self.skill)
+        return list(self.result)
+
+    def closing_events(self):
+        """SSE events after a streaming leader's last chip: `done`, an `error`, or the fallback."""
+        if self.error is None:
+            if self.streamed:
+                remember_subskills(self.svc, self.skill, self.streamed)
+            return [sse_event("done", {"subskills": self.streamed})]
+        if self.streamed:
+            return [sse_event("error", {"message": "Could not load all suggestions. Type your sub-skills instead."})]
+        # nothing shown yet: serve the degraded suggestions instead
+        return subskill_events(fallback_subskills(self.svc, self.skill))
+
+
+class SubskillBatch:
+    """Sub-skills for several main skills; the unknown ones share one LLM call.
+
+    Same protocol as SubskillLookup: the leader fills `fetched` for the skills
+    in `to_fetch` inside leading(), followers wait on the calls in `waiting`.
+    """
+
+    def __init__(self, svc, skills):
+        self.svc = svc
+        self.skills = list(skills)
+        self.keys = [canonical_skill(svc, skill) for skill in self.skills]
+        self.found = {}
+        for key in dict.fromkeys(self.keys):
+            subskills = known_subskills(svc, key)
+            if subskills is not None:
+                self.found[key] = subskills
+        self.calls = {}     # skill -> flight this request leads
+        self.waiting = {}   # skill -> flight led by another request
+        self.fetched = {}
+
+    def begin(self):
+        for key in dict.fromkeys(self.keys):
+            if key not in self.found:
+                call, leader = self.svc.subskill_flight.begin(normalize_skill(key))
+                (self.calls if leader else self.waiting)[key] = call
+
+    @property
+    def to_fetch(self):
+        return list(self.calls)
+
+    @contextmanager
+    def leading(self):
+        error = None
+        try:
+            with metrics.LLM_LATENCY.time(mode="batch"):
+                yield
+        except Exception as e:
+            error = e
+            if not isinstance(e, CircuitOpen):
+                metrics.LLM_ERRORS.inc(mode="batch")
+                print("Batched sub-skill lookup failed:", e)
+        finally:
+            for key, call in self.calls.items():
+                result = self.fetched.get(key)
+                self.svc.subskill_flight.finish(normalize_skill(key), call, result=result,
+                                                error=None if result is not None
+                                                else error or RuntimeError("skill missing from batch answer"))
+
+    def following(self):
+        return _following()
+
+    def answer(self):
+        """[{"skill", "subskills"}] in the order asked, caching the fresh answers."""
+        for key, subskills in self.fetched.items():
+            remember_subskills(self.svc, key, subskills)
+        self.found.update(self.fetched)
+        return [{"skill": skill, "subskills": self.found.get(key) or fallback_subskills(self.svc, key)}
+                for skill, key in zip(self.skills, self.keys)]
@@ -0,0 +1,213 @@
+# subskills.py
+# Sub-skill suggestions for chat step 6: the LLM prompt and response parsing.
+# Shared by app.py, asgi.py and the offline jobs so every path asks the same question.
+
+import json
+import re
+
+from skill_cache import normalize_skill
+
+SUBSKILL_MODEL = "llama-3.1-8b-instant"
+MAX_SUBSKILLS = 10
+# output cap for batched lookups: ~10 short items per skill plus JSON punctuation
+BATCH_TOKENS_PER_SKILL = 90
+BATCH_BASE_TOKENS = 40
+
+_SEPARATOR = re.compile(r"\s*(?:,|;|\n)\s*")
+_BULLET = re.compile(r"^(?:[-*\u2022]+|\d+[.)])\s*")
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+_JSON_PAIR = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*(\[[^\]]*\])')
+
+# Served when the LLM is unavailable and nothing is cached for the skill
+FALLBACK_SUBSKILLS = [
+    "Fundamentals", "Best Practices", "Debugging", "Testing", "Tooling",
+    "Version Control", "Documentation", "Performance", "Security", "Problem Solving",
+]
+
+
+def subskill_messages(skill):
+    """Chat messages asking the LLM for 10 sub-skills of `skill`."""
+    return [
+        {"role": "system", "content": f"Generate a list of 10 related sub-skills for {skill}. Return only a comma-separated list."},
+        {"role": "user", "content": skill}
+    ]
+
+
+def clean_subskill(item):
+    """One suggestion without list bullets, numbering, quotes or a trailing period."""
+    item = _BULLET.sub("", str(item).strip())
+    return item.strip().strip("\"'`").rstrip(".").strip()
+
+
+def clean_subskills(items):
+    """Non-empty, de-duplicated (case-insensitively) suggestions, at most MAX_SUBSKILLS."""
+    seen = {}
+    for item in items:
+        item = clean_subskill(item)
+        if item and item.lower() not in seen:
+            seen[item.lower()] = item
+    return list(seen.values())[:MAX_SUBSKILLS]
+
+
+def parse_subskills(raw):
+    """Sub-skills from the model's answer: commas, semicolons or one per line, bullets allowed."""
+    text = _FENCE.sub("", (raw or "").strip())
+    first, _, rest = text.partition("\n")
+    if first.rstrip().endswith(":") and rest:
+        text = rest                                       # "Here are 10 sub-skills:\n1. a\n2. b"
+    elif ":" in first and "," in first:
+        text = first.split(":", 1)[1] + "\n" + rest      # "Here are 10 sub-skills: a, b, ..."
+    return clean_subskills(_SEPARATOR.split(text))
+
+
+def fetch_subskills(client, skill):
+    """Ask the LLM for sub-skills of `skill` (one blocking round trip)."""
+    response = client.chat.completions.create(
+        model=SUBSKILL_MODEL,
+        messages=subskill_messages(skill)
+    )
+    return parse_subskills(response.choices[0].message.content)
+
+
+def split_complete(buffer):
+    """(finished items, unfinished rest) of a streamed answer; intro lines ending in ":" are dropped."""
+    items = []
+    while True:
+        match = _SEPARATOR.search(buffer)
+        if match is None:
+            break
+        item, buffer = clean_subskill(buffer[:match.start()]), buffer[match.end():]
+        if item and not item.endswith(":"):
+            items.append(item)
+    return items, buffer
+
+
+def stream_subskills(client, skill):
+    """Yield sub-skills one by one as the LLM streams its answer.
+
+    Tokens are buffered until a separator (comma, semicolon or newline)
+    completes an item, so the caller can show each suggestion as soon as it is
+    known.
+    """
+    stream = client.chat.completions.create(
+        model=SUBSKILL_MODEL,
+        messages=subskill_messages(skill),
+        stream=True
+    )
+    buffer = ""
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        buffer += chunk.choices[0].delta.content or ""
+        items, buffer = split_complete(buffer)
+        yield from items
+    yield from split_complete(buffer + "\n")[0]
+
+
+async def afetch_subskills(client, skill):
+    """fetch_subskills() for an AsyncLLMClient."""
+    response = await client.chat.completions.create(
+        model=SUBSKILL_MODEL,
+        messages=subskill_messages(skill)
+    )
+    return parse_subskills(response.choices[0].message.content)
+
+
+async def astream_subskills(client, skill):
+    """stream_subskills() for an AsyncLLMClient (async generator)."""
+    stream = await client.chat.completions.create(
+        model=SUBSKILL_MODEL,
+        messages=subskill_messages(skill),
+        stream=True
+    )
+    buffer = ""
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        buffer += chunk.choices[0].delta.content or ""
+        items, buffer = split_complete(buffer)
+        for item in items:
+            yield item
+    for item in split_complete(buffer + "\n")[0]:
+        yield item
+
+
+def subskill_batch_messages(skills):
+    """Chat messages asking for sub-skills of several skills as one JSON object."""
+    return [
+        {"role": "system", "content": (
+            f"For each main skill in the list, give {MAX_SUBSKILLS} related sub-skills. Reply with only a "
+            "JSON object whose keys are the main skills exactly as given and whose values are arrays of "
+            "short sub-skill strings.")},
+        {"role": "user", "content": json.dumps(list(skills))},
+    ]
+
+
+def batch_max_tokens(count):
+    return BATCH_BASE_TOKENS + BATCH_TOKENS_PER_SKILL * count
+
+
+def parse_subskill_batch(raw, skills):
+    """{skill: sub-skills} for the requested skills found in the model's JSON answer.
+
+    Tolerates code fences, text around the object, differently cased keys,
+    comma-separated strings instead of arrays, and an object cut off by
+    max_tokens (every complete "skill": [...] pair is still used).
+    """
+    text = _FENCE.sub("", (raw or "").strip())
+    start, end = text.find("{"), text.rfind("}")
+    answer = None
+    if start != -1 and end > start:
+        try:
+            answer = json.loads(text[start:end + 1])
+        except ValueError:
+            pass
+    if not isinstance(answer, dict):
+        answer = {}
+        for match in _JSON_PAIR.finditer(text):
+            try:
+                answer[json.loads(f'"{match.group(1)}"')] = json.loads(match.group(2))
+            except ValueError:
+                continue
+
+    wanted = {normalize_skill(skill): skill for skill in skills}
+    result = {}
+    for key, value in answer.items():
+        skill = wanted.get(normalize_skill(key))
+        if skill is None or skill in result:
+            continue
+        subskills = parse_subskills(value) if isinstance(value, str) else \
+            clean_subskills(v for v in value if isinstance(v, str)) if isinstance(value, list) else []
+        if subskills:
+            result[skill] = subskills
+    return result
+
+
+def fetch_subskill_batch(client, skills):
+    """Sub-skills for several skills in one structured-output LLM call.
+
+    Returns {skill: sub-skills}; skills missing from the answer are left out.
+    """
+    response = client.chat.completions.create(
+        model=SUBSKILL_MODEL,
+        messages=subskill_batch_messages(skills),
+        response_format={"type": "json_object"},
+        max_tokens=batch_max_tokens(len(skills)),
+    )
+    return parse_subskill_batch(response.choices[0].message.content, skills)
+
+
+async def afetch_subskill_batch(client, skills):
+    """fetch_subskill_batch() for an AsyncLLMClient."""
+    response = await client.chat.completions.create(
+        model=SUBSKILL_MODEL,
+        messages=subskill_batch_messages(skills),
+        response_format={"type": "json_object"},
+        max_tokens=batch_max_tokens(len(skills)),
+    )
+    return parse_subskill_batch(response.choices[0].message.content, skills)
+
+
+def sse_event(event, payload):
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
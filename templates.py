@@ -1,8 +1,20 @@
 # templates.py
 # Three resume templates (modern, classic, ATS-friendly).
 # Each function accepts `data` dictionary and returns an HTML string.
+# The page chrome is a Jinja2 template compiled once at import, and every
+# section fragment is memoized by a hash of that section's content, so a
+# re-render after a small edit only rebuilds the section that changed.
 
+import hashlib
 import html
+import json
+import threading
+from collections import OrderedDict
+
+from jinja2 import Environment
+
+# Bump whenever the HTML produced below changes, so cached renders are not reused.
+RENDERER_VERSION = "1"
 
 
 def _esc(v):
@@ -92,6 +104,123 @@ def _build_certs_html(data):
     return "\n".join(items) if items else "<div>No certifications listed.</div>"
 
 
+# -------------------------
+# Section fragment cache
+# -------------------------
+FRAGMENT_CACHE_SIZE = 4096
+_fragments = OrderedDict()   # (section, content hash) -> fragment
+_fragments_lock = threading.Lock()
+
+# section name -> (data key, builder)
+SECTIONS = {
+    "education": ("education", _build_education_html),
+    "skills": ("skills", _build_skills_html),
+    "projects": ("projects", _build_projects_html),
+    "certifications": ("certifications", _build_certs_html),
+}
+
+
+def content_hash(value):
+    """Short stable hash of a JSON-like value."""
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _memo(section, value, build):
+    key = (section, content_hash(value))
+    with _fragments_lock:
+        fragment = _fragments.get(key)
+        if fragment is not None:
+            _fragments.move_to_end(key)
+            return fragment
+    fragment = build()
+    with _fragments_lock:
+        _fragments[key] = fragment
+        while len(_fragments) > FRAGMENT_CACHE_SIZE:
+            _fragments.popitem(last=False)
+    return fragment
+
+
+def section_html(section, data):
+    """HTML fragment for one section ('education', 'skills', ...), memoized."""
+    key, builder = SECTIONS[section]
+    return _memo(section, data.get(key, []), lambda: builder(data))
+
+
+# -------------------------
+# Compiled page chrome
+# -------------------------
+# Values are escaped with _esc() before rendering, so autoescape stays off.
+_env = Environment(autoescape=False)
+
+MODERN_CSS = (
+    "<style>"
+    "body { font-family: Arial, sans-serif; margin: 36px; color:#222; }"
+    ".header { text-align:center; margin-bottom:6px; }"
+    "h1 { color:#2E86C1; margin:0; font-size:26px; }"
+    ".contact { color:#666; font-size:11px; margin-top:6px; }"
+    ".links { color:#0b5394; font-size:11px; margin-top:4px; }"
+    ".section { margin-top:18px; }"
+    "h2 { color:#117A65; font-size:13px; margin-bottom:6px; border-bottom:1px solid #eaeaea; padding-bottom:6px; }"
+    ".skill-pill { display:inline-block; background:#f0f6fb; color:#0b5394; padding:6px 10px; border-radius:12px; margin:4px; font-size:11px; }"
+    ".project-item, .edu-item, .cert-item { margin-bottom:8px; }"
+    ".proj-name { font-weight:bold; }"
+    ".proj-link { color:#0b5394; text-decoration:none; font-size:11px; }"
+    ".proj-tech { font-style:italic; color:#444; font-size:11px; margin-top:2px; }"
+    ".proj-desc { margin-top:4px; }"
+    ".yr { float:right; color:#444; }"
+    "a { color:#0b5394; text-decoration:none; }"
+    "</style>"
+)
+
+CLASSIC_CSS = (
+    "<style>"
+    "body { font-family: Georgia, 'Times New Roman', serif; margin: 40px; color:#111; }"
+    "h1 { margin:0; font-size:26px; }"
+    ".meta { font-size:12px; color:#333; margin-top:6px; }"
+    "h2 { font-size:13px; margin-top:20px; margin-bottom:8px; border-bottom:1px solid #ccc; padding-bottom:6px; }"
+    ".section { margin-top:12px; }"
+    "a { color:#0b5394; text-decoration:none; }"
+    "</style>"
+)
+
+ATS_CSS = "<style>pre{font-family:monospace; font-size:10px; white-space:pre-wrap;}</style>"
+
+_MODERN = _env.from_string(
+    "<!doctype html><html><head><meta charset='utf-8'/>{{ css }}</head><body>"
+    "<div class='header'>"
+    "<h1>{{ name }}</h1>"
+    "{% if contact_line %}<div class='contact'>{{ contact_line }}</div>{% endif %}"
+    "{% if links_line %}<div class='links'>{{ links_line }}</div>{% endif %}"
+    "</div>"
+    "{% if prof %}<div class='section'><h2>Professional Summary</h2><div>{{ prof }}</div></div>{% endif %}"
+    "<div class='section'><h2>Core Skills</h2>{{ skills_html }}</div>"
+    "<div class='section'><h2>Key Projects</h2>{{ projects_html }}</div>"
+    "<div class='section'><h2>Education</h2>{{ education_html }}</div>"
+    "<div class='section'><h2>Certifications</h2>{{ certs_html }}</div>"
+    "</body></html>",
+    globals={"css": MODERN_CSS},
+)
+
+_CLASSIC = _env.from_string(
+    "<!doctype html><html><head><meta charset='utf-8'/>{{ css }}</head><body>"
+    "<h1>{{ name }}</h1>"
+    "{% if contact_line %}<div class='meta'>{{ contact_line }}</div>{% endif %}"
+    "<div class='section'><h2>Education</h2>{{ education_html }}</div>"
+    "<div class='section'><h2>Work / Projects</h2>{{ projects_html }}</div>"
+    "<div class='section'><h2>Skills</h2>{{ skills_html }}</div>"
+    "<div class='section'><h2>Certifications</h2>{{ certs_html }}</div>"
+    "</body></html>",
+    globals={"css": CLASSIC_CSS},
+)
+
+# Wrap in <pre> to preserve spacing (still valid HTML for pdf conversion)
+_ATS = _env.from_string(
+    "<!doctype html><html><head><meta charset='utf-8'/>{{ css }}</head><body><pre>{{ body }}</pre></body></html>",
+    globals={"css": ATS_CSS},
+)
+
+
 # -------------------------
 # Modern Template (HTML)
 # -------------------------
@@ -114,54 +243,16 @@ def modern_template(data):
         link_parts.append(f"<a href='{github}' target='_blank'>GitHub</a>")
     links_line = " &nbsp;•&nbsp; ".join(link_parts)
 
-    prof = _esc(data.get("professional_summary", ""))
-
-    education_html = _build_education_html(data)
-    skills_html = _build_skills_html(data)
-    projects_html = _build_projects_html(data)
-    certs_html = _build_certs_html(data)
-
-    css = (
-        "<style>"
-        "body { font-family: Arial, sans-serif; margin: 36px; color:#222; }"
-        ".header { text-align:center; margin-bottom:6px; }"
-        "h1 { color:#2E86C1; margin:0; font-size:26px; }"
-        ".contact { color:#666; font-size:11px; margin-top:6px; }"
-        ".links { color:#0b5394; font-size:11px; margin-top:4px; }"
-        ".section { margin-top:18px; }"
-        "h2 { color:#117A65; font-size:13px; margin-bottom:6px; border-bottom:1px solid #eaeaea; padding-bottom:6px; }"
-        ".skill-pill { display:inline-block; background:#f0f6fb; color:#0b5394; padding:6px 10px; border-radius:12px; margin:4px; font-size:11px; }"
-        ".project-item, .edu-item, .cert-item { margin-bottom:8px; }"
-        ".proj-name { font-weight:bold; }"
-        ".proj-link { color:#0b5394; text-decoration:none; font-size:11px; }"
-        ".proj-tech { font-style:italic; color:#444; font-size:11px; margin-top:2px; }"
-        ".proj-desc { margin-top:4px; }"
-        ".yr { float:right; color:#444; }"
-        "a { color:#0b5394; text-decoration:none; }"
-        "</style>"
-    )
-
-    html_out = (
-        "<!doctype html><html><head><meta charset='utf-8'/>"
-        + css
-        + "</head><body>"
-        + "<div class='header'>"
-        + f"<h1>{name}</h1>"
-        + (f"<div class='contact'>{contact_line}</div>" if contact_line else "")
-        + (f"<div class='links'>{links_line}</div>" if links_line else "")
-        + "</div>"
-        + (f"<div class='section'><h2>Professional Summary</h2><div>{prof}</div></div>" if prof else "")
-        + "<div class='section'><h2>Core Skills</h2>"
-        + f"{skills_html}</div>"
-        + "<div class='section'><h2>Key Projects</h2>"
-        + f"{projects_html}</div>"
-        + "<div class='section'><h2>Education</h2>"
-        + f"{education_html}</div>"
-        + "<div class='section'><h2>Certifications</h2>"
-        + f"{certs_html}</div>"
-        + "</body></html>"
+    return _MODERN.render(
+        name=name,
+        contact_line=contact_line,
+        links_line=links_line,
+        prof=_esc(data.get("professional_summary", "")),
+        skills_html=section_html("skills", data),
+        projects_html=section_html("projects", data),
+        education_html=section_html("education", data),
+        certs_html=section_html("certifications", data),
     )
-    return html_out
 
 
 # -------------------------
@@ -174,42 +265,82 @@ def classic_template(data):
     phone = _esc(data.get("phone", ""))
     location = _esc(data.get("location", ""))
 
-    education_html = _build_education_html(data)
-    projects_html = _build_projects_html(data)
-    certs_html = _build_certs_html(data)
-    skills_html = _build_skills_html(data)
-
-    css = (
-        "<style>"
-        "body { font-family: Georgia, 'Times New Roman', serif; margin: 40px; color:#111; }"
-        "h1 { margin:0; font-size:26px; }"
-        ".meta { font-size:12px; color:#333; margin-top:6px; }"
-        "h2 { font-size:13px; margin-top:20px; margin-bottom:8px; border-bottom:1px solid #ccc; padding-bottom:6px; }"
-        ".section { margin-top:12px; }"
-        "a { color:#0b5394; text-decoration:none; }"
-        "</style>"
-    )
-
     contact_line = " • ".join([x for x in [location, phone, email] if x])
 
-    html_out = (
-        "<!doctype html><html><head><meta charset='utf-8'/>"
-        + css
-        + "</head><body>"
-        + f"<h1>{name}</h1>"
-        + (f"<div class='meta'>{contact_line}</div>" if contact_line else "")
-        + "<div class='section'><h2>Education</h2>" + education_html + "</div>"
-        + "<div class='section'><h2>Work / Projects</h2>" + projects_html + "</div>"
-        + "<div class='section'><h2>Skills</h2>" + skills_html + "</div>"
-        + "<div class='section'><h2>Certifications</h2>" + certs_html + "</div>"
-        + "</body></html>"
+    return _CLASSIC.render(
+        name=name,
+        contact_line=contact_line,
+        education_html=section_html("education", data),
+        projects_html=section_html("projects", data),
+        skills_html=section_html("skills", data),
+        certs_html=section_html("certifications", data),
     )
-    return html_out
 
 
 # -------------------------
 # ATS-Friendly Template (plain)
 # -------------------------
+def _ats_skills_lines(skills):
+    lines = ["SKILLS"]
+    for s in skills:
+        ms = _esc(s.get("mainskill", ""))
+        subs = s.get("subskills") or []
+        subs_text = ", ".join(_esc(x) for x in subs if x)
+        if ms:
+            lines.append(f"{ms}: {subs_text}")
+    lines.append("")
+    return lines
+
+
+def _ats_projects_lines(projects):
+    lines = ["PROJECTS"]
+    for p in projects:
+        pname = _esc(p.get("name", ""))
+        desc = _esc(p.get("description", ""))
+        repo = p.get("repository", "") or ""
+        line = pname + (" — " + desc if desc else "")
+        if repo:
+            line += " (Repo: " + _esc(repo) + ")"
+        lines.append(line)
+    lines.append("")
+    return lines
+
+
+def _ats_education_lines(education):
+    lines = ["EDUCATION"]
+    for e in education:
+        course = _esc(e.get("course", ""))
+        college = _esc(e.get("college", ""))
+        year = _esc(e.get("year", ""))
+        lines.append(f"{course} — {college} ({year})")
+    lines.append("")
+    return lines
+
+
+def _ats_certs_lines(certs):
+    lines = ["CERTIFICATIONS"]
+    for c in certs:
+        namec = _esc(c.get("name", ""))
+        cid = _esc(c.get("id", ""))
+        src = c.get("source", "") or ""
+        line = namec
+        if cid:
+            line += f" (ID: {cid})"
+        if src:
+            line += f" — { _esc(src) }"
+        lines.append(line)
+    lines.append("")
+    return lines
+
+
+ATS_SECTIONS = (
+    ("skills", _ats_skills_lines),
+    ("projects", _ats_projects_lines),
+    ("education", _ats_education_lines),
+    ("certifications", _ats_certs_lines),
+)
+
+
 def ats_template(data):
     """Return simple, ATS-friendly plain HTML (preformatted)."""
     lines = []
@@ -232,64 +363,13 @@ def ats_template(data):
         lines.append(prof)
         lines.append("")
 
-    # Skills
-    skills = data.get("skills", [])
-    if skills:
-        lines.append("SKILLS")
-        for s in skills:
-            ms = _esc(s.get("mainskill", ""))
-            subs = s.get("subskills") or []
-            subs_text = ", ".join(_esc(x) for x in subs if x)
-            if ms:
-                lines.append(f"{ms}: {subs_text}")
-        lines.append("")
-
-    # Projects
-    projects = data.get("projects", [])
-    if projects:
-        lines.append("PROJECTS")
-        for p in projects:
-            pname = _esc(p.get("name", ""))
-            desc = _esc(p.get("description", ""))
-            repo = p.get("repository", "") or ""
-            line = pname + (" — " + desc if desc else "")
-            if repo:
-                line += " (Repo: " + _esc(repo) + ")"
-            lines.append(line)
-        lines.append("")
-
-    # Education
-    education = data.get("education", [])
-    if education:
-        lines.append("EDUCATION")
-        for e in education:
-            course = _esc(e.get("course", ""))
-            college = _esc(e.get("college", ""))
-            year = _esc(e.get("year", ""))
-            lines.append(f"{course} — {college} ({year})")
-        lines.append("")
-
-    # Certifications
-    certs = data.get("certifications", [])
-    if certs:
-        lines.append("CERTIFICATIONS")
-        for c in certs:
-            namec = _esc(c.get("name", ""))
-            cid = _esc(c.get("id", ""))
-            src = c.get("source", "") or ""
-            line = namec
-            if cid:
-                line += f" (ID: {cid})"
-            if src:
-                line += f" — { _esc(src) }"
-            lines.append(line)
-        lines.append("")
+    # Skills, projects, education, certifications (each memoized as a text block)
+    for key, build in ATS_SECTIONS:
+        items = data.get(key, [])
+        if items:
+            lines.append(_memo("ats_" + key, items, lambda: "\n".join(build(items))))
 
-    # Wrap in <pre> to preserve spacing (still valid HTML for pdf conversion)
-    html_out = "<!doctype html><html><head><meta charset='utf-8'/><style>pre{font-family:monospace; font-size:10px; white-space:pre-wrap;}</style></head><body><pre>"
-    html_out += "\n".join(lines)
-    html_out += "</pre></body></html>"
-    return html_out
+    return _ATS.render(body="\n".join(lines))
 
 
 # Usage hint (comment):
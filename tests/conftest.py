@@ -0,0 +1,7 @@
+# tests/conftest.py
+# The app is a set of top-level modules; make them importable from tests/.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,139 @@
+# tests/test_conversation.py
+# The /chat step table: field and choice steps, grouped answers, commands.
+
+import pytest
+
+from conversation import FIRST_STEP, STEPS, advance, empty_resume
+
+
+def run(messages, state=None, data=None):
+    state = state if state is not None else {"step": FIRST_STEP}
+    data = data if data is not None else empty_resume()
+    question = None
+    for message in messages:
+        _, question = advance(state, data, message)
+    return state, data, question
+
+
+START = ["asha", "asha@example.com"]
+EDUCATION = START + ["b.tech", "xyz college", "2024", "no"]
+SKILLS = EDUCATION + ["python", "django, flask", "no"]
+DONE = SKILLS + ["no", "resume bot", "builds resumes", "github.com/x", "no"]
+
+
+def test_full_flow():
+    state, data, question = run(DONE)
+    assert state["step"] == "done"
+    assert question == STEPS["done"].question
+    assert data["education"] == [{"course": "b.tech", "college": "xyz college", "year": "2024"}]
+    assert data["skills"] == [{"mainskill": "python", "subskills": ["django", " flask"]}]
+    assert data["projects"][0]["name"] == "resume bot"
+
+
+def test_legacy_integer_step():
+    state, data, _ = run(["asha"], state={"step": 0})
+    assert data["name"] == "asha" and state["step"] == "email"
+
+
+def test_choice_steps_branch():
+    state, _, _ = run(EDUCATION[:-1] + ["yes"])
+    assert state["step"] == "course"
+    state, _, question = run(SKILLS[:-1] + ["yes"])
+    assert state["step"] == "mainskill" and question == "Enter another main skill:"
+
+
+def test_one_message_fills_an_education_entry():
+    state, data, _ = run(START + ["b.tech, xyz college, 2020 - 2024"])
+    assert data["education"] == [{"course": "b.tech", "college": "xyz college", "year": "2020 - 2024"}]
+    assert state["step"] == "more_education"
+
+
+@pytest.mark.parametrize("message", [
+    "b.tech, university of california, berkeley, 2024",   # too many parts
+    "b.tech, xyz college",                                # too few
+    "b.tech, xyz college, final year",                    # not a year
+    "b.tech, , 2024",                                     # empty part
+])
+def test_comma_answers_that_do_not_fit_are_stored_as_typed(message):
+    state, data, _ = run(START + [message])
+    assert data["education"] == [{"course": message}]
+    assert state["step"] == "college"
+
+
+def test_commas_after_the_first_step_of_a_group_are_kept():
+    state, data, _ = run(START + ["b.tech", "university of california, berkeley"])
+    assert data["education"][0]["college"] == "university of california, berkeley"
+    assert state["step"] == "year"
+
+
+def test_several_main_skills_in_one_answer():
+    state, data, _ = run(EDUCATION + ["python, sql, python", "python: django; sql: joins, views"])
+    assert data["skills"] == [{"mainskill": "python", "subskills": ["django"]},
+                              {"mainskill": "sql", "subskills": ["joins", "views"]}]
+    assert state["step"] == "more_skills"
+
+
+def test_grouped_subskills_must_name_the_skills():
+    state, data, question = run(EDUCATION + ["python, sql", "cobol: x"])
+    assert state["step"] == "subskills"
+    assert "python: ...; sql: ..." in question
+
+
+def test_edit_without_slash_is_an_answer_on_free_text_steps():
+    _, data, _ = run(SKILLS + ["no", "edit tool"])
+    assert data["projects"] == [{"name": "edit tool"}]
+
+
+def test_edit_without_slash_is_a_command_where_no_text_is_expected():
+    state, _, _ = run(DONE + ["edit name"])
+    assert state["step"] == "name"
+
+
+def test_edit_a_field_returns_to_the_current_step():
+    state, data, question = run(SKILLS + ["no", "/edit email", "new@example.com"])
+    assert data["email"] == "new@example.com"
+    assert state["step"] == "project_name" and question == STEPS["project_name"].question
+    assert state["edit"] is None
+
+
+def test_edit_one_entry_keeps_the_others():
+    messages = DONE + ["/edit projects add", "second", "d2", "t2",
+                       "/edit projects 1", "first", "d1", "t1"]
+    state, data, _ = run(messages)
+    assert [p["name"] for p in data["projects"]] == ["first", "second"]
+    assert data["projects"][0]["description"] == "d1"
+    assert state["step"] == "done"
+
+
+def test_edit_a_skill_in_place():
+    state, data, _ = run(SKILLS[:-1] + ["yes", "sql", "joins", "no", "/edit skills 1", "rust", "tokio"])
+    assert [s["mainskill"] for s in data["skills"]] == ["rust", "sql"]
+    assert data["skills"][0]["subskills"] == ["tokio"]
+    assert state["step"] == "has_certifications"
+
+
+def test_edit_section_with_several_entries_asks_which():
+    state, data, question = run(SKILLS[:-1] + ["yes", "sql", "joins", "no", "/edit skills"])
+    assert "1. python" in question and "2. sql" in question
+    assert state["step"] == "has_certifications"
+    assert len(data["skills"]) == 2
+
+
+def test_edit_unknown_entry_or_section():
+    _, _, question = run(DONE + ["/edit projects 5"])
+    assert question.startswith("There is no project name 5")
+    _, _, question = run(DONE + ["/edit hobbies"])
+    assert question.startswith("I can edit:")
+
+
+def test_remove_entry():
+    state, data, question = run(DONE + ["/edit projects add", "second", "d2", "t2", "/remove projects 1"])
+    assert [p["name"] for p in data["projects"]] == ["second"]
+    assert state["step"] == "done" and question.startswith("Removed project name 1.")
+
+
+def test_no_commands_on_a_half_filled_entry():
+    state, data, question = run(SKILLS + ["no", "resume bot", "/remove projects 1"])
+    assert data["projects"] == [{"name": "resume bot"}]
+    assert state["step"] == "project_description"
+    assert question.startswith("Let's finish this project name first.")
@@ -0,0 +1,90 @@
+# tests/test_jobs.py
+# JobQueue: the max_jobs limit, expiry of finished and abandoned jobs, results.
+
+import threading
+import time
+
+import pytest
+
+import jobs
+from jobs import JobQueue, JobQueueFull
+
+
+def blocked_job(release):
+    release.wait(timeout=5)
+    return b"%PDF", "resume.pdf", "application/pdf"
+
+
+def wait_for(queue, job_id, status):
+    deadline = time.time() + 5
+    while queue.status(job_id) != status and time.time() < deadline:
+        time.sleep(0.01)
+    return queue.status(job_id)
+
+
+def test_result_of_a_finished_job():
+    queue = JobQueue(workers=1)
+    release = threading.Event()
+    job_id = queue.submit(blocked_job, release)
+    assert queue.result(job_id) is None
+    release.set()
+    assert wait_for(queue, job_id, "done") == "done"
+    assert queue.result(job_id) == (b"%PDF", "resume.pdf", "application/pdf")
+    assert queue.result("missing") is None
+
+
+def test_failed_job_records_the_error():
+    def broken():
+        raise RuntimeError("renderer crashed")
+
+    queue = JobQueue(workers=1)
+    job_id = queue.submit(broken)
+    assert wait_for(queue, job_id, "failed") == "failed"
+    assert queue.error(job_id) == "renderer crashed"
+    assert queue.result(job_id) is None
+
+
+def test_only_unfinished_jobs_count_toward_the_limit():
+    queue = JobQueue(workers=1, max_jobs=2)
+    for _ in range(5):
+        queue.add_result((b"%PDF", "resume.pdf", "application/pdf"))
+    release = threading.Event()
+    try:
+        queue.submit(blocked_job, release)
+        queue.submit(blocked_job, release)
+        with pytest.raises(JobQueueFull):
+            queue.submit(blocked_job, release)
+    finally:
+        release.set()
+
+
+def test_prune_keeps_running_jobs_and_drops_expired_ones():
+    queue = JobQueue(workers=1, ttl=60)
+    release = threading.Event()
+    running = queue.submit(blocked_job, release)
+    finished = queue.add_result((b"%PDF", "resume.pdf", "application/pdf"))
+    assert wait_for(queue, running, "running") == "running"
+    later = time.time() + 120
+    # the owning worker is alive and touching its job, so only the finished row expires
+    queue._db.execute("UPDATE render_jobs SET updated = ? WHERE job_id = ?", (later, running))
+    queue._prune(later + 1)
+    assert queue.status(running) == "running"
+    assert queue.status(finished) is None
+    # no heartbeat for longer than ttl: the worker died, the row is dropped
+    queue._prune(later + 61)
+    assert queue.status(running) is None
+    release.set()
+
+
+def test_old_table_layout_is_replaced(tmp_path):
+    import sqlite3
+    path = str(tmp_path / "jobs.db")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE render_jobs (job_id TEXT PRIMARY KEY, status TEXT, created REAL,"
+               " meta TEXT, content BLOB, mimetype TEXT, ext TEXT, error TEXT)")
+    db.commit()
+    db.close()
+    queue = JobQueue(db_path=path)
+    job_id = queue.add_result((b"%PDF", "resume.pdf", "application/pdf"))
+    assert queue.result(job_id) == (b"%PDF", "resume.pdf", "application/pdf")
+    assert jobs.COLUMNS == [row[1] for row in queue._db.execute("PRAGMA table_info(render_jobs)")]
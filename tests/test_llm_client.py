@@ -0,0 +1,142 @@
+# tests/test_llm_client.py
+# Retries and the circuit breaker against stub_llm_server.
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import groq
+import pytest
+
+import stub_llm_server
+from llm_client import AsyncLLMClient, CircuitBreaker, CircuitOpen, LLMClient
+
+
+@pytest.fixture
+def stub_url():
+    servers = []
+
+    def start(fail_rate=0.0):
+        server = stub_llm_server.serve(port=0, fail_rate=fail_rate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class CountingClient:
+    """groq.Client wrapper that counts upstream requests."""
+
+    def __init__(self, base_url):
+        self.calls = 0
+        self._client = groq.Client(api_key="stub", base_url=base_url, max_retries=0)
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return self._client.chat.completions.create(**kwargs)
+
+
+def ask(client):
+    return client.chat.completions.create(model="stub", messages=[{"role": "user", "content": "python"}])
+
+
+async def ask_async(client):
+    return await client.chat.completions.create(model="stub", messages=[{"role": "user", "content": "python"}])
+
+
+def test_success_passes_through(stub_url):
+    upstream = CountingClient(stub_url())
+    client = LLMClient(client=upstream)
+    answer = ask(client).choices[0].message.content
+    assert answer.startswith("python topic 1")
+    assert upstream.calls == 1
+    assert client.breaker.state == "closed"
+
+
+def test_retries_transient_errors_then_gives_up(stub_url):
+    upstream = CountingClient(stub_url(fail_rate=1.0))
+    client = LLMClient(client=upstream, max_retries=2, backoff=0)
+    with pytest.raises(groq.InternalServerError):
+        ask(client)
+    assert upstream.calls == 3
+    assert client.breaker.failures == 1
+
+
+def test_breaker_opens_and_fails_fast(stub_url):
+    upstream = CountingClient(stub_url(fail_rate=1.0))
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    client = LLMClient(client=upstream, max_retries=0, breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(groq.InternalServerError):
+            ask(client)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpen):
+        ask(client)
+    assert upstream.calls == 2
+
+
+def test_half_open_trial_closes_breaker(stub_url):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    failing = LLMClient(client=CountingClient(stub_url(fail_rate=1.0)), max_retries=0, breaker=breaker)
+    with pytest.raises(groq.InternalServerError):
+        ask(failing)
+    assert breaker.state == "half_open"
+    healthy = LLMClient(client=CountingClient(stub_url()), breaker=breaker)
+    ask(healthy)
+    assert breaker.state == "closed"
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.allow()
+
+
+class HangingClient:
+    """Async upstream that never answers."""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, **kwargs):
+        await asyncio.Event().wait()
+
+
+def test_cancelled_half_open_trial_is_released():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    client = AsyncLLMClient(client=HangingClient(), breaker=breaker)
+
+    async def main():
+        trial = asyncio.ensure_future(ask_async(client))
+        await asyncio.sleep(0.01)
+        assert not breaker.allow()   # the trial holds the half-open slot
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+    asyncio.run(main())
+    assert breaker.allow()
+
+
+def test_interrupted_sync_trial_is_released():
+    class Interrupting:
+        def __init__(self):
+            self.chat = SimpleNamespace(completions=self)
+
+        def create(self, **kwargs):
+            raise KeyboardInterrupt
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    with pytest.raises(KeyboardInterrupt):
+        ask(LLMClient(client=Interrupting(), breaker=breaker))
+    assert breaker.allow()
@@ -0,0 +1,101 @@
+# tests/test_pdf_pool.py
+# PdfWorkerPool: warm worker reuse, recycling, crashes, hung workers, queue limit.
+
+import os
+import sys
+
+import pytest
+
+import pdf_pool
+from pdf_pool import PdfPoolBusy, PdfWorkerPool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# speaks the pdf_worker.py protocol; the "PDF" is the worker's pid
+FAKE_WORKER = f"""
+import os, sys, time
+sys.path.insert(0, {ROOT!r})
+from pdf_worker import read_message, write_message
+out = sys.stdout.buffer
+while True:
+    html = read_message(sys.stdin.buffer)
+    if html is None:
+        break
+    if html == b"crash":
+        sys.exit(3)
+    if html == b"hang":
+        time.sleep(60)
+    if html == b"broken":
+        write_message(out, b"Ebad markup")
+        continue
+    write_message(out, b"K%PDF " + str(os.getpid()).encode())
+"""
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    script = tmp_path / "fake_worker.py"
+    script.write_text(FAKE_WORKER)
+    monkeypatch.setattr(pdf_pool, "WORKER_SCRIPT", str(script))
+    monkeypatch.setattr(pdf_pool, "KILL_GRACE", 0)
+    pools = []
+
+    def make(**kwargs):
+        pools.append(PdfWorkerPool(**{"workers": 1, "job_timeout": 1, **kwargs}))
+        return pools[-1]
+    yield make
+    for made in pools:
+        made.shutdown()
+
+
+def test_worker_is_reused_and_recycled(pool):
+    pdf = pool(recycle_after=3)
+    pids = [pdf.render("<p>hi</p>") for _ in range(4)]
+    assert len(set(pids[:3])) == 1
+    assert pids[3] != pids[0]
+
+
+def test_errors_keep_the_worker(pool):
+    pdf = pool()
+    first = pdf.render("<p>hi</p>")
+    with pytest.raises(RuntimeError, match="bad markup"):
+        pdf.render("broken")
+    assert pdf.render("<p>hi</p>") == first
+
+
+def test_crashed_worker_is_replaced(pool):
+    pdf = pool()
+    first = pdf.render("<p>hi</p>")
+    with pytest.raises(RuntimeError, match="exited"):
+        pdf.render("crash")
+    assert pdf.render("<p>hi</p>") != first
+
+
+def test_hung_worker_is_killed(pool):
+    pdf = pool()
+    with pytest.raises(TimeoutError):
+        pdf.render("hang")
+    assert pdf.render("<p>hi</p>").startswith(b"%PDF")
+
+
+def test_full_queue_raises_busy(pool):
+    pdf = pool(max_queue=0)
+    hung = pdf._submit("hang")
+    with pytest.raises(PdfPoolBusy):
+        pdf.render("<p>hi</p>")
+    with pytest.raises(TimeoutError):
+        hung.result()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="shell script stands in for wkhtmltopdf")
+def test_real_worker_runs_wkhtmltopdf(tmp_path, monkeypatch):
+    binary = tmp_path / "wkhtmltopdf"
+    binary.write_text("#!/bin/sh\ncat >/dev/null; printf '%%PDF-1.4 fake'\n")
+    binary.chmod(0o755)
+    monkeypatch.setenv("WKHTMLTOPDF_PATH", str(binary))
+    monkeypatch.setenv("WKHTMLTOX_PATH", "")
+    pdf = PdfWorkerPool(workers=1)
+    try:
+        assert pdf.render("<p>héllo</p>") == b"%PDF-1.4 fake"
+    finally:
+        pdf.shutdown()
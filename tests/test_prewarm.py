@@ -0,0 +1,73 @@
+# tests/test_prewarm.py
+# prewarm_skills.prewarm(): stored answers survive a restart and are skipped.
+
+import pytest
+
+from prewarm_skills import StubClient, prewarm, read_skills
+from skill_cache import SubskillCache
+
+
+class FlakyClient(StubClient):
+    """StubClient that fails for the given skills."""
+
+    def __init__(self, failing):
+        super().__init__()
+        self.failing = set(failing)
+
+    def create(self, model, messages, **kwargs):
+        if messages[-1]["content"] in self.failing:
+            self.calls += 1
+            raise ConnectionError("upstream down")
+        return super().create(model, messages, **kwargs)
+
+
+class Taxonomy:
+    def __init__(self, skills):
+        self.skills = set(skills)
+
+    def __contains__(self, skill):
+        return skill in self.skills
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "subskills.db")
+
+
+def quiet(message):
+    pass
+
+
+def test_stores_every_skill(db_path):
+    client = StubClient()
+    summary = prewarm(["python", "sql", "docker"], client, SubskillCache(db_path=db_path), log=quiet)
+    assert summary == {"stored": 3, "skipped": 0, "failed": 0}
+    assert client.calls == 3
+    assert SubskillCache(db_path=db_path).get("sql")[0] == "sql topic 1"
+
+
+def test_rerun_resumes_after_failures(db_path):
+    skills = ["python", "sql", "docker", "rust"]
+    first = prewarm(skills, FlakyClient({"docker", "rust"}), SubskillCache(db_path=db_path),
+                    concurrency=2, log=quiet)
+    assert first == {"stored": 2, "skipped": 0, "failed": 2}
+
+    # a fresh process: only the store on disk remembers the first run
+    client = StubClient()
+    second = prewarm(skills, client, SubskillCache(db_path=db_path), concurrency=2, log=quiet)
+    assert second == {"stored": 2, "skipped": 2, "failed": 0}
+    assert client.calls == 2
+    assert SubskillCache(db_path=db_path).get("rust")[0] == "rust topic 1"
+
+
+def test_skips_taxonomy_skills(db_path):
+    client = StubClient()
+    summary = prewarm(["html", "cobol"], client, SubskillCache(db_path=db_path),
+                      log=quiet, taxonomy=Taxonomy({"html"}))
+    assert summary == {"stored": 1, "skipped": 1, "failed": 0}
+    assert client.calls == 1
+
+
+def test_read_skills_normalizes_and_dedupes():
+    lines = ["Python\n", "  python  # again\n", "\n", "# comment\n", "SQL\n"]
+    assert list(read_skills(lines)) == ["python", "sql"]
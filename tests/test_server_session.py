@@ -0,0 +1,54 @@
+# tests/test_server_session.py
+# Server-side sessions: id rotation on clear and recovery from corrupt rows.
+
+import pytest
+from flask import Flask, session
+
+from server_session import MemorySessionBackend, ServerSideSessionInterface, SqliteSessionBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def client(request, tmp_path):
+    if request.param == "sqlite":
+        backend = SqliteSessionBackend(str(tmp_path / "sessions.db"))
+    else:
+        backend = MemorySessionBackend()
+    app = Flask(__name__)
+    app.secret_key = "test"
+    app.session_interface = ServerSideSessionInterface(backend)
+
+    @app.route("/start")
+    def start():
+        session.clear()
+        session["step"] = "name"
+        return "ok"
+
+    @app.route("/answer")
+    def answer():
+        session["answers"] = session.get("answers", 0) + 1
+        return str(session["answers"])
+
+    client = app.test_client()
+    client.backend = backend
+    return client
+
+
+def sid(client):
+    return client.get_cookie("session").value
+
+
+def test_clearing_issues_a_new_id(client):
+    client.get("/start")
+    first = sid(client)
+    client.get("/answer")
+    client.get("/start")
+    assert sid(client) != first
+    assert client.backend.get(first) is None
+    assert client.get("/answer").text == "1"
+
+
+def test_corrupt_row_starts_a_fresh_session(client):
+    client.get("/start")
+    client.backend.set(sid(client), b"z\x00not zlib")
+    response = client.get("/answer")
+    assert response.status_code == 200 and response.text == "1"
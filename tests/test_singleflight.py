@@ -0,0 +1,89 @@
+# tests/test_singleflight.py
+# SingleFlight: one leader per key, followers get its result or its error.
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_first_caller_leads_and_later_callers_follow():
+    flight = SingleFlight()
+    call, leader = flight.begin("python")
+    same, follower_leads = flight.begin("python")
+    other, other_leads = flight.begin("sql")
+    assert leader and not follower_leads and other_leads
+    assert same is call and other is not call
+
+
+def test_followers_are_released_with_the_result():
+    flight = SingleFlight()
+    call, _ = flight.begin("python")
+    results = []
+    calls = [flight.begin("python")[0] for _ in range(3)]
+    followers = [threading.Thread(target=lambda c=c: results.append(c.wait(timeout=5))) for c in calls]
+    for thread in followers:
+        thread.start()
+    flight.finish("python", call, result=["django"])
+    for thread in followers:
+        thread.join(timeout=5)
+    assert results == [["django"]] * 3
+
+
+def test_followers_get_the_leaders_error():
+    flight = SingleFlight()
+    call, _ = flight.begin("python")
+    follower, _ = flight.begin("python")
+    flight.finish("python", call, error=RuntimeError("upstream down"))
+    with pytest.raises(RuntimeError, match="upstream down"):
+        follower.wait(timeout=1)
+
+
+def test_key_is_free_again_after_finish():
+    flight = SingleFlight()
+    call, _ = flight.begin("python")
+    flight.finish("python", call, result=[])
+    _, leader = flight.begin("python")
+    assert leader
+
+
+def test_async_followers_are_released():
+    async def main():
+        flight = SingleFlight()
+        call, _ = flight.begin("python")
+        waiters = [asyncio.ensure_future(flight.begin("python")[0].wait_async()) for _ in range(3)]
+        await asyncio.sleep(0)
+        # finished from another thread, as the sync leader in the WSGI pool would
+        threading.Thread(target=flight.finish, args=("python", call), kwargs={"result": ["django"]}).start()
+        return await asyncio.wait_for(asyncio.gather(*waiters), timeout=5)
+
+    assert asyncio.run(main()) == [["django"]] * 3
+
+
+def test_do_runs_once_for_concurrent_callers():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def fetch():
+        runs.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return ["django"]
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("python", fetch)))
+    leader.start()
+    started.wait(timeout=5)
+    follower = threading.Thread(target=lambda: results.append(flight.do("python", fetch)))
+    follower.start()
+    while flight.deduplicated == 0:
+        time.sleep(0.001)
+    release.set()
+    leader.join(timeout=5)
+    follower.join(timeout=5)
+    assert runs == [1]
+    assert results == [["django"], ["django"]]
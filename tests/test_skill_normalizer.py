@@ -0,0 +1,67 @@
+# tests/test_skill_normalizer.py
+# SkillNormalizer: exact, alias and fuzzy matches, and the typos it must not "fix".
+
+import time
+
+import pytest
+
+from skill_normalizer import SkillNormalizer
+
+SKILLS = ["python", "rust", "mysql", "javascript", "kubernetes", "machine learning", "c++", "react"]
+ALIASES = {"py": "python", "reactjs": "react", "ml": "machine learning"}
+
+
+@pytest.fixture
+def normalizer():
+    return SkillNormalizer(SKILLS, aliases=ALIASES)
+
+
+@pytest.mark.parametrize("typed, expected", [
+    ("Python", ("python", "exact")),
+    ("Machine-Learning", ("machine learning", "folded")),
+    ("py", ("python", "alias")),
+    ("Python 3.11", ("python", "alias")),
+    ("c++17", ("c++", "alias")),
+    ("pyhton", ("python", "fuzzy")),
+    ("javascrpt", ("javascript", "fuzzy")),
+    ("kubernetse", ("kubernetes", "fuzzy")),
+    ("machine lerning", ("machine learning", "fuzzy")),
+])
+def test_resolves_known_skills(normalizer, typed, expected):
+    assert normalizer.resolve(typed) == expected
+
+
+@pytest.mark.parametrize("typed", ["rest", "mssql", "dockr", "c++11x"])
+def test_different_skills_are_not_redirected(normalizer, typed):
+    key, match = normalizer.resolve(typed)
+    assert match is None and key == typed
+
+
+def test_vowel_or_digit_substitution_is_not_a_typo():
+    normalizer = SkillNormalizer(["golang", "python3"])
+    assert normalizer.resolve("gilang")[1] is None
+    assert normalizer.resolve("python2")[1] is None
+    assert normalizer.resolve("gplang") == ("golang", "fuzzy")
+
+
+def test_added_skill_is_no_longer_redirected(normalizer):
+    assert normalizer.resolve("pythons") == ("python", "fuzzy")
+    normalizer.add("pythons")
+    assert normalizer.resolve("pythons") == ("pythons", "exact")
+
+
+def test_ties_are_not_redirected():
+    normalizer = SkillNormalizer(["angular", "angulas"])
+    assert normalizer.resolve("angulaz")[1] is None
+
+
+def test_lookups_stay_fast_with_many_similar_skills():
+    normalizer = SkillNormalizer([f"skillname{i:05d}" for i in range(20000)])
+    queries = ["skilname01234", "skillname0123x", "sklilname00001"]
+    assert normalizer.resolve("sklilname00001") == ("skillname00001", "fuzzy")
+    start = time.perf_counter()
+    for _ in range(20):
+        for query in queries:
+            normalizer.resolve(query)
+    # the budget is 1 ms; leave room for slow CI machines
+    assert (time.perf_counter() - start) / 60 < 0.01